@@ -0,0 +1,248 @@
+import re
+import time
+import asyncio
+import contextvars
+import numpy as np
+import pandas as pd
+from io import BytesIO, StringIO
+from contextlib import asynccontextmanager
+from config.database import DatabaseConnection, load_credentials
+from config.settings import (
+    DB_POOL_MIN_CONN,
+    DB_POOL_MAX_CONN,
+    DB_POOL_WAIT_TIMEOUT,
+    DB_BULK_PAGE_SIZE,
+    DB_STATEMENT_TIMEOUT_MS,
+    DB_QUERY_STATS_ENABLED,
+    DB_SLOW_QUERY_MS
+)
+from src.utils.columnar import frame_from_csv, convert_frame
+from src.utils.query_stats import fingerprint_sql, find_call_site
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_PLACEHOLDER = re.compile(r"%s|%%")
+MAX_BIND_PARAMS = 32767
+
+def to_asyncpg_query(query, offset=0):
+    counter = offset
+
+    def replace(match):
+        nonlocal counter
+        if match.group(0) == "%%":
+            return "%"
+        counter += 1
+        return f"${counter}"
+
+    return _PLACEHOLDER.sub(replace, query)
+
+def _coerce(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, (list, tuple)):
+        return [_coerce(v) for v in value]
+    return value
+
+def _timeout(call_class):
+    # asyncpg cancels the statement client-side after this many seconds.
+    timeout_ms = DB_STATEMENT_TIMEOUT_MS[call_class] if call_class else 0
+    return timeout_ms / 1000 if timeout_ms else None
+
+def _rowcount(status):
+    last = status.split()[-1] if status else ""
+    return int(last) if last.isdigit() else 0
+
+class AsyncDatabaseConnection:
+    query_stats = DatabaseConnection.query_stats
+
+    def __init__(self):
+        self._pool_task = None
+        self._pool_loop = None
+        self._transaction_conn = contextvars.ContextVar('async_transaction_conn', default=None)
+
+    async def _create_pool(self):
+        try:
+            import asyncpg
+        except ImportError:
+            raise ImportError("asyncpg is required for the async database layer (pip install asyncpg)")
+
+        credentials = load_credentials()
+        pool = await asyncpg.create_pool(
+            host=credentials["host"],
+            port=credentials["port"],
+            database=credentials["database"],
+            user=credentials["user"],
+            password=credentials["password"],
+            min_size=DB_POOL_MIN_CONN,
+            max_size=DB_POOL_MAX_CONN
+        )
+        logger.info(f"Async database pool initialized (min={DB_POOL_MIN_CONN}, max={DB_POOL_MAX_CONN})")
+        return pool
+
+    async def _get_pool(self):
+        # asyncpg pools belong to the event loop that created them.
+        loop = asyncio.get_running_loop()
+        if self._pool_task is None or self._pool_loop is not loop:
+            self._pool_loop = loop
+            self._pool_task = loop.create_task(self._create_pool())
+        return await self._pool_task
+
+    @asynccontextmanager
+    async def get_connection(self):
+        conn = self._transaction_conn.get()
+        if conn is not None:
+            yield conn
+            return
+
+        pool = await self._get_pool()
+        async with pool.acquire(timeout=DB_POOL_WAIT_TIMEOUT) as conn:
+            yield conn
+
+    @asynccontextmanager
+    async def transaction(self):
+        current = self._transaction_conn.get()
+        if current is not None:
+            yield current
+            return
+
+        async with self.get_connection() as conn:
+            async with conn.transaction():
+                token = self._transaction_conn.set(conn)
+                try:
+                    yield conn
+                finally:
+                    self._transaction_conn.reset(token)
+
+    def _record_statement(self, query, params, elapsed_ms, rows):
+        if not DB_QUERY_STATS_ENABLED:
+            return
+
+        fingerprint = fingerprint_sql(query)
+        call_site = find_call_site()
+        self.query_stats.record(fingerprint, call_site, elapsed_ms, rows)
+
+        if DB_SLOW_QUERY_MS is not None and elapsed_ms >= DB_SLOW_QUERY_MS:
+            logger.warning(f"Slow query ({elapsed_ms:.1f} ms, {rows} rows) at {call_site}: {fingerprint} params={params}")
+
+    async def execute_query(self, query, params=None, fetch=False, call_class='lookup'):
+        statement = to_asyncpg_query(query)
+        args = [_coerce(p) for p in (params or ())]
+        timeout = _timeout(call_class)
+
+        async with self.get_connection() as conn:
+            start = time.perf_counter()
+            if fetch:
+                result = [dict(record) for record in await conn.fetch(statement, *args, timeout=timeout)]
+                rows = len(result)
+            else:
+                result = rows = _rowcount(await conn.execute(statement, *args, timeout=timeout))
+            self._record_statement(query, params, (time.perf_counter() - start) * 1000, rows)
+            return result
+
+    async def execute_many(self, query, params_list, call_class='bulk'):
+        statement = to_asyncpg_query(query)
+        args_list = [[_coerce(p) for p in params] for params in params_list]
+
+        async with self.get_connection() as conn:
+            start = time.perf_counter()
+            await conn.executemany(statement, args_list, timeout=_timeout(call_class))
+            self._record_statement(query, f"<{len(args_list)} rows>", (time.perf_counter() - start) * 1000, len(args_list))
+            return len(args_list)
+
+    async def execute_values(self, query, rows, template=None, page_size=DB_BULK_PAGE_SIZE,
+                             fetch=False, unique_by=None, call_class='bulk'):
+        rows = [[_coerce(value) for value in row] for row in rows]
+        if unique_by:
+            rows = list({tuple(row[i] for i in unique_by): row for row in rows}.values())
+        if not rows:
+            return [] if fetch else 0
+
+        template = template or "(" + ", ".join(["%s"] * len(rows[0])) + ")"
+        page_size = max(1, min(page_size, MAX_BIND_PARAMS // len(rows[0])))
+        head, tail = query.split("%s", 1)
+        timeout = _timeout(call_class)
+
+        async with self.get_connection() as conn:
+            start = time.perf_counter()
+            returned = []
+            affected = 0
+            for offset in range(0, len(rows), page_size):
+                page = rows[offset:offset + page_size]
+                values = ", ".join(to_asyncpg_query(template, i * len(row)) for i, row in enumerate(page))
+                statement = to_asyncpg_query(head) + values + to_asyncpg_query(tail)
+                args = [value for row in page for value in row]
+                if fetch:
+                    returned.extend(dict(record) for record in await conn.fetch(statement, *args, timeout=timeout))
+                else:
+                    affected += _rowcount(await conn.execute(statement, *args, timeout=timeout))
+            self._record_statement(query, f"<{len(rows)} rows>", (time.perf_counter() - start) * 1000,
+                                   len(returned) if fetch else affected)
+            return returned if fetch else affected
+
+    async def copy_records(self, table, data, columns=None, on_conflict=None, returning=None, call_class='bulk'):
+        frame = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        if columns:
+            frame = frame[list(columns)]
+        if frame.empty:
+            return [] if returning else 0
+
+        names = list(frame.columns)
+        column_list = ", ".join(names)
+        source = BytesIO(frame.to_csv(index=False, header=False).encode('utf-8'))
+        timeout = _timeout(call_class)
+
+        async with self.transaction() as conn:
+            start = time.perf_counter()
+            if on_conflict is None and returning is None:
+                query = f"COPY {table} ({column_list}) FROM STDIN"
+                result = _rowcount(await conn.copy_to_table(table, source=source, columns=names, format='csv',
+                                                           timeout=timeout))
+            else:
+                staging_table = f"{table}_copy_stage"
+                await conn.execute(f"CREATE TEMP TABLE {staging_table} AS SELECT {column_list} FROM {table} WITH NO DATA")
+                await conn.copy_to_table(staging_table, source=source, columns=names, format='csv', timeout=timeout)
+                query = f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging_table} {on_conflict or ''}"
+                if returning:
+                    query += f" RETURNING {returning}"
+                    result = [dict(record) for record in await conn.fetch(query, timeout=timeout)]
+                else:
+                    result = _rowcount(await conn.execute(query, timeout=timeout))
+                await conn.execute(f"DROP TABLE {staging_table}")
+            self._record_statement(query, f"<{len(frame)} rows>", (time.perf_counter() - start) * 1000,
+                                   len(result) if returning else result)
+            return result
+
+    async def read_frame(self, query, params=None, output='pandas', call_class='analytic'):
+        statement = to_asyncpg_query(query)
+        args = [_coerce(p) for p in (params or ())]
+        timeout = _timeout(call_class)
+
+        async with self.get_connection() as conn:
+            start = time.perf_counter()
+            prepared = await conn.prepare(statement, timeout=timeout)
+            columns = [(attribute.name, attribute.type.oid) for attribute in prepared.get_attributes()]
+
+            buffer = BytesIO()
+            await conn.copy_from_query(statement, *args, output=buffer, format='csv', timeout=timeout)
+            frame = frame_from_csv(StringIO(buffer.getvalue().decode('utf-8')), columns)
+            self._record_statement(query, params, (time.perf_counter() - start) * 1000, len(frame))
+
+        return convert_frame(frame, output)
+
+    async def close(self):
+        if self._pool_task is not None and self._pool_task.done() and not self._pool_task.exception():
+            await self._pool_task.result().close()
+            logger.info("Async database pool closed")
+        self._pool_task = None
+        self._pool_loop = None
+
+_async_db = None
+
+def get_async_db():
+    global _async_db
+    if _async_db is None:
+        _async_db = AsyncDatabaseConnection()
+    return _async_db
@@ -0,0 +1,118 @@
+import threading
+import time
+from psycopg2.extensions import connection
+from psycopg2.pool import SimpleConnectionPool, ThreadedConnectionPool, PoolError
+
+class PreparingConnection(connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Names of the statements PREPAREd on this server session.
+        self.prepared_statements = set()
+        # statement_timeout last SET on the session; None when unknown.
+        self.statement_timeout_ms = None
+
+    def rollback(self):
+        # A rollback can undo a SET issued in the same transaction.
+        self.statement_timeout_ms = None
+        super().rollback()
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.connections_opened = 0
+        self.connections_discarded = 0
+        self.timeouts = 0
+
+    def record_opened(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def record_discarded(self):
+        with self._lock:
+            self.connections_discarded += 1
+
+    def record_checkout(self, wait_seconds):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def record_checkin(self):
+        with self._lock:
+            self.in_use -= 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'total_wait_seconds': round(self.total_wait_seconds, 6),
+                'avg_wait_seconds': round(self.total_wait_seconds / self.checkouts, 6) if self.checkouts else 0.0,
+                'max_wait_seconds': round(self.max_wait_seconds, 6),
+                'in_use': self.in_use,
+                'peak_in_use': self.peak_in_use,
+                'connections_opened': self.connections_opened,
+                'connections_discarded': self.connections_discarded,
+                'timeouts': self.timeouts
+            }
+
+class _MeteredPoolMixin:
+    def __init__(self, minconn, maxconn, *args, metrics=None, **kwargs):
+        self.metrics = metrics or PoolMetrics()
+        super().__init__(minconn, maxconn, *args, **kwargs)
+
+    def _connect(self, key=None):
+        conn = super()._connect(key)
+        self.metrics.record_opened()
+        return conn
+
+class MeteredSimpleConnectionPool(_MeteredPoolMixin, SimpleConnectionPool):
+    pass
+
+class MeteredThreadedConnectionPool(_MeteredPoolMixin, ThreadedConnectionPool):
+    pass
+
+class BlockingConnectionPool(MeteredThreadedConnectionPool):
+    def __init__(self, minconn, maxconn, *args, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self._available = threading.Condition(self._lock)
+
+    def getconn(self, key=None):
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+
+        with self._available:
+            while len(self._used) >= self.maxconn and key not in self._used:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self.metrics.record_timeout()
+                    raise PoolError(f"connection pool exhausted: no connection available after {self.timeout}s")
+                self._available.wait(remaining)
+
+            return self._getconn(key)
+
+    def putconn(self, conn=None, key=None, close=False):
+        with self._available:
+            self._putconn(conn, key, close)
+            self._available.notify()
+
+    def closeall(self):
+        with self._available:
+            self._closeall()
+            self._available.notify_all()
+
+POOL_BACKENDS = {
+    'simple': MeteredSimpleConnectionPool,
+    'threaded': MeteredThreadedConnectionPool,
+    'blocking': BlockingConnectionPool
+}
@@ -1,99 +1,524 @@
+import os
+import re
 import json
+import time
+import random
+import atexit
+import threading
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from psycopg2.pool import SimpleConnectionPool
+import pandas as pd
+from io import StringIO
+from psycopg2.extras import RealDictCursor, execute_batch, execute_values
+from psycopg2.extensions import TRANSACTION_STATUS_UNKNOWN
 from pathlib import Path
 from contextlib import contextmanager
+from config.connection_pool import POOL_BACKENDS, PoolMetrics, PreparingConnection
+from config.settings import (
+    DB_POOL_BACKEND,
+    DB_POOL_MIN_CONN,
+    DB_POOL_MAX_CONN,
+    DB_POOL_WAIT_TIMEOUT,
+    DB_BULK_PAGE_SIZE,
+    DB_STATEMENT_TIMEOUT_MS,
+    DB_RETRY_ATTEMPTS,
+    DB_RETRY_BASE_DELAY,
+    DB_RETRY_MAX_DELAY,
+    DB_QUERY_STATS_ENABLED,
+    DB_QUERY_STATS_TOP,
+    DB_SLOW_QUERY_MS,
+    DB_SLOW_QUERY_EXPLAIN,
+    LOGS_DIR
+)
 from src.utils.logger import get_logger
+from src.utils.query_stats import QueryStats, fingerprint_sql, find_call_site
+from src.utils.prepared_queries import PREPARED_QUERIES
+from src.utils.columnar import frame_from_csv, convert_frame
 
 logger = get_logger(__name__)
 
+_inherited_pools = []
+
+TRANSIENT_SQLSTATES = {
+    '40001',  # serialization_failure
+    '40P01',  # deadlock_detected
+    '55P03',  # lock_not_available
+    '57P01',  # admin_shutdown
+    '57P02',  # crash_shutdown
+    '57P03'   # cannot_connect_now
+}
+
+_READ_STATEMENT = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_WRITE_KEYWORD = re.compile(r"\b(INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+def is_transient_error(error):
+    if isinstance(error, psycopg2.InterfaceError):
+        return True
+    if not isinstance(error, psycopg2.Error):
+        return False
+    if error.pgcode:
+        return error.pgcode in TRANSIENT_SQLSTATES or error.pgcode.startswith('08')
+    # Errors without a SQLSTATE come from the client side: lost or refused connections.
+    return isinstance(error, psycopg2.OperationalError)
+
+def is_idempotent(query):
+    if "ON CONFLICT" in query.upper():
+        return True
+    return bool(_READ_STATEMENT.match(query)) and not _WRITE_KEYWORD.search(query)
+
+def load_credentials():
+    credentials_path = Path(__file__).parent / "db_credentials.json"
+
+    if not credentials_path.exists():
+        logger.warning("Credentials file not found, using defaults")
+        return {
+            "host": "localhost",
+            "port": 5432,
+            "database": "tenis_machine",
+            "user": "postgres",
+            "password": "postgres"
+        }
+
+    with open(credentials_path, 'r') as f:
+        return json.load(f)
+
+class UnitOfWork:
+    def __init__(self, conn, commit_every=None, query_stats=None):
+        self.conn = conn
+        self.commit_every = commit_every
+        self.query_stats = query_stats
+        self.pending = 0
+        self.savepoint_depth = 0
+        self._savepoint_counter = 0
+
+    def _mark_done(self):
+        self.pending += 1
+        if self.commit_every and self.pending >= self.commit_every:
+            self.commit()
+
+    def statement_executed(self):
+        if self.savepoint_depth == 0:
+            self._mark_done()
+
+    def commit(self):
+        self.conn.commit()
+        self.pending = 0
+        if self.query_stats:
+            self.query_stats.record_commit()
+
+    @contextmanager
+    def savepoint(self):
+        self._savepoint_counter += 1
+        name = f"uow_sp_{self._savepoint_counter}"
+        cursor = self.conn.cursor()
+        cursor.execute(f"SAVEPOINT {name}")
+        self.savepoint_depth += 1
+        try:
+            yield
+            cursor.execute(f"RELEASE SAVEPOINT {name}")
+        except Exception:
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            self.conn.statement_timeout_ms = None
+            raise
+        finally:
+            self.savepoint_depth -= 1
+            cursor.close()
+
+        if self.savepoint_depth == 0:
+            self._mark_done()
+
 class DatabaseConnection:
     _instance = None
     _pool = None
+    _pool_pid = None
+    _init_lock = threading.Lock()
+    max_connections = DB_POOL_MAX_CONN
+    query_stats = QueryStats()
+    _stats_dump_registered = False
+    _local = threading.local()
 
     def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(DatabaseConnection, cls).__new__(cls)
+        with cls._init_lock:
+            if cls._instance is None:
+                cls._instance = super(DatabaseConnection, cls).__new__(cls)
         return cls._instance
 
     def __init__(self):
-        if self._pool is None:
-            self._initialize_pool()
+        with self._init_lock:
+            if self._pool is None:
+                self._initialize_pool()
+            if DB_QUERY_STATS_ENABLED and not DatabaseConnection._stats_dump_registered:
+                atexit.register(self.dump_query_stats)
+                DatabaseConnection._stats_dump_registered = True
 
     def _initialize_pool(self):
         credentials = self._load_credentials()
 
+        if DB_POOL_BACKEND not in POOL_BACKENDS:
+            raise ValueError(f"Unknown database pool backend: {DB_POOL_BACKEND}")
+
+        pool_kwargs = {}
+        if DB_POOL_BACKEND == 'blocking':
+            pool_kwargs['timeout'] = DB_POOL_WAIT_TIMEOUT
+
         try:
-            self._pool = SimpleConnectionPool(
-                minconn=1,
-                maxconn=10,
+            self.metrics = PoolMetrics()
+            self._pool = POOL_BACKENDS[DB_POOL_BACKEND](
+                minconn=DB_POOL_MIN_CONN,
+                maxconn=self.max_connections,
+                metrics=self.metrics,
                 host=credentials["host"],
                 port=credentials["port"],
                 database=credentials["database"],
                 user=credentials["user"],
-                password=credentials["password"]
+                password=credentials["password"],
+                connection_factory=PreparingConnection,
+                **pool_kwargs
+            )
+            self._pool_pid = os.getpid()
+            logger.info(
+                f"Database connection pool initialized successfully "
+                f"(backend={DB_POOL_BACKEND}, min={DB_POOL_MIN_CONN}, max={self.max_connections})"
             )
-            logger.info("Database connection pool initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize database connection pool: {e}")
             raise
 
-    def _load_credentials(self):
-        credentials_path = Path(__file__).parent / "db_credentials.json"
+    def reinitialize_after_fork(self):
+        with self._init_lock:
+            if self._pool is not None and self._pool_pid != os.getpid():
+                # Keep the parent's connections referenced so they are never
+                # closed from the child, which would terminate the parent's sessions.
+                _inherited_pools.append(self._pool)
+                self._pool = None
+            if self._pool is None:
+                self._initialize_pool()
 
-        if not credentials_path.exists():
-            logger.warning("Credentials file not found, using defaults")
-            return {
-                "host": "localhost",
-                "port": 5432,
-                "database": "tenis_machine",
-                "user": "postgres",
-                "password": "postgres"
-            }
+    def get_pool_metrics(self):
+        metrics = self.metrics.snapshot()
+        metrics.update({
+            'backend': DB_POOL_BACKEND,
+            'min_connections': DB_POOL_MIN_CONN,
+            'max_connections': self.max_connections,
+            'pid': self._pool_pid
+        })
+        return metrics
 
-        with open(credentials_path, 'r') as f:
-            return json.load(f)
+    def _load_credentials(self):
+        return load_credentials()
 
     @contextmanager
     def get_connection(self):
-        conn = self._pool.getconn()
+        if self._pool is None or self._pool_pid != os.getpid():
+            self.reinitialize_after_fork()
+
+        pool = self._pool
+        start = time.monotonic()
+        conn = pool.getconn()
+        self.metrics.record_checkout(time.monotonic() - start)
         try:
             yield conn
         finally:
-            self._pool.putconn(conn)
+            # A connection whose server session is gone must not go back to the pool.
+            broken = conn.closed != 0 or conn.get_transaction_status() == TRANSACTION_STATUS_UNKNOWN
+            pool.putconn(conn, close=broken)
+            if broken:
+                self.metrics.record_discarded()
+            self.metrics.record_checkin()
+
+    def current_unit_of_work(self):
+        return getattr(self._local, 'unit_of_work', None)
+
+    @contextmanager
+    def transaction(self, commit_every=None):
+        current = self.current_unit_of_work()
+        if current is not None:
+            yield current
+            return
+
+        with self.get_connection() as conn:
+            unit_of_work = UnitOfWork(conn, commit_every, self.query_stats)
+            self._local.unit_of_work = unit_of_work
+            try:
+                yield unit_of_work
+                unit_of_work.commit()
+            except Exception:
+                if not conn.closed:
+                    conn.rollback()
+                self.query_stats.record_rollback()
+                raise
+            finally:
+                self._local.unit_of_work = None
+
+    def run_in_transaction(self, func, *args, commit_every=None, **kwargs):
+        # The whole unit of work is re-run on a transient failure, so func
+        # must be safe to repeat.
+        def run():
+            with self.transaction(commit_every=commit_every):
+                return func(*args, **kwargs)
+
+        return self._with_retries(run, True)
+
+    def _with_retries(self, operation, retry):
+        # Inside a unit of work a failure aborts the whole transaction, so a
+        # single statement cannot be retried on its own.
+        attempts = DB_RETRY_ATTEMPTS if retry and self.current_unit_of_work() is None else 1
+
+        for attempt in range(1, attempts + 1):
+            try:
+                return operation()
+            except Exception as e:
+                if attempt == attempts or not is_transient_error(e):
+                    raise
+                delay = random.uniform(0, min(DB_RETRY_MAX_DELAY, DB_RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+                logger.warning(f"Transient database error (attempt {attempt}/{attempts}), retrying in {delay:.2f}s: {e}")
+                self.query_stats.record_retry()
+                time.sleep(delay)
+
+    def _set_statement_timeout(self, cursor, call_class):
+        timeout_ms = DB_STATEMENT_TIMEOUT_MS[call_class] if call_class else 0
+        conn = cursor.connection
+        if conn.statement_timeout_ms != timeout_ms:
+            cursor.execute("SET statement_timeout = %s", (timeout_ms,))
+            conn.statement_timeout_ms = timeout_ms
+
+    @contextmanager
+    def savepoint(self):
+        unit_of_work = self.current_unit_of_work()
+        if unit_of_work is None:
+            yield
+            return
+
+        with unit_of_work.savepoint():
+            yield
 
     @contextmanager
     def get_cursor(self, dict_cursor=True):
+        cursor_factory = RealDictCursor if dict_cursor else None
+        unit_of_work = self.current_unit_of_work()
+
+        if unit_of_work is not None:
+            cursor = unit_of_work.conn.cursor(cursor_factory=cursor_factory)
+            try:
+                yield cursor
+                unit_of_work.statement_executed()
+            except Exception as e:
+                logger.error(f"Database error: {e}")
+                raise
+            finally:
+                cursor.close()
+            return
+
         with self.get_connection() as conn:
-            cursor_factory = RealDictCursor if dict_cursor else None
             cursor = conn.cursor(cursor_factory=cursor_factory)
             try:
                 yield cursor
                 conn.commit()
+                self.query_stats.record_commit()
             except Exception as e:
-                conn.rollback()
+                if not conn.closed:
+                    conn.rollback()
+                self.query_stats.record_rollback()
                 logger.error(f"Database error: {e}")
                 raise
             finally:
                 cursor.close()
 
-    def execute_query(self, query, params=None, fetch=False, dict_cursor=True):
-        with self.get_cursor(dict_cursor=dict_cursor) as cursor:
-            cursor.execute(query, params)
-            if fetch:
-                return cursor.fetchall()
-            return cursor.rowcount
+    def _record_statement(self, cursor, query, params, elapsed_ms, rows, explain=True):
+        if not DB_QUERY_STATS_ENABLED:
+            return
+
+        fingerprint = fingerprint_sql(query)
+        call_site = find_call_site()
+        self.query_stats.record(fingerprint, call_site, elapsed_ms, rows)
+
+        if DB_SLOW_QUERY_MS is not None and elapsed_ms >= DB_SLOW_QUERY_MS:
+            logger.warning(f"Slow query ({elapsed_ms:.1f} ms, {rows} rows) at {call_site}: {fingerprint} params={params}")
+            # ANALYZE runs the statement again, so only plain SELECTs; a WITH
+            # may hide a data-modifying CTE.
+            if explain and DB_SLOW_QUERY_EXPLAIN and fingerprint.upper().startswith("SELECT"):
+                self._log_explain(cursor, query, params)
+
+    def _log_explain(self, cursor, query, params):
+        # Always rolled back to its savepoint: a failed EXPLAIN must not abort
+        # the caller's transaction, nor may anything the re-run did persist.
+        try:
+            cursor.execute("SAVEPOINT explain_slow_query")
+        except Exception as e:
+            logger.warning(f"Could not EXPLAIN slow query: {e}")
+            return
+
+        try:
+            cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + query, params)
+            plan = "\n".join(list(row.values())[0] if isinstance(row, dict) else row[0] for row in cursor.fetchall())
+            logger.warning(f"Slow query plan:\n{plan}")
+        except Exception as e:
+            logger.warning(f"Could not EXPLAIN slow query: {e}")
+        finally:
+            cursor.execute("ROLLBACK TO SAVEPOINT explain_slow_query")
+            cursor.execute("RELEASE SAVEPOINT explain_slow_query")
+
+    def execute_query(self, query, params=None, fetch=False, dict_cursor=True, call_class='lookup', retry=None):
+        def run():
+            with self.get_cursor(dict_cursor=dict_cursor) as cursor:
+                self._set_statement_timeout(cursor, call_class)
+                start = time.perf_counter()
+                cursor.execute(query, params)
+                result = cursor.fetchall() if fetch else cursor.rowcount
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                self._record_statement(cursor, query, params, elapsed_ms, len(result) if fetch else result)
+                return result
+
+        return self._with_retries(run, is_idempotent(query) if retry is None else retry)
+
+    def read_frame(self, query, params=None, output='pandas', call_class='analytic'):
+        def run():
+            with self.get_cursor(dict_cursor=False) as cursor:
+                self._set_statement_timeout(cursor, call_class)
+                start = time.perf_counter()
+                statement = cursor.mogrify(query, params).decode('utf-8')
+                cursor.execute(f"SELECT * FROM ({statement}) AS q LIMIT 0")
+                columns = [(column.name, column.type_code) for column in cursor.description]
+
+                buffer = StringIO()
+                cursor.copy_expert(f"COPY ({statement}) TO STDOUT WITH (FORMAT csv)", buffer)
+                buffer.seek(0)
+                frame = frame_from_csv(buffer, columns)
 
-    def execute_many(self, query, params_list):
-        with self.get_cursor(dict_cursor=False) as cursor:
-            cursor.executemany(query, params_list)
-            return cursor.rowcount
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                self._record_statement(cursor, query, params, elapsed_ms, len(frame), explain=False)
+                return frame
+
+        return convert_frame(self._with_retries(run, True), output)
+
+    def execute_prepared(self, name, params=(), fetch=True, dict_cursor=True, call_class='lookup'):
+        param_types, statement = PREPARED_QUERIES[name]
+        params = tuple(params)
+
+        def run():
+            with self.get_cursor(dict_cursor=dict_cursor) as cursor:
+                self._set_statement_timeout(cursor, call_class)
+                start = time.perf_counter()
+                prepared = cursor.connection.prepared_statements
+                if name not in prepared:
+                    cursor.execute(f"PREPARE {name} ({', '.join(param_types)}) AS {statement}")
+                    prepared.add(name)
+
+                placeholders = ", ".join(["%s"] * len(params))
+                cursor.execute(f"EXECUTE {name} ({placeholders})" if params else f"EXECUTE {name}", params)
+                result = cursor.fetchall() if fetch else cursor.rowcount
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                self._record_statement(cursor, statement, params, elapsed_ms, len(result) if fetch else result, explain=False)
+                return result
+
+        return self._with_retries(run, is_idempotent(statement))
+
+    def execute_many(self, query, params_list, page_size=DB_BULK_PAGE_SIZE, call_class='bulk', retry=None):
+        params_list = list(params_list)
+
+        def run():
+            with self.get_cursor(dict_cursor=False) as cursor:
+                self._set_statement_timeout(cursor, call_class)
+                start = time.perf_counter()
+                execute_batch(cursor, query, params_list, page_size=page_size)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                self._record_statement(cursor, query, f"<{len(params_list)} rows>", elapsed_ms, len(params_list))
+                return len(params_list)
+
+        return self._with_retries(run, is_idempotent(query) if retry is None else retry)
+
+    def execute_values(self, query, rows, template=None, page_size=DB_BULK_PAGE_SIZE,
+                       fetch=False, unique_by=None, call_class='bulk', retry=None):
+        rows = list(rows)
+        if unique_by:
+            # ON CONFLICT DO UPDATE cannot touch the same row twice in one statement,
+            # so keep only the last row for each conflict key.
+            rows = list({tuple(row[i] for i in unique_by): row for row in rows}.values())
+        if not rows:
+            return [] if fetch else 0
+
+        def run():
+            with self.get_cursor(dict_cursor=fetch) as cursor:
+                self._set_statement_timeout(cursor, call_class)
+                start = time.perf_counter()
+                returned = []
+                affected = 0
+                for offset in range(0, len(rows), page_size):
+                    page = rows[offset:offset + page_size]
+                    result = execute_values(cursor, query, page, template=template, page_size=len(page), fetch=fetch)
+                    if fetch:
+                        returned.extend(result)
+                    affected += max(cursor.rowcount, 0)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                self._record_statement(cursor, query, f"<{len(rows)} rows>", elapsed_ms, len(returned) if fetch else affected)
+                return returned if fetch else affected
+
+        return self._with_retries(run, is_idempotent(query) if retry is None else retry)
+
+    def copy_records(self, table, data, columns=None, on_conflict=None, returning=None, call_class='bulk', retry=None):
+        frame = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        if columns:
+            frame = frame[list(columns)]
+        if frame.empty:
+            return [] if returning else 0
+
+        column_list = ", ".join(frame.columns)
+
+        def run():
+            buffer = StringIO()
+            frame.to_csv(buffer, index=False, header=False)
+            buffer.seek(0)
+
+            with self.get_cursor(dict_cursor=bool(returning)) as cursor:
+                self._set_statement_timeout(cursor, call_class)
+                start = time.perf_counter()
+                if on_conflict is None and returning is None:
+                    query = f"COPY {table} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+                    cursor.copy_expert(query, buffer)
+                    result = cursor.rowcount
+                else:
+                    staging_table = f"{table}_copy_stage"
+                    cursor.execute(f"CREATE TEMP TABLE {staging_table} AS SELECT {column_list} FROM {table} WITH NO DATA")
+                    cursor.copy_expert(f"COPY {staging_table} ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+                    query = f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging_table} {on_conflict or ''}"
+                    if returning:
+                        query += f" RETURNING {returning}"
+                    cursor.execute(query)
+                    result = cursor.fetchall() if returning else cursor.rowcount
+                    cursor.execute(f"DROP TABLE {staging_table}")
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                self._record_statement(cursor, query, f"<{len(frame)} rows>", elapsed_ms, len(result) if returning else result)
+                return result
+
+        # Only an upsert can be repeated without duplicating rows.
+        return self._with_retries(run, bool(on_conflict) if retry is None else retry)
+
+    def dump_query_stats(self, top=DB_QUERY_STATS_TOP):
+        if not self.query_stats.entries:
+            return None
+
+        summary = self.query_stats.format_summary(top)
+        logger.info(f"Per-run database {summary}")
+
+        LOGS_DIR.mkdir(parents=True, exist_ok=True)
+        summary_path = LOGS_DIR / f"query_stats_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.txt"
+        with open(summary_path, 'w') as f:
+            f.write(summary + "\n")
+        return summary_path
 
     def close_all_connections(self):
         if self._pool:
+            logger.info(f"Connection pool metrics: {self.get_pool_metrics()}")
             self._pool.closeall()
             logger.info("All database connections closed")
 
+def _reset_pool_after_fork():
+    DatabaseConnection._init_lock = threading.Lock()
+    if DatabaseConnection._instance is not None and DatabaseConnection._instance._pool is not None:
+        _inherited_pools.append(DatabaseConnection._instance._pool)
+        DatabaseConnection._instance._pool = None
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pool_after_fork)
+
 def get_db():
     return DatabaseConnection()
@@ -0,0 +1,8 @@
+-- Player match history lookups filter on one player column and order by date.
+-- The composites replace the single-column player indexes.
+
+CREATE INDEX IF NOT EXISTS idx_matches_player1_date ON matches(player_1_id, date DESC);
+CREATE INDEX IF NOT EXISTS idx_matches_player2_date ON matches(player_2_id, date DESC);
+
+DROP INDEX IF EXISTS idx_matches_player1;
+DROP INDEX IF EXISTS idx_matches_player2;
@@ -0,0 +1,4 @@
+-- Scheduled matches (no winner yet) are a tiny slice of the table and are read
+-- by the predictor, the odds fetcher and the stat refresh of today's draw.
+
+CREATE INDEX IF NOT EXISTS idx_matches_upcoming ON matches(date, tournament_id) WHERE winner_id IS NULL;
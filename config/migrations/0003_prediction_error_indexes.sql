@@ -0,0 +1,8 @@
+-- ErrorAnalyzer joins predictions to matches on (match_date, player_1_id, player_2_id)
+-- and aggregates prediction_errors per model over a date range.
+
+CREATE INDEX IF NOT EXISTS idx_predictions_date_players ON predictions(match_date, player_1_id, player_2_id);
+CREATE INDEX IF NOT EXISTS idx_prediction_errors_model_date ON prediction_errors(model_id, match_date);
+
+DROP INDEX IF EXISTS idx_predictions_match_date;
+DROP INDEX IF EXISTS idx_prediction_errors_model;
@@ -0,0 +1,74 @@
+-- Tables that schema.sql gained after databases were first created: the player
+-- match timeline, the monthly-partitioned daily snapshots and the stat refresh
+-- queue fed by a timeline trigger. Snapshot partitions are created on demand
+-- by the snapshot builder.
+
+CREATE TABLE IF NOT EXISTS player_match_timeline (
+    player_id INTEGER REFERENCES players(id) NOT NULL,
+    date DATE NOT NULL,
+    match_id INTEGER REFERENCES matches(id) ON DELETE CASCADE NOT NULL,
+    opponent_id INTEGER REFERENCES players(id) NOT NULL,
+    won BOOLEAN NOT NULL,
+    surface_id INTEGER REFERENCES surfaces(id),
+    player_rank INTEGER,
+    opponent_rank INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT pk_player_match_timeline PRIMARY KEY (player_id, match_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_player_match_timeline_player_date ON player_match_timeline(player_id, date DESC);
+CREATE INDEX IF NOT EXISTS idx_player_match_timeline_player_surface_date ON player_match_timeline(player_id, surface_id, date DESC);
+CREATE INDEX IF NOT EXISTS idx_player_match_timeline_player_opponent ON player_match_timeline(player_id, opponent_id);
+CREATE INDEX IF NOT EXISTS idx_player_match_timeline_match ON player_match_timeline(match_id);
+
+CREATE TABLE IF NOT EXISTS player_daily_snapshots (
+    player_id INTEGER REFERENCES players(id) NOT NULL,
+    snapshot_date DATE NOT NULL,
+    current_rank INTEGER,
+    current_points INTEGER,
+    sports_mood_score DECIMAL(5, 2),
+    last_10_matches_wins INTEGER,
+    last_10_matches_losses INTEGER,
+    hard_win_rate DECIMAL(5, 4),
+    clay_win_rate DECIMAL(5, 4),
+    grass_win_rate DECIMAL(5, 4),
+    carpet_win_rate DECIMAL(5, 4),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT pk_player_daily_snapshots PRIMARY KEY (player_id, snapshot_date)
+) PARTITION BY RANGE (snapshot_date);
+
+CREATE INDEX IF NOT EXISTS idx_player_daily_snapshots_date ON player_daily_snapshots(snapshot_date);
+
+CREATE TABLE IF NOT EXISTS stat_refresh_queue (
+    id BIGSERIAL PRIMARY KEY,
+    player_id INTEGER REFERENCES players(id) NOT NULL,
+    surface_id INTEGER REFERENCES surfaces(id),
+    reason VARCHAR(50),
+    enqueued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    claimed_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_stat_refresh_queue_player ON stat_refresh_queue(player_id);
+CREATE INDEX IF NOT EXISTS idx_stat_refresh_queue_claimed ON stat_refresh_queue(claimed_at);
+
+CREATE OR REPLACE FUNCTION enqueue_timeline_stat_refresh() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO stat_refresh_queue (player_id, surface_id, reason)
+        VALUES (NEW.player_id, NEW.surface_id, lower(TG_OP));
+    END IF;
+
+    IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.surface_id IS DISTINCT FROM NEW.surface_id) THEN
+        INSERT INTO stat_refresh_queue (player_id, surface_id, reason)
+        VALUES (OLD.player_id, OLD.surface_id, lower(TG_OP));
+    END IF;
+
+    PERFORM pg_notify('stat_refresh', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_player_match_timeline_stat_refresh ON player_match_timeline;
+CREATE TRIGGER trg_player_match_timeline_stat_refresh
+    AFTER INSERT OR UPDATE OR DELETE ON player_match_timeline
+    FOR EACH ROW EXECUTE FUNCTION enqueue_timeline_stat_refresh();
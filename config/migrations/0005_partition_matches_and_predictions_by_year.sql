@@ -0,0 +1,133 @@
+-- Range-partition matches (by date) and predictions (by match_date) per year.
+-- Partitioned tables need the partition key in the primary key, so foreign keys
+-- pointing at matches(id) / predictions(id) are dropped; the timeline builder's
+-- reconcile already removes timeline rows whose match is gone.
+
+CREATE OR REPLACE FUNCTION ensure_year_partition(parent_table TEXT, partition_year INTEGER)
+RETURNS TEXT AS $$
+DECLARE
+    partition_name TEXT := parent_table || '_' || partition_year;
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name,
+        parent_table,
+        make_date(partition_year, 1, 1),
+        make_date(partition_year + 1, 1, 1)
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+ALTER TABLE IF EXISTS player_match_timeline DROP CONSTRAINT IF EXISTS player_match_timeline_match_id_fkey;
+ALTER TABLE predictions DROP CONSTRAINT IF EXISTS predictions_match_id_fkey;
+ALTER TABLE prediction_errors DROP CONSTRAINT IF EXISTS prediction_errors_match_id_fkey;
+ALTER TABLE prediction_errors DROP CONSTRAINT IF EXISTS prediction_errors_prediction_id_fkey;
+
+-- Matches
+
+ALTER TABLE matches RENAME TO matches_unpartitioned;
+ALTER INDEX matches_pkey RENAME TO matches_unpartitioned_pkey;
+DROP INDEX IF EXISTS idx_matches_date;
+DROP INDEX IF EXISTS idx_matches_tournament;
+DROP INDEX IF EXISTS idx_matches_surface;
+DROP INDEX IF EXISTS idx_matches_winner;
+DROP INDEX IF EXISTS idx_matches_player1_date;
+DROP INDEX IF EXISTS idx_matches_player2_date;
+DROP INDEX IF EXISTS idx_matches_upcoming;
+ALTER SEQUENCE matches_id_seq OWNED BY NONE;
+
+CREATE TABLE matches (
+    id INTEGER NOT NULL DEFAULT nextval('matches_id_seq'),
+    tournament_id INTEGER REFERENCES tournaments(id),
+    date DATE NOT NULL,
+    round_id INTEGER REFERENCES rounds(id),
+    court_type_id INTEGER REFERENCES court_types(id),
+    surface_id INTEGER REFERENCES surfaces(id),
+    best_of INTEGER,
+    player_1_id INTEGER REFERENCES players(id) NOT NULL,
+    player_2_id INTEGER REFERENCES players(id) NOT NULL,
+    winner_id INTEGER REFERENCES players(id),
+    rank_1 INTEGER,
+    rank_2 INTEGER,
+    pts_1 INTEGER,
+    pts_2 INTEGER,
+    odd_1 DECIMAL(10, 2),
+    odd_2 DECIMAL(10, 2),
+    score VARCHAR(100),
+    total_sets INTEGER,
+    total_games INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, date),
+    CONSTRAINT chk_different_players CHECK (player_1_id != player_2_id)
+) PARTITION BY RANGE (date);
+
+ALTER SEQUENCE matches_id_seq OWNED BY matches.id;
+
+SELECT ensure_year_partition('matches', partition_year)
+FROM (
+    SELECT DISTINCT EXTRACT(YEAR FROM date)::INTEGER AS partition_year FROM matches_unpartitioned
+    UNION
+    SELECT EXTRACT(YEAR FROM CURRENT_DATE)::INTEGER
+) years;
+
+INSERT INTO matches SELECT * FROM matches_unpartitioned;
+DROP TABLE matches_unpartitioned;
+
+CREATE INDEX idx_matches_date ON matches(date);
+CREATE INDEX idx_matches_tournament ON matches(tournament_id);
+CREATE INDEX idx_matches_surface ON matches(surface_id);
+CREATE INDEX idx_matches_winner ON matches(winner_id);
+CREATE INDEX idx_matches_player1_date ON matches(player_1_id, date DESC);
+CREATE INDEX idx_matches_player2_date ON matches(player_2_id, date DESC);
+CREATE INDEX idx_matches_upcoming ON matches(date, tournament_id) WHERE winner_id IS NULL;
+
+-- Predictions
+
+ALTER TABLE predictions RENAME TO predictions_unpartitioned;
+ALTER INDEX predictions_pkey RENAME TO predictions_unpartitioned_pkey;
+DROP INDEX IF EXISTS idx_predictions_model;
+DROP INDEX IF EXISTS idx_predictions_players;
+DROP INDEX IF EXISTS idx_predictions_timestamp;
+DROP INDEX IF EXISTS idx_predictions_date_players;
+ALTER SEQUENCE predictions_id_seq OWNED BY NONE;
+
+CREATE TABLE predictions (
+    id INTEGER NOT NULL DEFAULT nextval('predictions_id_seq'),
+    model_id INTEGER REFERENCES models(id) NOT NULL,
+    match_date DATE NOT NULL,
+    tournament_id INTEGER REFERENCES tournaments(id),
+    player_1_id INTEGER REFERENCES players(id) NOT NULL,
+    player_2_id INTEGER REFERENCES players(id) NOT NULL,
+    predicted_winner_id INTEGER REFERENCES players(id) NOT NULL,
+    predicted_total_sets INTEGER,
+    predicted_total_games INTEGER,
+    winner_probability DECIMAL(5, 4),
+    confidence_score DECIMAL(5, 4),
+    prediction_timestamp TIMESTAMP NOT NULL,
+    actual_winner_id INTEGER REFERENCES players(id),
+    actual_total_sets INTEGER,
+    actual_total_games INTEGER,
+    match_id INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, match_date),
+    CONSTRAINT chk_different_players_pred CHECK (player_1_id != player_2_id)
+) PARTITION BY RANGE (match_date);
+
+ALTER SEQUENCE predictions_id_seq OWNED BY predictions.id;
+
+SELECT ensure_year_partition('predictions', partition_year)
+FROM (
+    SELECT DISTINCT EXTRACT(YEAR FROM match_date)::INTEGER AS partition_year FROM predictions_unpartitioned
+    UNION
+    SELECT EXTRACT(YEAR FROM CURRENT_DATE)::INTEGER
+) years;
+
+INSERT INTO predictions SELECT * FROM predictions_unpartitioned;
+DROP TABLE predictions_unpartitioned;
+
+CREATE INDEX idx_predictions_model ON predictions(model_id);
+CREATE INDEX idx_predictions_players ON predictions(player_1_id, player_2_id);
+CREATE INDEX idx_predictions_timestamp ON predictions(prediction_timestamp);
+CREATE INDEX idx_predictions_date_players ON predictions(match_date, player_1_id, player_2_id);
@@ -0,0 +1,12 @@
+-- Hyperparameter search strategy per training configuration:
+-- 'random' (RandomizedSearchCV), 'halving' (successive halving over the
+-- training-data budget) or 'tpe' (Optuna TPE sampler with fold pruning).
+-- search_iterations is the number of sampled candidates / trials.
+
+ALTER TABLE training_configurations
+    ADD COLUMN IF NOT EXISTS search_strategy VARCHAR(20) DEFAULT 'halving',
+    ADD COLUMN IF NOT EXISTS search_iterations INTEGER DEFAULT 81;
+
+UPDATE training_configurations
+SET cross_validation_folds = 3
+WHERE cross_validation_folds IS NULL;
@@ -0,0 +1,38 @@
+-- Durable hyperparameter search: one tuning_searches row per search and one
+-- tuning_trials row per evaluated candidate, so an interrupted search resumes
+-- and later searches warm-start from the best prior configurations.
+
+CREATE TABLE IF NOT EXISTS tuning_searches (
+    id SERIAL PRIMARY KEY,
+    training_run_id INTEGER REFERENCES training_runs(id),
+    model_type VARCHAR(100) NOT NULL,
+    strategy VARCHAR(20) NOT NULL,
+    feature_version VARCHAR(64) NOT NULL,
+    dataset_version VARCHAR(64) NOT NULL,
+    search_key VARCHAR(64) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'running',
+    best_params JSONB,
+    best_score DOUBLE PRECISION,
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_tuning_searches_resume ON tuning_searches(search_key, dataset_version) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS idx_tuning_searches_model_feature ON tuning_searches(model_type, feature_version);
+
+CREATE TABLE IF NOT EXISTS tuning_trials (
+    id SERIAL PRIMARY KEY,
+    search_id INTEGER NOT NULL REFERENCES tuning_searches(id) ON DELETE CASCADE,
+    trial_number INTEGER NOT NULL,
+    params JSONB NOT NULL,
+    params_key TEXT NOT NULL,
+    n_samples INTEGER NOT NULL,
+    fold_scores JSONB,
+    mean_score DOUBLE PRECISION,
+    fit_seconds DOUBLE PRECISION,
+    status VARCHAR(20) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (search_id, params_key, n_samples)
+);
+
+CREATE INDEX IF NOT EXISTS idx_tuning_trials_score ON tuning_trials(search_id, mean_score DESC);
@@ -0,0 +1,14 @@
+-- Time-ordered validation: the holdout is the most recent slice of matches
+-- and CV folds walk forward by month or season instead of shuffling.
+-- validation_strategy = 'random' keeps the previous stratified split.
+
+ALTER TABLE training_configurations
+    ADD COLUMN IF NOT EXISTS validation_strategy VARCHAR(20) DEFAULT 'walk_forward',
+    ADD COLUMN IF NOT EXISTS walk_forward_period VARCHAR(10) DEFAULT 'month',
+    ADD COLUMN IF NOT EXISTS walk_forward_window VARCHAR(10) DEFAULT 'expanding',
+    ADD COLUMN IF NOT EXISTS walk_forward_folds INTEGER DEFAULT 6,
+    ADD COLUMN IF NOT EXISTS walk_forward_train_periods INTEGER;
+
+ALTER TABLE training_runs
+    ADD COLUMN IF NOT EXISTS validation_strategy VARCHAR(20),
+    ADD COLUMN IF NOT EXISTS fold_metrics JSONB;
@@ -0,0 +1,7 @@
+-- Incremental retraining continues boosting the active model on matches
+-- played after its training data ends. training_data_end marks that point
+-- and base_model_id links a continued model to the one it grew from.
+
+ALTER TABLE models
+    ADD COLUMN IF NOT EXISTS training_data_end DATE,
+    ADD COLUMN IF NOT EXISTS base_model_id INTEGER REFERENCES models(id);
@@ -0,0 +1,6 @@
+-- A model bundle pickles the winner model together with the sets and games
+-- regressors of the same training job, so predictions load and score all
+-- three at once. model_file_path keeps the winner model on its own.
+
+ALTER TABLE models
+    ADD COLUMN IF NOT EXISTS bundle_file_path VARCHAR(500);
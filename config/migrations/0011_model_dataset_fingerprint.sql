@@ -0,0 +1,11 @@
+-- Fingerprints of the data and configuration each model was trained on, so
+-- a scheduled run can skip retraining when neither changed.
+-- dataset_fingerprint: match id range, row count, feature version and a
+-- content hash of the feature matrix. configuration_fingerprint: training
+-- configuration, tuning flag and model families.
+
+ALTER TABLE models
+    ADD COLUMN IF NOT EXISTS dataset_fingerprint VARCHAR(128),
+    ADD COLUMN IF NOT EXISTS configuration_fingerprint VARCHAR(16);
+
+CREATE INDEX IF NOT EXISTS idx_models_dataset_fingerprint ON models(dataset_fingerprint);
@@ -99,6 +99,26 @@ CREATE INDEX idx_matches_tournament ON matches(tournament_id);
 CREATE INDEX idx_matches_surface ON matches(surface_id);
 CREATE INDEX idx_matches_winner ON matches(winner_id);
 
+-- Player Match Timeline (two rows per finished match, one per player)
+
+CREATE TABLE IF NOT EXISTS player_match_timeline (
+    player_id INTEGER REFERENCES players(id) NOT NULL,
+    date DATE NOT NULL,
+    match_id INTEGER REFERENCES matches(id) ON DELETE CASCADE NOT NULL,
+    opponent_id INTEGER REFERENCES players(id) NOT NULL,
+    won BOOLEAN NOT NULL,
+    surface_id INTEGER REFERENCES surfaces(id),
+    player_rank INTEGER,
+    opponent_rank INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT pk_player_match_timeline PRIMARY KEY (player_id, match_id)
+);
+
+CREATE INDEX idx_player_match_timeline_player_date ON player_match_timeline(player_id, date DESC);
+CREATE INDEX idx_player_match_timeline_player_surface_date ON player_match_timeline(player_id, surface_id, date DESC);
+CREATE INDEX idx_player_match_timeline_player_opponent ON player_match_timeline(player_id, opponent_id);
+CREATE INDEX idx_player_match_timeline_match ON player_match_timeline(match_id);
+
 -- Player Statistics
 
 CREATE TABLE IF NOT EXISTS player_stats (
@@ -135,6 +155,61 @@ CREATE TABLE IF NOT EXISTS surface_history (
 CREATE INDEX idx_surface_history_player ON surface_history(player_id);
 CREATE INDEX idx_surface_history_surface ON surface_history(surface_id);
 
+-- Daily Player Snapshots (append-only, one row per player per day, partitioned by month)
+
+CREATE TABLE IF NOT EXISTS player_daily_snapshots (
+    player_id INTEGER REFERENCES players(id) NOT NULL,
+    snapshot_date DATE NOT NULL,
+    current_rank INTEGER,
+    current_points INTEGER,
+    sports_mood_score DECIMAL(5, 2),
+    last_10_matches_wins INTEGER,
+    last_10_matches_losses INTEGER,
+    hard_win_rate DECIMAL(5, 4),
+    clay_win_rate DECIMAL(5, 4),
+    grass_win_rate DECIMAL(5, 4),
+    carpet_win_rate DECIMAL(5, 4),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT pk_player_daily_snapshots PRIMARY KEY (player_id, snapshot_date)
+) PARTITION BY RANGE (snapshot_date);
+
+CREATE INDEX idx_player_daily_snapshots_date ON player_daily_snapshots(snapshot_date);
+
+-- Stat Refresh Queue (players whose derived stats must be recomputed)
+
+CREATE TABLE IF NOT EXISTS stat_refresh_queue (
+    id BIGSERIAL PRIMARY KEY,
+    player_id INTEGER REFERENCES players(id) NOT NULL,
+    surface_id INTEGER REFERENCES surfaces(id),
+    reason VARCHAR(50),
+    enqueued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    claimed_at TIMESTAMP
+);
+
+CREATE INDEX idx_stat_refresh_queue_player ON stat_refresh_queue(player_id);
+CREATE INDEX idx_stat_refresh_queue_claimed ON stat_refresh_queue(claimed_at);
+
+CREATE OR REPLACE FUNCTION enqueue_timeline_stat_refresh() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO stat_refresh_queue (player_id, surface_id, reason)
+        VALUES (NEW.player_id, NEW.surface_id, lower(TG_OP));
+    END IF;
+
+    IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.surface_id IS DISTINCT FROM NEW.surface_id) THEN
+        INSERT INTO stat_refresh_queue (player_id, surface_id, reason)
+        VALUES (OLD.player_id, OLD.surface_id, lower(TG_OP));
+    END IF;
+
+    PERFORM pg_notify('stat_refresh', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_player_match_timeline_stat_refresh
+    AFTER INSERT OR UPDATE OR DELETE ON player_match_timeline
+    FOR EACH ROW EXECUTE FUNCTION enqueue_timeline_stat_refresh();
+
 CREATE TABLE IF NOT EXISTS player_news (
     id SERIAL PRIMARY KEY,
     player_id INTEGER REFERENCES players(id) NOT NULL,
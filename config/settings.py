@@ -8,12 +8,63 @@ RAW_DATA_DIR = DATA_DIR / "raw"
 PROCESSED_DATA_DIR = DATA_DIR / "processed"
 MODELS_DIR = DATA_DIR / "models"
 LOGS_DIR = BASE_DIR / "logs"
+SCHEMA_PATH = BASE_DIR / "config" / "schema.sql"
+MIGRATIONS_DIR = BASE_DIR / "config" / "migrations"
 
 DEFAULT_TRAIN_SPLIT = 0.8
 DEFAULT_VAL_SPLIT = 0.2
 DEFAULT_TEST_SPLIT = 0.0
 DEFAULT_RANDOM_SEED = 42
+DEFAULT_SEARCH_STRATEGY = "halving"
+DEFAULT_SEARCH_ITERATIONS = 81
+DEFAULT_CV_FOLDS = 3
+HALVING_FACTOR = 3
+TUNING_WARM_START_CONFIGS = 5
+EARLY_STOPPING_ROUNDS = 50
+# Most recent share of the training data held back to stop boosting early.
+EARLY_STOPPING_FRACTION = 0.1
+INCREMENTAL_MIN_NEW_MATCHES = 200
+INCREMENTAL_HOLDOUT_FRACTION = 0.3
+INCREMENTAL_ROUNDS = 50
+INCREMENTAL_HALF_LIFE_DAYS = 90
+INCREMENTAL_DRIFT_REFERENCE_DAYS = 365
+# Fall back to a full retrain above this feature PSI or accuracy drop.
+INCREMENTAL_MAX_DRIFT = 0.25
+INCREMENTAL_MAX_ACCURACY_DROP = 0.02
+DEFAULT_VALIDATION_STRATEGY = "walk_forward"
+WALK_FORWARD_PERIOD = "month"
+WALK_FORWARD_WINDOW = "expanding"
+WALK_FORWARD_FOLDS = 6
+TRAINING_CPU_BUDGET = int(os.getenv("TRAINING_CPU_BUDGET", str(os.cpu_count() or 1)))
+# Outer parallel workers; 0 picks one per task, up to the budget.
+TRAINING_OUTER_WORKERS = int(os.getenv("TRAINING_OUTER_WORKERS", "0"))
 USE_ERROR_FEEDBACK = False
+# Snapshots only exist from the day the daily job started building them;
+# matches before the first snapshot get empty mood and surface features.
+USE_PLAYER_SNAPSHOTS = False
+
+DB_POOL_BACKEND = os.getenv("DB_POOL_BACKEND", "blocking")
+DB_POOL_MIN_CONN = int(os.getenv("DB_POOL_MIN_CONN", "1"))
+DB_POOL_MAX_CONN = int(os.getenv("DB_POOL_MAX_CONN", "10"))
+DB_POOL_WAIT_TIMEOUT = float(os.getenv("DB_POOL_WAIT_TIMEOUT", "30"))
+
+DB_COMMIT_EVERY = int(os.getenv("DB_COMMIT_EVERY", "500"))
+DB_BULK_PAGE_SIZE = int(os.getenv("DB_BULK_PAGE_SIZE", "1000"))
+
+# statement_timeout per call class, in milliseconds (0 disables it).
+DB_STATEMENT_TIMEOUT_MS = {
+    'lookup': int(os.getenv("DB_LOOKUP_TIMEOUT_MS", "15000")),
+    'bulk': int(os.getenv("DB_BULK_TIMEOUT_MS", "300000")),
+    'analytic': int(os.getenv("DB_ANALYTIC_TIMEOUT_MS", "900000"))
+}
+DB_RETRY_ATTEMPTS = int(os.getenv("DB_RETRY_ATTEMPTS", "4"))
+DB_RETRY_BASE_DELAY = float(os.getenv("DB_RETRY_BASE_DELAY", "0.5"))
+DB_RETRY_MAX_DELAY = float(os.getenv("DB_RETRY_MAX_DELAY", "15"))
+
+DB_QUERY_STATS_ENABLED = os.getenv("DB_QUERY_STATS_ENABLED", "true").lower() == "true"
+DB_QUERY_STATS_TOP = 25
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "500"))
+DB_SLOW_QUERY_EXPLAIN = os.getenv("DB_SLOW_QUERY_EXPLAIN", "false").lower() == "true"
 
 MIN_TOURNAMENT_SERIES = ["ATP500", "Masters 1000", "Grand Slam"]
 
@@ -52,6 +103,20 @@ SPORTS_MOOD_WEIGHTS = {
     "hard_loss": -1.0
 }
 
+TIMELINE_SYNC_BATCH_SIZE = 1000
+
+ANALYTICS_ENGINE = os.getenv("ANALYTICS_ENGINE", "postgres")
+DUCKDB_MIRROR_PATH = Path(os.getenv("DUCKDB_MIRROR_PATH", str(DATA_DIR / "analytics.duckdb")))
+DUCKDB_MIRROR_LOOKBACK_DAYS = 30
+
+STAT_REFRESH_CHANNEL = "stat_refresh"
+STAT_REFRESH_BATCH_SIZE = 500
+STAT_REFRESH_CLAIM_TIMEOUT_MINUTES = 10
+STAT_REFRESH_IDLE_TIMEOUT = 60
+# Predictions wait this many seconds for refreshes other workers hold.
+STAT_REFRESH_WAIT_TIMEOUT = 120
+STAT_REFRESH_POLL_INTERVAL = 1
+
 PERSONAL_MOOD_CATEGORIES = {
     "positive": ["marriage", "birth", "vacation", "achievement", "award"],
     "negative": ["injury", "scandal", "breakup", "family_issue", "accident"]
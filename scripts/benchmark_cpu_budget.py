@@ -0,0 +1,82 @@
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import ParameterSampler, StratifiedKFold
+from config.settings import TRAINING_CPU_BUDGET
+from src.models.fold_matrix import as_training_matrix
+from src.models.model_factory import ModelFactory
+from src.models.trainer import ModelTrainer
+from src.models.walk_forward import run_fold_tasks
+from src.utils.cpu_budget import CPUBudget
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__, 'benchmark_cpu_budget.log')
+
+class UnboundedBudget(CPUBudget):
+    # The old behaviour: one worker per task and every fit on all cores.
+    def split(self, n_tasks):
+        return max(1, min(n_tasks, self.total)), self.total
+
+def _accuracy(y_true, y_pred):
+    return float(accuracy_score(y_true, y_pred))
+
+def candidate_splits(total):
+    outer = 1
+    splits = []
+    while outer <= total:
+        splits.append((outer, total // outer))
+        outer *= 2
+    if splits[-1][0] != total:
+        splits.append((total, 1))
+    return splits
+
+def main():
+    parser = argparse.ArgumentParser(description='Time outer workers x estimator threads splits of the CPU budget')
+    parser.add_argument('--model', default='XGBoost', help='Model type to fit')
+    parser.add_argument('--limit', type=int, help='Limit number of matches')
+    parser.add_argument('--candidates', type=int, default=8, help='Hyperparameter candidates per run')
+    parser.add_argument('--folds', type=int, default=3, help='CV folds per candidate')
+    parser.add_argument('--budget', type=int, default=TRAINING_CPU_BUDGET, help='Cores to split')
+    args = parser.parse_args()
+
+    trainer = ModelTrainer()
+    X, y, _, _, _, _ = trainer.prepare_data(limit=args.limit)
+    X, y = as_training_matrix(X), y.to_numpy()
+    model = ModelFactory.create_model(args.model)
+    estimator = model.create_estimator(model.get_default_hyperparameters())
+
+    folds = list(StratifiedKFold(n_splits=args.folds, shuffle=True, random_state=42).split(X, y))
+    candidates = list(ParameterSampler(model.get_hyperparameter_search_space(), n_iter=args.candidates,
+                                       random_state=42))
+    tasks = [(params, train_idx, test_idx) for params in candidates for train_idx, test_idx in folds]
+
+    print(f"\n=== CPU Budget Benchmark: {args.model}, {len(X)} samples, {len(tasks)} fits, "
+          f"{args.budget} cores ===\n")
+
+    runs = [('unbounded', UnboundedBudget(args.budget))]
+    runs += [(f"{outer} x {threads}", CPUBudget(args.budget, outer_workers=outer))
+             for outer, threads in candidate_splits(args.budget)]
+
+    results = []
+    for label, budget in runs:
+        start = time.perf_counter()
+        # A fresh fold cache per run, so every split pays for building it once.
+        with budget.limit_native_threads(budget.split(len(tasks))[1]):
+            outcomes = run_fold_tasks(estimator, X, y, tasks, _accuracy, budget, model.create_fold_cache(X, y))
+        elapsed = time.perf_counter() - start
+        fit_seconds = sum(seconds for _, seconds in outcomes)
+        results.append((label, elapsed))
+        print(f"{label:>12}: {elapsed:8.2f}s wall, {fit_seconds:8.2f}s summed fit time")
+        logger.info(f"{label}: {elapsed:.2f}s wall")
+
+    best_label, best_elapsed = min(results[1:], key=lambda result: result[1])
+    print(f"\nBest split: {best_label} (outer workers x threads) in {best_elapsed:.2f}s")
+    print(f"Set TRAINING_OUTER_WORKERS={best_label.split(' x ')[0]} to use it.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import sys
+import json
+from datetime import date
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.database import get_db
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__, 'check_query_plans.log')
+
+HOT_QUERIES = [
+    {
+        'name': 'player_1 match history',
+        'query': "SELECT id FROM matches WHERE player_1_id = %s ORDER BY date DESC LIMIT 10",
+        'params': (1,),
+        'index': 'idx_matches_player1_date'
+    },
+    {
+        'name': 'player_2 match history',
+        'query': "SELECT id FROM matches WHERE player_2_id = %s ORDER BY date DESC LIMIT 10",
+        'params': (1,),
+        'index': 'idx_matches_player2_date'
+    },
+    {
+        'name': 'upcoming matches',
+        'query': "SELECT id, tournament_id FROM matches WHERE date = %s AND winner_id IS NULL",
+        'params': (date.today(),),
+        'index': 'idx_matches_upcoming'
+    },
+    {
+        'name': 'prediction by match',
+        'query': """
+            SELECT id FROM predictions
+            WHERE match_date = %s AND player_1_id = %s AND player_2_id = %s
+        """,
+        'params': (date.today(), 1, 2),
+        'index': 'idx_predictions_date_players'
+    },
+    {
+        'name': 'model error aggregate',
+        'query': """
+            SELECT COUNT(*) FROM prediction_errors
+            WHERE model_id = %s AND match_date BETWEEN %s AND %s
+        """,
+        'params': (1, date.today(), date.today()),
+        'index': 'idx_prediction_errors_model_date'
+    },
+    {
+        'name': 'player last N matches',
+        'query': """
+            SELECT match_id FROM player_match_timeline
+            WHERE player_id = %s ORDER BY date DESC LIMIT 10
+        """,
+        'params': (1,),
+        'index': 'idx_player_match_timeline_player_date'
+    }
+]
+
+# On partitioned tables the plan names each partition's own index; this maps
+# every index to itself and the parent indexes it is attached to.
+INDEX_ANCESTORS_SQL = """
+    SELECT c.relname AS index_name, p.relname AS ancestor_name
+    FROM pg_class c
+    CROSS JOIN LATERAL pg_partition_ancestors(c.oid) a
+    JOIN pg_class p ON p.oid = a.relid
+    WHERE c.relname = ANY(%s) AND c.relkind IN ('i', 'I')
+"""
+
+def plan_indexes(node):
+    indexes = set()
+    if 'Index Name' in node:
+        indexes.add(node['Index Name'])
+    for child in node.get('Plans', []):
+        indexes |= plan_indexes(child)
+    return indexes
+
+def with_parent_indexes(db, indexes):
+    if not indexes:
+        return indexes
+    rows = db.execute_query(INDEX_ANCESTORS_SQL, (sorted(indexes),), fetch=True)
+    return indexes | {row['ancestor_name'] for row in rows}
+
+def explain(db, query, params):
+    # Small or empty tables make sequential scans the cheapest plan, so disable
+    # them to check that the index is usable for the query shape.
+    with db.transaction():
+        db.execute_query("SET LOCAL enable_seqscan = off")
+        result = db.execute_query("EXPLAIN (FORMAT JSON) " + query, params, fetch=True, dict_cursor=False)
+
+    plan = result[0][0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]['Plan']
+
+def main():
+    print("\n=== Checking Hot Query Plans ===\n")
+
+    db = get_db()
+    failures = 0
+
+    for check in HOT_QUERIES:
+        plan = explain(db, check['query'], check['params'])
+        used = plan_indexes(plan)
+
+        if check['index'] in with_parent_indexes(db, used):
+            print(f"✓ {check['name']}: {check['index']}")
+        else:
+            failures += 1
+            found = ", ".join(sorted(used)) or plan['Node Type']
+            print(f"✗ {check['name']}: expected {check['index']}, plan uses {found}")
+            logger.warning(f"Query '{check['name']}' does not use {check['index']}: {json.dumps(plan)}")
+
+    print(f"\n=== {len(HOT_QUERIES) - failures}/{len(HOT_QUERIES)} queries use their index ===\n")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from config.database import get_db
+from config.settings import SCHEMA_PATH
+from src.utils.migrations import MigrationRunner
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__, 'init_database.log')
@@ -54,13 +56,17 @@ def create_database():
         return False
 
 def run_schema():
-    schema_path = Path(__file__).parent.parent / "config" / "schema.sql"
-
     try:
-        with open(schema_path, 'r') as f:
+        db = get_db()
+        existing = db.execute_query("SELECT to_regclass('public.players') AS players", fetch=True)
+        if existing[0]['players']:
+            logger.info("Base schema already present, skipping schema.sql")
+            print("✓ Base schema already present")
+            return True
+
+        with open(SCHEMA_PATH, 'r') as f:
             schema_sql = f.read()
 
-        db = get_db()
         with db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(schema_sql)
@@ -76,6 +82,21 @@ def run_schema():
         print(f"✗ Error creating schema: {e}")
         return False
 
+def run_migrations():
+    try:
+        applied = MigrationRunner().migrate()
+
+        for migration in applied:
+            print(f"✓ Applied migration {migration['version']:04d}_{migration['name']}")
+        if not applied:
+            print("✓ No pending migrations")
+        return True
+
+    except Exception as e:
+        logger.error(f"Error applying migrations: {e}")
+        print(f"✗ Error applying migrations: {e}")
+        return False
+
 def insert_default_configurations():
     db = get_db()
 
@@ -153,7 +174,11 @@ def main():
     if not run_schema():
         return
 
-    print("\nStep 3: Inserting default configurations...")
+    print("\nStep 3: Applying migrations...")
+    if not run_migrations():
+        return
+
+    print("\nStep 4: Inserting default configurations...")
     if not insert_default_configurations():
         return
 
@@ -34,12 +34,12 @@ def main():
 
     print("\nStep 2: Calculating sports mood scores...")
     sports_mood_calc = SportsMoodCalculator()
-    updated = sports_mood_calc.update_all_active_players()
+    updated = sports_mood_calc.update_all_active_players(concurrent=True)
     print(f"✓ Updated sports mood for {updated} players")
 
     print("\nStep 3: Calculating surface history...")
     surface_calc = SurfaceHistoryCalculator()
-    updated = surface_calc.update_all_player_surfaces()
+    updated = surface_calc.update_all_player_surfaces(concurrent=True)
     print(f"✓ Updated {updated} player-surface combinations")
 
     print("\n=== Initial data loading completed! ===\n")
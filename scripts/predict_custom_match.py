@@ -5,9 +5,8 @@ sys.path.append(str(Path(__file__).parent.parent))
 from datetime import datetime
 from config.database import get_db
 from src.prediction.predictor import Predictor
-from src.utils.database_utils import get_or_create_player
-from src.data.sports_mood_calculator import SportsMoodCalculator
-from src.data.surface_history_calculator import SurfaceHistoryCalculator
+from src.utils.database_utils import get_or_create_player, ensure_year_partition
+from src.data.stat_refresh_worker import StatRefreshWorker
 
 def predict_custom_match(player_1_name, player_2_name, tournament="Custom Match",
                         surface="Hard", court_type="Outdoor",
@@ -40,21 +39,16 @@ def predict_custom_match(player_1_name, player_2_name, tournament="Custom Match"
     print(f"✓ {p2_info['name']} (Ranking: {rank_2})")
     print()
 
-    # Calculate stats
-    print("Calculando estadísticas de jugadores...")
-    sports_mood_calc = SportsMoodCalculator()
-    surface_calc = SurfaceHistoryCalculator()
-
-    sports_mood_calc.update_player_sports_mood(player_1_id)
-    sports_mood_calc.update_player_sports_mood(player_2_id)
-
     # Get surface ID
     surface_query = "SELECT id FROM surfaces WHERE name = %s"
     surface_result = db.execute_query(surface_query, (surface,), fetch=True)
     surface_id = surface_result[0]['id'] if surface_result else 1
 
-    surface_calc.update_player_surface_history(player_1_id, surface_id)
-    surface_calc.update_player_surface_history(player_2_id, surface_id)
+    # Calculate stats (only for the two players in this match)
+    print("Calculando estadísticas de jugadores...")
+    refresh_worker = StatRefreshWorker()
+    refresh_worker.enqueue_players([(player_1_id, surface_id), (player_2_id, surface_id)], reason="custom_match")
+    refresh_worker.refresh_players([player_1_id, player_2_id])
     print("✓ Estadísticas calculadas")
     print()
 
@@ -86,6 +80,7 @@ def predict_custom_match(player_1_name, player_2_name, tournament="Custom Match"
 
     # Create temporary match for prediction
     today = datetime.now().date()
+    ensure_year_partition('matches', today.year)
     match_query = """
         INSERT INTO matches
         (tournament_id, date, round_id, court_type_id, surface_id,
@@ -202,7 +197,7 @@ def predict_custom_match(player_1_name, player_2_name, tournament="Custom Match"
     print("=" * 70)
 
     # Delete temporary match
-    db.execute_query("DELETE FROM matches WHERE id = %s", (match_id,))
+    db.execute_query("DELETE FROM matches WHERE id = %s AND date = %s", (match_id, today))
 
     return {
         'winner': winner_name,
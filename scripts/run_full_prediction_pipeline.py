@@ -1,4 +1,6 @@
 import sys
+import asyncio
+import argparse
 from pathlib import Path
 from datetime import datetime
 
@@ -6,12 +8,34 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from src.prediction.match_fetcher import MatchFetcher
 from src.prediction.predictor import Predictor
+from src.data.betting_odds_fetcher import BettingOddsFetcher
+from config.async_database import get_async_db
 from src.utils.html_report_generator import HTMLReportGenerator
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__, 'full_pipeline.log')
 
+async def predict_and_report_async(predictor, today):
+    # Predictions and odds fetching are independent, so they share the event loop;
+    # the report reads the predictions that were just saved.
+    try:
+        predictions, odds_count = await asyncio.gather(
+            predictor.predict_all_today_async(),
+            BettingOddsFetcher().fetch_odds_for_todays_matches_async()
+        )
+        print(f"✓ Cuotas obtenidas: {odds_count}")
+        report_path = await HTMLReportGenerator().generate_daily_report_async(today)
+    finally:
+        await get_async_db().close()
+
+    return predictions, report_path
+
 def main():
+    parser = argparse.ArgumentParser(description='Run the full daily prediction pipeline')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='Predict, fetch odds and build the report concurrently on the asyncpg layer')
+    args = parser.parse_args()
+
     print("\n" + "="*60)
     print("   TENNIS MACHINE - FULL PREDICTION PIPELINE")
     print("="*60 + "\n")
@@ -51,7 +75,10 @@ def main():
     print(f"  ID: {model_info['id']}")
     print(f"  Precisión: {model_info['model_data']['validation_accuracy']:.4f}")
 
-    predictions = predictor.predict_all_today()
+    if args.use_async:
+        predictions, report_path = asyncio.run(predict_and_report_async(predictor, today))
+    else:
+        predictions = predictor.predict_all_today()
 
     print(f"\n✓ Predicciones completadas: {len(predictions)}")
 
@@ -67,8 +94,9 @@ def main():
     print("\nStep 3: Generando reporte HTML...")
     print("-" * 60)
 
-    report_gen = HTMLReportGenerator()
-    report_path = report_gen.generate_daily_report(today)
+    if not args.use_async:
+        report_gen = HTMLReportGenerator()
+        report_path = report_gen.generate_daily_report(today)
 
     print(f"✓ Reporte generado exitosamente")
     print(f"  📄 Ubicación: {report_path}")
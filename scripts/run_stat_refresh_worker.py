@@ -0,0 +1,46 @@
+import sys
+import argparse
+import multiprocessing
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data.stat_refresh_worker import StatRefreshWorker
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__, 'stat_refresh_worker.log')
+
+def run_worker(once, batch_size):
+    worker = StatRefreshWorker(batch_size=batch_size)
+    if once:
+        refreshed, errors = worker.drain()
+        logger.info(f"Queue drained. Refreshed: {refreshed}, Errors: {errors}")
+    else:
+        worker.listen()
+
+def main():
+    parser = argparse.ArgumentParser(description='Process queued player stat refreshes')
+    parser.add_argument('--workers', type=int, default=1, help='Number of worker processes')
+    parser.add_argument('--batch-size', type=int, default=500, help='Queue entries claimed per batch')
+    parser.add_argument('--once', action='store_true', help='Drain the queue and exit instead of listening')
+    args = parser.parse_args()
+
+    print("\n=== Stat Refresh Workers ===\n")
+    print(f"Workers: {args.workers}, Batch size: {args.batch_size}, Mode: {'drain' if args.once else 'listen'}\n")
+
+    if args.workers == 1:
+        run_worker(args.once, args.batch_size)
+    else:
+        processes = [
+            multiprocessing.Process(target=run_worker, args=(args.once, args.batch_size))
+            for _ in range(args.workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+    print("\n=== Stat Refresh Completed ===\n")
+
+if __name__ == "__main__":
+    main()
@@ -13,17 +13,26 @@ def main():
     parser = argparse.ArgumentParser(description='Train tennis prediction models')
     parser.add_argument('--tune', action='store_true', help='Enable hyperparameter tuning')
     parser.add_argument('--limit', type=int, help='Limit number of matches for training')
+    parser.add_argument('--training-config', type=int,
+                        help='training_configurations id (split ratios, search strategy and budget)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Continue the active model on new matches, retraining fully on drift or accuracy loss')
+    parser.add_argument('--force', action='store_true',
+                        help='Retrain even if a model exists for the same data and configuration')
     args = parser.parse_args()
 
     print("\n=== Starting Model Training ===\n")
 
-    trainer = ModelTrainer()
+    trainer = ModelTrainer(training_configuration_id=args.training_config)
 
     print("Training all models...")
     if args.tune:
         print("(Hyperparameter tuning enabled)")
 
-    results = trainer.train_all_models(tune_hyperparameters=args.tune, limit=args.limit)
+    if args.incremental:
+        results = trainer.train_incremental(tune_hyperparameters=args.tune, limit=args.limit)
+    else:
+        results = trainer.train_all_models(tune_hyperparameters=args.tune, limit=args.limit, force=args.force)
 
     print("\n=== Training Results ===\n")
 
@@ -31,10 +40,16 @@ def main():
         print(f"Model: {result['model_type']}")
         print(f"  Model ID: {result['model_id']}")
         print(f"  Accuracy: {result['accuracy']:.4f}")
+        if result.get('skipped'):
+            print("  Skipped: trained earlier on the same data and configuration")
+        else:
+            print(f"  Time: {result['metrics']['total_seconds']:.1f}s")
         print(f"  Metrics: {result['metrics']}")
         print()
 
-    if results:
+    if results and all(result.get('skipped') for result in results):
+        print("✓ No new matches or configuration changes; existing models kept (use --force to retrain)\n")
+    elif results:
         best = max(results, key=lambda x: x['accuracy'])
         print(f"✓ Best Model: {best['model_type']} (ID: {best['model_id']}) with accuracy {best['accuracy']:.4f}")
         print(f"\n✓ Model saved in: data/models/")
@@ -0,0 +1,53 @@
+import sys
+import argparse
+import pandas as pd
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data.duckdb_mirror import get_duckdb_mirror, MIRROR_TABLES
+from src.models.feature_engineer import FeatureEngineer
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__, 'sync_analytics_mirror.log')
+
+def verify_features(limit):
+    postgres_df = FeatureEngineer(analytics_engine='postgres').extract_features_from_db(limit=limit)
+    duckdb_df = FeatureEngineer(analytics_engine='duckdb').extract_features_from_db(limit=limit)
+
+    try:
+        pd.testing.assert_frame_equal(
+            postgres_df.reset_index(drop=True),
+            duckdb_df[postgres_df.columns].reset_index(drop=True),
+            check_dtype=False
+        )
+    except AssertionError as e:
+        logger.error(f"Feature extraction differs between engines: {e}")
+        print(f"✗ Feature extraction differs between PostgreSQL and DuckDB:\n{e}")
+        return False
+
+    print(f"✓ Feature extraction identical on both engines ({len(postgres_df)} rows)")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Mirror PostgreSQL tables into the DuckDB analytics file')
+    parser.add_argument('--full', action='store_true', help='Rebuild the mirrored tables from scratch')
+    parser.add_argument('--tables', nargs='+', choices=list(MIRROR_TABLES), help='Only mirror these tables')
+    parser.add_argument('--verify', action='store_true', help='Compare feature extraction on both engines')
+    parser.add_argument('--verify-limit', type=int, default=5000, help='Matches compared by --verify')
+    args = parser.parse_args()
+
+    print("\n=== Syncing DuckDB Analytics Mirror ===\n")
+
+    mirror = get_duckdb_mirror()
+    synced = mirror.sync(args.tables, full=args.full)
+    for table, rows in synced.items():
+        print(f"✓ {table}: {rows} rows copied")
+
+    if args.verify and not verify_features(args.verify_limit):
+        sys.exit(1)
+
+    print(f"\n=== Mirror up to date: {mirror.path} ===\n")
+
+if __name__ == "__main__":
+    main()
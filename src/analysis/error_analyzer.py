@@ -1,13 +1,26 @@
+import pandas as pd
 from datetime import datetime
 from config.database import get_db
+from config.settings import ANALYTICS_ENGINE
+from src.data.duckdb_mirror import get_duckdb_mirror
 from src.utils.date_utils import get_yesterday, get_date_range
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 class ErrorAnalyzer:
-    def __init__(self):
+    def __init__(self, analytics_engine=ANALYTICS_ENGINE):
         self.db = get_db()
+        self.analytics_engine = analytics_engine
+
+    def _analytics_query(self, query, params):
+        if self.analytics_engine == 'duckdb':
+            return get_duckdb_mirror().query_rows(query, params)
+        return self.db.execute_query(query, params, fetch=True, call_class='analytic')
+
+    def _sync_mirror(self, tables):
+        if self.analytics_engine == 'duckdb':
+            get_duckdb_mirror().sync(tables)
 
     def get_yesterdays_results(self):
         yesterday = get_yesterday()
@@ -37,7 +50,7 @@ class ErrorAnalyzer:
             AND p.actual_winner_id IS NULL
         """
 
-        results = self.db.execute_query(query, (yesterday,), fetch=True)
+        results = self._analytics_query(query, (yesterday,))
         logger.info(f"Found {len(results)} completed matches from yesterday")
 
         return results
@@ -82,42 +95,57 @@ class ErrorAnalyzer:
 
         return error_data
 
-    def save_error_analysis(self, error_data):
-        query = """
-            INSERT INTO prediction_errors
-            (prediction_id, model_id, match_id, match_date, player_1_id, player_2_id,
-             winner_correct, sets_error, games_error, player_1_rank, player_2_rank,
-             both_top_10, both_top_20, both_top_50, both_top_100,
-             any_top_10, any_top_20, any_top_50, any_top_100)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-
-        self.db.execute_query(
-            query,
-            (
-                error_data['prediction_id'], error_data['model_id'], error_data['match_id'],
-                error_data['match_date'], error_data['player_1_id'], error_data['player_2_id'],
-                error_data['winner_correct'], error_data['sets_error'], error_data['games_error'],
-                error_data['player_1_rank'], error_data['player_2_rank'],
-                error_data['both_top_10'], error_data['both_top_20'],
-                error_data['both_top_50'], error_data['both_top_100'],
-                error_data['any_top_10'], error_data['any_top_20'],
-                error_data['any_top_50'], error_data['any_top_100']
-            )
-        )
+    def save_error_analyses(self, errors_data):
+        if not errors_data:
+            return 0
+
+        try:
+            with self.db.savepoint():
+                return self._write_error_analyses(errors_data)
+        except Exception as e:
+            logger.error(f"Bulk prediction error save failed, retrying row by row: {e}")
+
+        saved = 0
+        for error_data in errors_data:
+            try:
+                with self.db.savepoint():
+                    saved += self._write_error_analyses([error_data])
+            except Exception as e:
+                logger.error(f"Error saving analysis of prediction {error_data['prediction_id']}: {e}")
+
+        return saved
+
+    def _write_error_analyses(self, errors_data):
+        error_columns = [
+            'prediction_id', 'model_id', 'match_id', 'match_date', 'player_1_id', 'player_2_id',
+            'winner_correct', 'sets_error', 'games_error', 'player_1_rank', 'player_2_rank',
+            'both_top_10', 'both_top_20', 'both_top_50', 'both_top_100',
+            'any_top_10', 'any_top_20', 'any_top_50', 'any_top_100'
+        ]
+        errors_df = pd.DataFrame(errors_data, columns=error_columns, dtype=object)
+
+        saved = self.db.copy_records('prediction_errors', errors_df)
 
         update_query = """
-            UPDATE predictions
-            SET actual_winner_id = %s, actual_total_sets = %s, actual_total_games = %s
-            WHERE id = %s
+            UPDATE predictions AS p
+            SET actual_winner_id = v.actual_winner_id,
+                actual_total_sets = v.actual_total_sets,
+                actual_total_games = v.actual_total_games
+            FROM (VALUES %s) AS v (prediction_id, match_date, actual_winner_id, actual_total_sets, actual_total_games)
+            WHERE p.id = v.prediction_id
+            AND p.match_date = v.match_date
         """
 
-        self.db.execute_query(
+        self.db.execute_values(
             update_query,
-            (error_data['actual_winner_id'], error_data['actual_total_sets'],
-             error_data['actual_total_games'], error_data['prediction_id'])
+            [(e['prediction_id'], e['match_date'], e['actual_winner_id'], e['actual_total_sets'], e['actual_total_games'])
+             for e in errors_data],
+            template="(%s::integer, %s::date, %s::integer, %s::integer, %s::integer)",
+            unique_by=(0,)
         )
 
+        return saved
+
     def aggregate_metrics(self, model_id, period):
         start_date, end_date = get_date_range(period)
 
@@ -140,7 +168,7 @@ class ErrorAnalyzer:
             AND match_date BETWEEN %s AND %s
         """
 
-        result = self.db.execute_query(query, (model_id, start_date, end_date), fetch=True)
+        result = self._analytics_query(query, (model_id, start_date, end_date))
 
         if not result or result[0]['total_predictions'] == 0:
             return None
@@ -170,14 +198,14 @@ class ErrorAnalyzer:
 
         return metrics_data
 
-    def save_metrics(self, metrics_data):
+    def save_metrics(self, metrics_list):
         query = """
             INSERT INTO error_metrics
             (model_id, period, start_date, end_date, total_predictions, correct_winners,
              accuracy, avg_sets_error, avg_games_error, accuracy_top_10, accuracy_top_20,
              accuracy_top_50, accuracy_top_100, accuracy_both_top_10, accuracy_both_top_20,
              accuracy_both_top_50, accuracy_both_top_100)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            VALUES %s
             ON CONFLICT (model_id, period, end_date) DO UPDATE SET
                 total_predictions = EXCLUDED.total_predictions,
                 correct_winners = EXCLUDED.correct_winners,
@@ -195,45 +223,62 @@ class ErrorAnalyzer:
                 updated_at = CURRENT_TIMESTAMP
         """
 
-        self.db.execute_query(
-            query,
+        rows = [
             (
-                metrics_data['model_id'], metrics_data['period'], metrics_data['start_date'],
-                metrics_data['end_date'], metrics_data['total_predictions'], metrics_data['correct_winners'],
-                metrics_data['accuracy'], metrics_data['avg_sets_error'], metrics_data['avg_games_error'],
-                metrics_data['accuracy_top_10'], metrics_data['accuracy_top_20'],
-                metrics_data['accuracy_top_50'], metrics_data['accuracy_top_100'],
-                metrics_data['accuracy_both_top_10'], metrics_data['accuracy_both_top_20'],
-                metrics_data['accuracy_both_top_50'], metrics_data['accuracy_both_top_100']
+                m['model_id'], m['period'], m['start_date'],
+                m['end_date'], m['total_predictions'], m['correct_winners'],
+                m['accuracy'], m['avg_sets_error'], m['avg_games_error'],
+                m['accuracy_top_10'], m['accuracy_top_20'],
+                m['accuracy_top_50'], m['accuracy_top_100'],
+                m['accuracy_both_top_10'], m['accuracy_both_top_20'],
+                m['accuracy_both_top_50'], m['accuracy_both_top_100']
             )
-        )
+            for m in metrics_list
+        ]
+
+        return self.db.execute_values(query, rows, unique_by=(0, 1, 3))
 
     def analyze_yesterday(self):
         logger.info("Analyzing yesterday's predictions")
 
+        self._sync_mirror(['matches', 'predictions'])
         results = self.get_yesterdays_results()
 
         if not results:
             logger.info("No results to analyze from yesterday")
             return
 
+        errors_data = []
         for result in results:
-            error_data = self.analyze_prediction_error(result)
-            error_data['actual_winner_id'] = result['actual_winner_id']
-            error_data['actual_total_sets'] = result['actual_total_sets']
-            error_data['actual_total_games'] = result['actual_total_games']
-            self.save_error_analysis(error_data)
+            try:
+                error_data = self.analyze_prediction_error(result)
+                error_data['actual_winner_id'] = result['actual_winner_id']
+                error_data['actual_total_sets'] = result['actual_total_sets']
+                error_data['actual_total_games'] = result['actual_total_games']
+                errors_data.append(error_data)
+            except Exception as e:
+                logger.error(f"Error analyzing prediction {result['prediction_id']}: {e}")
+
+        saved = self.db.run_in_transaction(self.save_error_analyses, errors_data)
+        logger.info(f"Saved {saved} prediction errors")
+
+        # Metrics aggregate the errors saved above, so they are computed once
+        # those are committed (and mirrored when running on DuckDB).
+        self._sync_mirror(['prediction_errors'])
 
         active_models_query = "SELECT DISTINCT model_id FROM predictions WHERE match_date = %s"
         active_models = self.db.execute_query(active_models_query, (get_yesterday(),), fetch=True)
 
+        metrics_list = []
         for model in active_models:
             model_id = model['model_id']
 
             for period in ['last_day', 'last_week', 'last_15_days', 'last_month']:
                 metrics = self.aggregate_metrics(model_id, period)
                 if metrics:
-                    self.save_metrics(metrics)
-                    logger.info(f"Saved {period} metrics for model {model_id}: Accuracy={metrics['accuracy']:.4f}")
+                    metrics_list.append(metrics)
+                    logger.info(f"Computed {period} metrics for model {model_id}: Accuracy={metrics['accuracy']:.4f}")
+
+        self.save_metrics(metrics_list)
 
         logger.info("Error analysis completed")
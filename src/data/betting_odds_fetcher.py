@@ -1,11 +1,41 @@
+import asyncio
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 from config.database import get_db
+from config.async_database import get_async_db
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+SAVE_ODDS_QUERY = """
+    INSERT INTO betting_odds
+    (match_date, tournament_id, player_1_id, player_2_id,
+     bookmaker_name, player_1_odds, player_2_odds, fetched_at)
+    VALUES %s
+    ON CONFLICT (match_date, player_1_id, player_2_id, bookmaker_name)
+    DO UPDATE SET
+        player_1_odds = EXCLUDED.player_1_odds,
+        player_2_odds = EXCLUDED.player_2_odds,
+        fetched_at = EXCLUDED.fetched_at
+"""
+
+TODAYS_ODDS_MATCHES_QUERY = """
+    SELECT
+        m.id, m.date, m.tournament_id,
+        m.player_1_id, m.player_2_id,
+        p1.name as player_1_name,
+        p2.name as player_2_name,
+        t.series
+    FROM matches m
+    JOIN players p1 ON m.player_1_id = p1.id
+    JOIN players p2 ON m.player_2_id = p2.id
+    JOIN tournaments t ON m.tournament_id = t.id
+    WHERE m.date = %s
+    AND m.winner_id IS NULL
+    AND t.series IN ('ATP500', 'Masters 1000', 'Grand Slam')
+"""
+
 class BettingOddsFetcher:
     def __init__(self):
         self.db = get_db()
@@ -26,7 +56,6 @@ class BettingOddsFetcher:
                              player_1_name, player_2_name):
         logger.info(f"Fetching odds for {player_1_name} vs {player_2_name}")
 
-        odds_found = False
         odds_data = []
 
         for bookmaker in self.bookmakers:
@@ -36,24 +65,14 @@ class BettingOddsFetcher:
                     player_1_name,
                     player_2_name
                 )
-
-                if odds:
-                    odds_data.append({
-                        'match_date': match_date,
-                        'tournament_id': tournament_id,
-                        'player_1_id': player_1_id,
-                        'player_2_id': player_2_id,
-                        'bookmaker_name': bookmaker['name'],
-                        'player_1_odds': odds['player_1'],
-                        'player_2_odds': odds['player_2']
-                    })
-                    odds_found = True
-                    logger.info(f"Found odds from {bookmaker['name']}: {odds['player_1']} - {odds['player_2']}")
-
             except Exception as e:
                 logger.error(f"Error fetching from {bookmaker['name']}: {e}")
                 continue
 
+            if odds:
+                odds_data.append(self._odds_entry(match_date, tournament_id, player_1_id, player_2_id,
+                                                  bookmaker, odds))
+
         if odds_data:
             self._save_odds(odds_data)
         else:
@@ -61,6 +80,46 @@ class BettingOddsFetcher:
 
         return odds_data
 
+    async def fetch_odds_for_match_async(self, match_date, tournament_id, player_1_id, player_2_id,
+                                         player_1_name, player_2_name):
+        logger.info(f"Fetching odds for {player_1_name} vs {player_2_name}")
+
+        # The bookmaker scrapers are blocking HTTP calls, so each one runs in a worker thread.
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._fetch_from_bookmaker, bookmaker, player_1_name, player_2_name)
+              for bookmaker in self.bookmakers),
+            return_exceptions=True
+        )
+
+        odds_data = []
+        for bookmaker, odds in zip(self.bookmakers, results):
+            if isinstance(odds, Exception):
+                logger.error(f"Error fetching from {bookmaker['name']}: {odds}")
+                continue
+
+            if odds:
+                odds_data.append(self._odds_entry(match_date, tournament_id, player_1_id, player_2_id,
+                                                  bookmaker, odds))
+
+        if odds_data:
+            await self._save_odds_async(odds_data)
+        else:
+            logger.warning(f"No odds found for {player_1_name} vs {player_2_name}")
+
+        return odds_data
+
+    def _odds_entry(self, match_date, tournament_id, player_1_id, player_2_id, bookmaker, odds):
+        logger.info(f"Found odds from {bookmaker['name']}: {odds['player_1']} - {odds['player_2']}")
+        return {
+            'match_date': match_date,
+            'tournament_id': tournament_id,
+            'player_1_id': player_1_id,
+            'player_2_id': player_2_id,
+            'bookmaker_name': bookmaker['name'],
+            'player_1_odds': odds['player_1'],
+            'player_2_odds': odds['player_2']
+        }
+
     def _fetch_from_bookmaker(self, bookmaker, player_1_name, player_2_name):
         logger.info(f"Attempting to fetch from {bookmaker['name']}")
 
@@ -147,29 +206,54 @@ class BettingOddsFetcher:
             logger.debug(f"Betway fetch failed: {e}")
             return None
 
+    def _odds_rows(self, odds_data):
+        fetched_at = datetime.now()
+        return [
+            (odds['match_date'], odds['tournament_id'], odds['player_1_id'],
+             odds['player_2_id'], odds['bookmaker_name'], odds['player_1_odds'],
+             odds['player_2_odds'], fetched_at)
+            for odds in odds_data
+        ]
+
     def _save_odds(self, odds_data):
-        for odds in odds_data:
+        rows = self._odds_rows(odds_data)
+
+        try:
+            self.db.execute_values(SAVE_ODDS_QUERY, rows, unique_by=(0, 2, 3, 4))
+            logger.info(f"Saved {len(rows)} odds from {', '.join(odds['bookmaker_name'] for odds in odds_data)}")
+            return
+        except Exception as e:
+            logger.error(f"Bulk odds save failed, retrying row by row: {e}")
+
+        with self.db.transaction():
+            for row in rows:
+                try:
+                    with self.db.savepoint():
+                        self.db.execute_values(SAVE_ODDS_QUERY, [row])
+
+                    logger.info(f"Saved odds from {row[4]}")
+
+                except Exception as e:
+                    logger.error(f"Error saving odds: {e}")
+
+    async def _save_odds_async(self, odds_data):
+        rows = self._odds_rows(odds_data)
+
+        db = get_async_db()
+
+        try:
+            await db.execute_values(SAVE_ODDS_QUERY, rows, unique_by=(0, 2, 3, 4))
+            logger.info(f"Saved {len(rows)} odds from {', '.join(odds['bookmaker_name'] for odds in odds_data)}")
+            return
+        except Exception as e:
+            logger.error(f"Bulk odds save failed, retrying row by row: {e}")
+
+        for row in rows:
             try:
-                query = """
-                    INSERT INTO betting_odds
-                    (match_date, tournament_id, player_1_id, player_2_id,
-                     bookmaker_name, player_1_odds, player_2_odds, fetched_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (match_date, player_1_id, player_2_id, bookmaker_name)
-                    DO UPDATE SET
-                        player_1_odds = EXCLUDED.player_1_odds,
-                        player_2_odds = EXCLUDED.player_2_odds,
-                        fetched_at = EXCLUDED.fetched_at
-                """
-
-                self.db.execute_query(
-                    query,
-                    (odds['match_date'], odds['tournament_id'], odds['player_1_id'],
-                     odds['player_2_id'], odds['bookmaker_name'], odds['player_1_odds'],
-                     odds['player_2_odds'], datetime.now())
-                )
+                async with db.transaction():
+                    await db.execute_values(SAVE_ODDS_QUERY, [row])
 
-                logger.info(f"Saved odds from {odds['bookmaker_name']}")
+                logger.info(f"Saved odds from {row[4]}")
 
             except Exception as e:
                 logger.error(f"Error saving odds: {e}")
@@ -177,23 +261,7 @@ class BettingOddsFetcher:
     def fetch_odds_for_todays_matches(self):
         today = datetime.now().date()
 
-        query = """
-            SELECT
-                m.id, m.date, m.tournament_id,
-                m.player_1_id, m.player_2_id,
-                p1.name as player_1_name,
-                p2.name as player_2_name,
-                t.series
-            FROM matches m
-            JOIN players p1 ON m.player_1_id = p1.id
-            JOIN players p2 ON m.player_2_id = p2.id
-            JOIN tournaments t ON m.tournament_id = t.id
-            WHERE m.date = %s
-            AND m.winner_id IS NULL
-            AND t.series IN ('ATP500', 'Masters 1000', 'Grand Slam')
-        """
-
-        matches = self.db.execute_query(query, (today,), fetch=True)
+        matches = self.db.execute_query(TODAYS_ODDS_MATCHES_QUERY, (today,), fetch=True)
         logger.info(f"Found {len(matches)} matches to fetch odds for")
 
         total_odds = 0
@@ -211,6 +279,28 @@ class BettingOddsFetcher:
         logger.info(f"Fetched odds from {total_odds} bookmakers")
         return total_odds
 
+    async def fetch_odds_for_todays_matches_async(self):
+        today = datetime.now().date()
+
+        matches = await get_async_db().execute_query(TODAYS_ODDS_MATCHES_QUERY, (today,), fetch=True)
+        logger.info(f"Found {len(matches)} matches to fetch odds for")
+
+        results = await asyncio.gather(*(
+            self.fetch_odds_for_match_async(
+                match['date'],
+                match['tournament_id'],
+                match['player_1_id'],
+                match['player_2_id'],
+                match['player_1_name'],
+                match['player_2_name']
+            )
+            for match in matches
+        ))
+        total_odds = sum(len(odds_data) for odds_data in results)
+
+        logger.info(f"Fetched odds from {total_odds} bookmakers")
+        return total_odds
+
     def create_sample_odds_for_testing(self, match_date, tournament_id,
                                       player_1_id, player_2_id):
         logger.info("Creating sample odds for testing")
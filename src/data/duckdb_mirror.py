@@ -0,0 +1,156 @@
+import threading
+from datetime import timedelta
+from config.database import get_db
+from config.settings import DUCKDB_MIRROR_PATH, DUCKDB_MIRROR_LOOKBACK_DAYS
+from src.utils.columnar import normalize_frame
+from src.utils.date_utils import get_today
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# watermark: column whose mirrored maximum marks where the next sync starts.
+# recent: date column; rows in the lookback window are re-copied because
+# results, actual outcomes and deletions land on recent matches/predictions.
+# Tables without a watermark are small and copied in full.
+MIRROR_TABLES = {
+    'players': {},
+    'tournaments': {'watermark': 'id'},
+    'surfaces': {},
+    'court_types': {},
+    'rounds': {},
+    'matches': {'watermark': 'id', 'recent': 'date'},
+    'predictions': {'watermark': 'id', 'recent': 'match_date'},
+    'prediction_errors': {'watermark': 'id'},
+    'player_stats': {},
+    'surface_history': {},
+    'player_daily_snapshots': {'watermark': 'snapshot_date'}
+}
+
+DUCKDB_TYPES = {
+    'smallint': 'SMALLINT',
+    'integer': 'INTEGER',
+    'bigint': 'BIGINT',
+    'numeric': 'DOUBLE',
+    'real': 'DOUBLE',
+    'double precision': 'DOUBLE',
+    'boolean': 'BOOLEAN',
+    'date': 'DATE',
+    'timestamp without time zone': 'TIMESTAMP',
+    'timestamp with time zone': 'TIMESTAMPTZ'
+}
+
+class DuckDBMirror:
+    def __init__(self, path=DUCKDB_MIRROR_PATH):
+        self.db = get_db()
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            try:
+                import duckdb
+            except ImportError:
+                raise ImportError("duckdb is required for ANALYTICS_ENGINE=duckdb (pip install duckdb)")
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = duckdb.connect(str(self.path))
+        return self._conn
+
+    def _source_columns(self, table):
+        query = """
+            SELECT column_name, data_type
+            FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = %s
+            ORDER BY ordinal_position
+        """
+        return [(row['column_name'], row['data_type']) for row in self.db.execute_query(query, (table,), fetch=True)]
+
+    def _mirror_columns(self, table):
+        rows = self.conn.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_name = ? ORDER BY ordinal_position",
+            [table]
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def _create_table(self, table, columns):
+        column_defs = ", ".join(f'"{name}" {DUCKDB_TYPES.get(data_type, "VARCHAR")}' for name, data_type in columns)
+        self.conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        self.conn.execute(f'CREATE TABLE "{table}" ({column_defs})')
+
+    def sync_table(self, table, full=False):
+        options = MIRROR_TABLES[table]
+        columns = self._source_columns(table)
+        names = [name for name, _ in columns]
+
+        if full or self._mirror_columns(table) != names:
+            self._create_table(table, columns)
+            full = True
+
+        column_list = ", ".join(names)
+        conditions = []
+        params = []
+        if not full and options.get('watermark'):
+            watermark = self.conn.execute(f'SELECT MAX("{options["watermark"]}") FROM "{table}"').fetchone()[0]
+            if watermark is not None:
+                conditions.append(f"{options['watermark']} >= %s")
+                params.append(watermark)
+                if options.get('recent'):
+                    conditions.append(f"{options['recent']} >= %s")
+                    params.append(get_today() - timedelta(days=DUCKDB_MIRROR_LOOKBACK_DAYS))
+
+        where_clause = f"WHERE {' OR '.join(conditions)}" if conditions else ""
+        frame = self.db.read_frame(f"SELECT {column_list} FROM {table} {where_clause}", tuple(params) or None)
+
+        # Hand NULLs to DuckDB as NULL: NaN would be stored as a float NaN.
+        for name, data_type in columns:
+            duckdb_type = DUCKDB_TYPES.get(data_type, 'VARCHAR')
+            if duckdb_type in ('SMALLINT', 'INTEGER', 'BIGINT'):
+                frame[name] = frame[name].astype('Int64')
+            elif duckdb_type == 'DOUBLE':
+                frame[name] = frame[name].astype('Float64')
+            elif frame[name].dtype == object:
+                frame[name] = frame[name].where(frame[name].notna(), None)
+
+        self.conn.execute("BEGIN TRANSACTION")
+        try:
+            if conditions:
+                self.conn.execute(f'DELETE FROM "{table}" {where_clause.replace("%s", "?")}', params)
+            else:
+                self.conn.execute(f'DELETE FROM "{table}"')
+            self.conn.register('mirror_frame', frame)
+            self.conn.execute(f'INSERT INTO "{table}" SELECT {column_list} FROM mirror_frame')
+            self.conn.unregister('mirror_frame')
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        logger.info(f"Mirrored {len(frame)} rows of {table} into DuckDB{' (full)' if full else ''}")
+        return len(frame)
+
+    def sync(self, tables=None, full=False):
+        with self._lock:
+            synced = {}
+            for table in tables or MIRROR_TABLES:
+                synced[table] = self.sync_table(table, full=full)
+            return synced
+
+    def query_frame(self, query, params=None):
+        with self._lock:
+            frame = self.conn.execute(query.replace("%s", "?"), list(params or [])).df()
+        return normalize_frame(frame)
+
+    def query_rows(self, query, params=None):
+        with self._lock:
+            cursor = self.conn.execute(query.replace("%s", "?"), list(params or []))
+            names = [column[0] for column in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+_mirror = None
+
+def get_duckdb_mirror():
+    global _mirror
+    if _mirror is None:
+        _mirror = DuckDBMirror()
+    return _mirror
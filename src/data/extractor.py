@@ -1,5 +1,9 @@
+from datetime import datetime
 from src.data.kaggle_fetcher import KaggleFetcher
 from src.data.match_loader import MatchLoader
+from src.data.match_timeline_builder import MatchTimelineBuilder
+from src.data.player_snapshot_builder import PlayerSnapshotBuilder
+from src.data.stat_refresh_worker import StatRefreshWorker
 from src.data.sports_mood_calculator import SportsMoodCalculator
 from src.data.surface_history_calculator import SurfaceHistoryCalculator
 from src.data.personal_mood_fetcher import PersonalMoodFetcher
@@ -12,6 +16,9 @@ class DataExtractor:
     def __init__(self):
         self.kaggle_fetcher = KaggleFetcher()
         self.match_loader = MatchLoader()
+        self.timeline_builder = MatchTimelineBuilder()
+        self.snapshot_builder = PlayerSnapshotBuilder()
+        self.refresh_worker = StatRefreshWorker()
         self.sports_mood_calculator = SportsMoodCalculator()
         self.surface_history_calculator = SurfaceHistoryCalculator()
         self.personal_mood_fetcher = PersonalMoodFetcher()
@@ -29,11 +36,15 @@ class DataExtractor:
         loaded, skipped = self.match_loader.load_from_dataframe(df)
         logger.info(f"Loaded {loaded} matches, skipped {skipped}")
 
+        sweep_started_at = datetime.now()
+
         logger.info("Step 2: Calculating sports mood scores")
-        self.sports_mood_calculator.update_all_active_players()
+        self.sports_mood_calculator.update_all_active_players(concurrent=True)
 
         logger.info("Step 3: Calculating surface history")
-        self.surface_history_calculator.update_all_player_surfaces()
+        self.surface_history_calculator.update_all_player_surfaces(concurrent=True)
+        self.refresh_worker.discard_pending(sweep_started_at)
+        self.snapshot_builder.build_snapshot()
 
         logger.info("Step 4: Fetching personal mood data (stub)")
         self.personal_mood_fetcher.update_all_active_players()
@@ -52,8 +63,10 @@ class DataExtractor:
             loaded, skipped = self.match_loader.load_from_dataframe(df)
             logger.info(f"Loaded {loaded} new matches, skipped {skipped}")
 
-        self.sports_mood_calculator.update_all_active_players()
-        self.surface_history_calculator.update_all_player_surfaces()
+        self.timeline_builder.reconcile()
+        refreshed, errors = self.refresh_worker.drain()
+        logger.info(f"Refreshed stats for {refreshed} players affected by new matches ({errors} errors)")
+        self.snapshot_builder.build_snapshot()
 
         logger.info("Daily data update completed")
         return True
@@ -1,6 +1,8 @@
 import pandas as pd
 from pathlib import Path
-from config.database import get_db
+from config.database import get_db, is_transient_error
+from config.settings import TIMELINE_SYNC_BATCH_SIZE, DB_COMMIT_EVERY
+from src.data.match_timeline_builder import MatchTimelineBuilder
 from src.utils.database_utils import (
     get_or_create_player,
     get_or_create_tournament,
@@ -8,7 +10,8 @@ from src.utils.database_utils import (
     get_court_type_id,
     get_round_id,
     match_exists,
-    update_player_rank
+    update_player_rank,
+    ensure_year_partition
 )
 from src.utils.date_utils import parse_date
 from src.utils.logger import get_logger
@@ -18,6 +21,7 @@ logger = get_logger(__name__)
 class MatchLoader:
     def __init__(self):
         self.db = get_db()
+        self.timeline_builder = MatchTimelineBuilder()
 
     def calculate_sets_and_games(self, score):
         if not score or score == '-1' or pd.isna(score):
@@ -104,48 +108,70 @@ class MatchLoader:
             logger.error(f"Match data: {match_data}")
             raise
 
+    def ensure_partitions(self, df):
+        years = set()
+        for value in df['Date'].dropna().unique():
+            try:
+                years.add(parse_date(value).year)
+            except (TypeError, ValueError):
+                continue
+
+        for year in sorted(years):
+            ensure_year_partition('matches', year)
+
     def load_from_csv(self, csv_path):
         logger.info(f"Loading matches from {csv_path}")
 
         df = pd.read_csv(csv_path)
+        loaded_count, skipped_count = self.load_from_dataframe(df, log_progress=True)
+
+        logger.info(f"Finished loading. Loaded: {loaded_count}, Skipped: {skipped_count}")
+        return loaded_count, skipped_count
+
+    def load_from_dataframe(self, df, log_progress=False):
         total_matches = len(df)
         loaded_count = 0
         skipped_count = 0
 
-        for idx, row in df.iterrows():
-            try:
-                match_id = self.load_match(row.to_dict())
-                if match_id:
-                    loaded_count += 1
-                else:
-                    skipped_count += 1
-
-                if (idx + 1) % 100 == 0:
-                    logger.info(f"Progress: {idx + 1}/{total_matches} matches processed")
+        self.ensure_partitions(df)
+        # Each chunk commits on its own and is re-run after a dropped connection;
+        # rows that already made it in are found by match_exists.
+        for offset in range(0, total_matches, DB_COMMIT_EVERY):
+            chunk = df.iloc[offset:offset + DB_COMMIT_EVERY]
+            loaded, skipped = self.db.run_in_transaction(self._load_chunk, chunk)
+            loaded_count += loaded
+            skipped_count += skipped
 
-            except Exception as e:
-                logger.error(f"Error at row {idx}: {e}")
-                skipped_count += 1
-                continue
+            if log_progress:
+                logger.info(f"Progress: {offset + len(chunk)}/{total_matches} matches processed")
 
-        logger.info(f"Finished loading. Loaded: {loaded_count}, Skipped: {skipped_count}")
         return loaded_count, skipped_count
 
-    def load_from_dataframe(self, df):
-        total_matches = len(df)
+    def _load_chunk(self, chunk):
         loaded_count = 0
         skipped_count = 0
+        pending_timeline_ids = []
 
-        for idx, row in df.iterrows():
+        for idx, row in chunk.iterrows():
             try:
-                match_id = self.load_match(row.to_dict())
+                with self.db.savepoint():
+                    match_id = self.load_match(row.to_dict())
                 if match_id:
                     loaded_count += 1
+                    pending_timeline_ids.append(match_id)
                 else:
                     skipped_count += 1
+
+                if len(pending_timeline_ids) >= TIMELINE_SYNC_BATCH_SIZE:
+                    self.timeline_builder.sync_matches(pending_timeline_ids)
+                    pending_timeline_ids = []
+
             except Exception as e:
+                if is_transient_error(e):
+                    raise
                 logger.error(f"Error at row {idx}: {e}")
                 skipped_count += 1
                 continue
 
+        self.timeline_builder.sync_matches(pending_timeline_ids)
         return loaded_count, skipped_count
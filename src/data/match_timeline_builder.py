@@ -0,0 +1,77 @@
+from config.database import get_db
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TIMELINE_COLUMNS = "(player_id, date, match_id, opponent_id, won, surface_id, player_rank, opponent_rank)"
+
+TIMELINE_SELECT = """
+    SELECT m.player_1_id, m.date, m.id, m.player_2_id, m.winner_id = m.player_1_id,
+           m.surface_id, m.rank_1, m.rank_2
+    FROM matches m
+    WHERE m.winner_id IS NOT NULL {match_filter}
+    UNION ALL
+    SELECT m.player_2_id, m.date, m.id, m.player_1_id, m.winner_id = m.player_2_id,
+           m.surface_id, m.rank_2, m.rank_1
+    FROM matches m
+    WHERE m.winner_id IS NOT NULL {match_filter}
+"""
+
+TIMELINE_UPSERT = """
+    INSERT INTO player_match_timeline {columns}
+    {select}
+    ON CONFLICT (player_id, match_id) DO UPDATE SET
+        date = EXCLUDED.date,
+        opponent_id = EXCLUDED.opponent_id,
+        won = EXCLUDED.won,
+        surface_id = EXCLUDED.surface_id,
+        player_rank = EXCLUDED.player_rank,
+        opponent_rank = EXCLUDED.opponent_rank
+    WHERE (player_match_timeline.date, player_match_timeline.opponent_id, player_match_timeline.won,
+           player_match_timeline.surface_id, player_match_timeline.player_rank,
+           player_match_timeline.opponent_rank)
+        IS DISTINCT FROM
+          (EXCLUDED.date, EXCLUDED.opponent_id, EXCLUDED.won,
+           EXCLUDED.surface_id, EXCLUDED.player_rank, EXCLUDED.opponent_rank)
+"""
+
+class MatchTimelineBuilder:
+    def __init__(self):
+        self.db = get_db()
+
+    def sync_matches(self, match_ids):
+        match_ids = sorted(set(match_ids))
+        if not match_ids:
+            return 0
+
+        query = TIMELINE_UPSERT.format(
+            columns=TIMELINE_COLUMNS,
+            select=TIMELINE_SELECT.format(match_filter="AND m.id = ANY(%s)")
+        )
+
+        written = self.db.execute_query(query, (match_ids, match_ids), call_class='bulk')
+        logger.info(f"Synced player timeline for {len(match_ids)} matches ({written} rows written)")
+        return written
+
+    def reconcile(self):
+        logger.info("Reconciling player match timeline with matches")
+
+        query = TIMELINE_UPSERT.format(
+            columns=TIMELINE_COLUMNS,
+            select=TIMELINE_SELECT.format(match_filter="")
+        )
+        written = self.db.execute_query(query, call_class='bulk')
+
+        delete_query = """
+            DELETE FROM player_match_timeline pmt
+            WHERE NOT EXISTS (
+                SELECT 1 FROM matches m
+                WHERE m.id = pmt.match_id
+                AND m.winner_id IS NOT NULL
+                AND pmt.player_id IN (m.player_1_id, m.player_2_id)
+            )
+        """
+        deleted = self.db.execute_query(delete_query, call_class='bulk')
+
+        logger.info(f"Timeline reconciled. Written: {written}, Deleted: {deleted}")
+        return written, deleted
@@ -0,0 +1,74 @@
+from datetime import date
+from config.database import get_db
+from src.utils.date_utils import get_today
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class PlayerSnapshotBuilder:
+    def __init__(self):
+        self.db = get_db()
+
+    def get_partition_bounds(self, snapshot_date):
+        month_start = date(snapshot_date.year, snapshot_date.month, 1)
+        if snapshot_date.month == 12:
+            next_month = date(snapshot_date.year + 1, 1, 1)
+        else:
+            next_month = date(snapshot_date.year, snapshot_date.month + 1, 1)
+        return month_start, next_month
+
+    def ensure_partition(self, snapshot_date):
+        month_start, next_month = self.get_partition_bounds(snapshot_date)
+        partition_name = f"player_daily_snapshots_{month_start.strftime('%Y%m')}"
+
+        query = f"""
+            CREATE TABLE IF NOT EXISTS {partition_name}
+            PARTITION OF player_daily_snapshots
+            FOR VALUES FROM (%s) TO (%s)
+        """
+        self.db.execute_query(query, (month_start, next_month))
+        return partition_name
+
+    def build_snapshot(self, snapshot_date=None):
+        if snapshot_date is None:
+            snapshot_date = get_today()
+
+        self.ensure_partition(snapshot_date)
+
+        query = """
+            INSERT INTO player_daily_snapshots
+            (player_id, snapshot_date, current_rank, current_points, sports_mood_score,
+             last_10_matches_wins, last_10_matches_losses,
+             hard_win_rate, clay_win_rate, grass_win_rate, carpet_win_rate)
+            SELECT
+                p.id,
+                %s,
+                p.current_rank,
+                p.current_points,
+                ps.sports_mood_score,
+                ps.last_10_matches_wins,
+                ps.last_10_matches_losses,
+                shp.hard_win_rate,
+                shp.clay_win_rate,
+                shp.grass_win_rate,
+                shp.carpet_win_rate
+            FROM players p
+            LEFT JOIN player_stats ps ON p.id = ps.player_id
+            LEFT JOIN (
+                SELECT
+                    sh.player_id,
+                    MAX(sh.win_rate) FILTER (WHERE s.name = 'Hard') as hard_win_rate,
+                    MAX(sh.win_rate) FILTER (WHERE s.name = 'Clay') as clay_win_rate,
+                    MAX(sh.win_rate) FILTER (WHERE s.name = 'Grass') as grass_win_rate,
+                    MAX(sh.win_rate) FILTER (WHERE s.name = 'Carpet') as carpet_win_rate
+                FROM surface_history sh
+                JOIN surfaces s ON sh.surface_id = s.id
+                GROUP BY sh.player_id
+            ) shp ON p.id = shp.player_id
+            WHERE p.is_active = true
+            ON CONFLICT (player_id, snapshot_date) DO NOTHING
+        """
+
+        inserted = self.db.execute_query(query, (snapshot_date,), call_class='bulk')
+        logger.info(f"Built player snapshot for {snapshot_date}: {inserted} rows")
+        return inserted
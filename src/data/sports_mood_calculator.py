@@ -1,7 +1,8 @@
 from config.database import get_db
 from src.utils.database_utils import get_player_last_n_matches
 from src.utils.logger import get_logger
-from config.settings import SPORTS_MOOD_WEIGHTS
+from src.utils.parallel import run_partitioned
+from config.settings import SPORTS_MOOD_WEIGHTS, DB_BULK_PAGE_SIZE
 
 logger = get_logger(__name__)
 
@@ -66,38 +67,72 @@ class SportsMoodCalculator:
 
         return mood_score, wins, losses, match_details
 
-    def update_player_sports_mood(self, player_id):
+    def build_sports_mood_row(self, player_id):
         mood_score, wins, losses, details = self.calculate_sports_mood(player_id)
+        return (player_id, mood_score, wins, losses)
 
+    def save_sports_moods(self, rows):
         query = """
             INSERT INTO player_stats
-            (player_id, sports_mood_score, last_10_matches_wins, last_10_matches_losses, last_10_matches_details)
-            VALUES (%s, %s, %s, %s, %s::jsonb)
+            (player_id, sports_mood_score, last_10_matches_wins, last_10_matches_losses)
+            VALUES %s
             ON CONFLICT (player_id) DO UPDATE SET
                 sports_mood_score = EXCLUDED.sports_mood_score,
                 last_10_matches_wins = EXCLUDED.last_10_matches_wins,
                 last_10_matches_losses = EXCLUDED.last_10_matches_losses,
-                last_10_matches_details = EXCLUDED.last_10_matches_details,
                 updated_at = CURRENT_TIMESTAMP
         """
 
-        import json
-        self.db.execute_query(query, (player_id, mood_score, wins, losses, json.dumps(details)))
-        logger.info(f"Updated sports mood for player {player_id}: {mood_score}")
+        return self.db.execute_values(query, rows, unique_by=(0,))
 
-        return mood_score
+    def update_player_sports_mood(self, player_id):
+        row = self.build_sports_mood_row(player_id)
+        self.save_sports_moods([row])
+        logger.info(f"Updated sports mood for player {player_id}: {row[1]}")
 
-    def update_all_active_players(self):
-        query = "SELECT id FROM players WHERE is_active = true"
-        players = self.db.execute_query(query, fetch=True)
+        return row[1]
 
+    def update_players(self, player_ids):
         updated_count = 0
-        for player in players:
+        error_count = 0
+        rows = []
+
+        for player_id in player_ids:
             try:
-                self.update_player_sports_mood(player['id'])
-                updated_count += 1
+                rows.append(self.build_sports_mood_row(player_id))
             except Exception as e:
-                logger.error(f"Error updating sports mood for player {player['id']}: {e}")
+                logger.error(f"Error calculating sports mood for player {player_id}: {e}")
+                error_count += 1
+
+            if len(rows) >= DB_BULK_PAGE_SIZE:
+                saved, failed = self._flush(rows)
+                updated_count += saved
+                error_count += failed
+                rows = []
+
+        saved, failed = self._flush(rows)
+        return updated_count + saved, error_count + failed
+
+    def _flush(self, rows):
+        if not rows:
+            return 0, 0
+        try:
+            self.save_sports_moods(rows)
+            return len(rows), 0
+        except Exception as e:
+            logger.error(f"Error saving sports mood for {len(rows)} players: {e}")
+            return 0, len(rows)
+
+    def update_all_active_players(self, concurrent=False, workers=None):
+        query = "SELECT id FROM players WHERE is_active = true"
+        players = self.db.execute_query(query, fetch=True)
+        player_ids = [player['id'] for player in players]
+
+        if concurrent:
+            workers = workers or self.db.max_connections
+            updated_count, error_count = run_partitioned(self.update_players, player_ids, workers)
+        else:
+            updated_count, error_count = self.update_players(player_ids)
 
-        logger.info(f"Updated sports mood for {updated_count} players")
+        logger.info(f"Updated sports mood for {updated_count} players ({error_count} errors)")
         return updated_count
@@ -0,0 +1,193 @@
+import time
+import select
+from collections import defaultdict
+from config.database import get_db
+from config.settings import (
+    STAT_REFRESH_CHANNEL,
+    STAT_REFRESH_BATCH_SIZE,
+    STAT_REFRESH_CLAIM_TIMEOUT_MINUTES,
+    STAT_REFRESH_IDLE_TIMEOUT,
+    STAT_REFRESH_WAIT_TIMEOUT,
+    STAT_REFRESH_POLL_INTERVAL
+)
+from src.data.sports_mood_calculator import SportsMoodCalculator
+from src.data.surface_history_calculator import SurfaceHistoryCalculator
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class StatRefreshWorker:
+    def __init__(self, batch_size=STAT_REFRESH_BATCH_SIZE):
+        self.db = get_db()
+        self.batch_size = batch_size
+        self.sports_mood_calculator = SportsMoodCalculator()
+        self.surface_history_calculator = SurfaceHistoryCalculator()
+
+    def enqueue_players(self, player_surfaces, reason="manual"):
+        rows = [(player_id, surface_id, reason) for player_id, surface_id in player_surfaces]
+        if not rows:
+            return 0
+
+        query = """
+            INSERT INTO stat_refresh_queue (player_id, surface_id, reason)
+            VALUES (%s, %s, %s)
+        """
+        self.db.execute_many(query, rows)
+        self.db.execute_query(f"NOTIFY {STAT_REFRESH_CHANNEL}")
+        return len(rows)
+
+    def discard_pending(self, enqueued_before):
+        query = "DELETE FROM stat_refresh_queue WHERE enqueued_at <= %s"
+        discarded = self.db.execute_query(query, (enqueued_before,))
+        logger.info(f"Discarded {discarded} queued stat refreshes covered by a full sweep")
+        return discarded
+
+    def claim_batch(self, player_ids=None, skip_ids=None):
+        player_filter = "AND player_id = ANY(%s)" if player_ids else ""
+        skip_filter = "AND NOT (id = ANY(%s))" if skip_ids else ""
+        params = [STAT_REFRESH_CLAIM_TIMEOUT_MINUTES]
+        if player_ids:
+            params.append(list(player_ids))
+        if skip_ids:
+            params.append(list(skip_ids))
+        params.append(self.batch_size)
+
+        query = f"""
+            UPDATE stat_refresh_queue
+            SET claimed_at = CURRENT_TIMESTAMP
+            WHERE id IN (
+                SELECT id FROM stat_refresh_queue
+                WHERE (claimed_at IS NULL
+                       OR claimed_at < CURRENT_TIMESTAMP - %s * INTERVAL '1 minute')
+                {player_filter}
+                {skip_filter}
+                ORDER BY id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, player_id, surface_id
+        """
+        return self.db.execute_query(query, tuple(params), fetch=True)
+
+    def process_entries(self, entries):
+        entry_ids_by_player = defaultdict(list)
+        surfaces_by_player = defaultdict(set)
+        for entry in entries:
+            entry_ids_by_player[entry['player_id']].append(entry['id'])
+            if entry['surface_id']:
+                surfaces_by_player[entry['player_id']].add(entry['surface_id'])
+
+        mood_rows = []
+        surface_rows = []
+        done_ids = []
+        failed_ids = []
+        for player_id, entry_ids in entry_ids_by_player.items():
+            try:
+                mood_row = self.sports_mood_calculator.build_sports_mood_row(player_id)
+                player_surface_rows = [
+                    self.surface_history_calculator.build_surface_history_row(player_id, surface_id)
+                    for surface_id in surfaces_by_player[player_id]
+                ]
+            except Exception as e:
+                logger.error(f"Error refreshing stats for player {player_id}: {e}")
+                failed_ids.extend(entry_ids)
+                continue
+
+            mood_rows.append(mood_row)
+            surface_rows.extend(player_surface_rows)
+            done_ids.extend(entry_ids)
+
+        self.db.run_in_transaction(self._save_refreshed, mood_rows, surface_rows, done_ids, failed_ids)
+        return len(mood_rows), failed_ids
+
+    def _save_refreshed(self, mood_rows, surface_rows, done_ids, failed_ids):
+        self.sports_mood_calculator.save_sports_moods(mood_rows)
+        self.surface_history_calculator.save_surface_histories(surface_rows)
+        if done_ids:
+            self.db.execute_query("DELETE FROM stat_refresh_queue WHERE id = ANY(%s)", (done_ids,))
+        # Failed entries go back to the queue instead of waiting out the claim
+        # timeout.
+        if failed_ids:
+            self.db.execute_query("UPDATE stat_refresh_queue SET claimed_at = NULL WHERE id = ANY(%s)", (failed_ids,))
+
+    def process_batch(self, player_ids=None, skip_ids=None):
+        entries = self.claim_batch(player_ids, skip_ids)
+        if not entries:
+            return 0, 0, []
+
+        refreshed, failed_ids = self.process_entries(entries)
+        logger.info(f"Processed {len(entries)} queued refreshes for {refreshed} players ({len(failed_ids)} failed entries)")
+        return len(entries), refreshed, failed_ids
+
+    def drain(self, player_ids=None, skip_ids=None):
+        # Entries that fail are released but skipped for the rest of the
+        # drain; the next drain retries them.
+        skip_ids = set() if skip_ids is None else skip_ids
+        total_refreshed = 0
+        total_errors = 0
+
+        while True:
+            claimed, refreshed, failed_ids = self.process_batch(player_ids, skip_ids)
+            if not claimed:
+                break
+            skip_ids.update(failed_ids)
+            total_refreshed += refreshed
+            total_errors += len(failed_ids)
+
+        return total_refreshed, total_errors
+
+    def pending_count(self, player_ids, skip_ids=()):
+        query = """
+            SELECT COUNT(*) AS pending FROM stat_refresh_queue
+            WHERE player_id = ANY(%s) AND NOT (id = ANY(%s))
+        """
+        result = self.db.execute_query(query, (list(player_ids), list(skip_ids)), fetch=True)
+        return result[0]['pending']
+
+    def refresh_players(self, player_ids, timeout=STAT_REFRESH_WAIT_TIMEOUT):
+        # Drains the players' queued refreshes, then waits for the entries
+        # other workers hold, so their stats are current when this returns.
+        skip_ids = set()
+        total_refreshed = 0
+        deadline = time.monotonic() + timeout
+
+        while True:
+            refreshed, _ = self.drain(player_ids, skip_ids)
+            total_refreshed += refreshed
+
+            pending = self.pending_count(player_ids, skip_ids)
+            if not pending:
+                break
+            if time.monotonic() >= deadline:
+                logger.warning(f"Gave up waiting after {timeout}s: {pending} queued refreshes still pending")
+                break
+            time.sleep(STAT_REFRESH_POLL_INTERVAL)
+
+        return total_refreshed, len(skip_ids)
+
+    def listen(self, idle_timeout=STAT_REFRESH_IDLE_TIMEOUT, max_idle_cycles=None):
+        logger.info(f"Stat refresh worker listening on '{STAT_REFRESH_CHANNEL}'")
+
+        with self.db.get_connection() as conn:
+            previous_autocommit = conn.autocommit
+            conn.autocommit = True
+            cursor = conn.cursor()
+            cursor.execute(f"LISTEN {STAT_REFRESH_CHANNEL}")
+
+            idle_cycles = 0
+            try:
+                while max_idle_cycles is None or idle_cycles < max_idle_cycles:
+                    refreshed, errors = self.drain()
+                    if refreshed or errors:
+                        idle_cycles = 0
+
+                    if select.select([conn], [], [], idle_timeout) == ([], [], []):
+                        idle_cycles += 1
+                        continue
+
+                    conn.poll()
+                    conn.notifies.clear()
+            finally:
+                cursor.execute(f"UNLISTEN {STAT_REFRESH_CHANNEL}")
+                cursor.close()
+                conn.autocommit = previous_autocommit
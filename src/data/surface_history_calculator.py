@@ -1,6 +1,8 @@
 from config.database import get_db
+from config.settings import DB_BULK_PAGE_SIZE
 from src.utils.database_utils import get_player_last_n_matches
 from src.utils.logger import get_logger
+from src.utils.parallel import run_partitioned
 
 logger = get_logger(__name__)
 
@@ -15,21 +17,7 @@ class SurfaceHistoryCalculator:
         losses = len(last_matches) - wins
         win_rate = wins / len(last_matches) if last_matches else 0.0
 
-        total_query = """
-            SELECT
-                COUNT(*) as total,
-                SUM(CASE WHEN winner_id = %s THEN 1 ELSE 0 END) as total_wins
-            FROM matches
-            WHERE (player_1_id = %s OR player_2_id = %s)
-            AND surface_id = %s
-            AND winner_id IS NOT NULL
-        """
-
-        result = self.db.execute_query(
-            total_query,
-            (player_id, player_id, player_id, surface_id),
-            fetch=True
-        )
+        result = self.db.execute_prepared('player_surface_totals', (player_id, surface_id))
 
         total_wins = int(result[0]['total_wins']) if result and result[0]['total_wins'] else 0
         total_matches = int(result[0]['total']) if result and result[0]['total'] else 0
@@ -43,13 +31,16 @@ class SurfaceHistoryCalculator:
             'total_losses': total_losses
         }
 
-    def update_player_surface_history(self, player_id, surface_id):
+    def build_surface_history_row(self, player_id, surface_id):
         stats = self.calculate_surface_history(player_id, surface_id)
+        return (player_id, surface_id, stats['last_10_wins'], stats['last_10_losses'],
+                stats['win_rate'], stats['total_wins'], stats['total_losses'])
 
+    def save_surface_histories(self, rows):
         query = """
             INSERT INTO surface_history
             (player_id, surface_id, last_10_wins, last_10_losses, win_rate, total_wins, total_losses)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            VALUES %s
             ON CONFLICT (player_id, surface_id) DO UPDATE SET
                 last_10_wins = EXCLUDED.last_10_wins,
                 last_10_losses = EXCLUDED.last_10_losses,
@@ -59,30 +50,69 @@ class SurfaceHistoryCalculator:
                 last_updated = CURRENT_TIMESTAMP
         """
 
-        self.db.execute_query(
-            query,
-            (player_id, surface_id, stats['last_10_wins'], stats['last_10_losses'],
-             stats['win_rate'], stats['total_wins'], stats['total_losses'])
-        )
+        return self.db.execute_values(query, rows, unique_by=(0, 1))
+
+    def update_player_surface_history(self, player_id, surface_id):
+        row = self.build_surface_history_row(player_id, surface_id)
+        self.save_surface_histories([row])
 
         logger.info(f"Updated surface history for player {player_id}, surface {surface_id}")
-        return stats
+        return {
+            'last_10_wins': row[2],
+            'last_10_losses': row[3],
+            'win_rate': row[4],
+            'total_wins': row[5],
+            'total_losses': row[6]
+        }
 
-    def update_all_player_surfaces(self):
+    def update_players(self, player_ids, surface_ids):
+        updated_count = 0
+        error_count = 0
+        rows = []
+
+        for player_id in player_ids:
+            for surface_id in surface_ids:
+                try:
+                    rows.append(self.build_surface_history_row(player_id, surface_id))
+                except Exception as e:
+                    logger.error(f"Error calculating surface history: {e}")
+                    error_count += 1
+
+            if len(rows) >= DB_BULK_PAGE_SIZE:
+                saved, failed = self._flush(rows)
+                updated_count += saved
+                error_count += failed
+                rows = []
+
+        saved, failed = self._flush(rows)
+        return updated_count + saved, error_count + failed
+
+    def _flush(self, rows):
+        if not rows:
+            return 0, 0
+        try:
+            self.save_surface_histories(rows)
+            return len(rows), 0
+        except Exception as e:
+            logger.error(f"Error saving surface history for {len(rows)} player-surfaces: {e}")
+            return 0, len(rows)
+
+    def update_all_player_surfaces(self, concurrent=False, workers=None):
         surfaces_query = "SELECT id FROM surfaces"
         surfaces = self.db.execute_query(surfaces_query, fetch=True)
+        surface_ids = [surface['id'] for surface in surfaces]
 
         players_query = "SELECT id FROM players WHERE is_active = true"
         players = self.db.execute_query(players_query, fetch=True)
+        player_ids = [player['id'] for player in players]
 
-        updated_count = 0
-        for player in players:
-            for surface in surfaces:
-                try:
-                    self.update_player_surface_history(player['id'], surface['id'])
-                    updated_count += 1
-                except Exception as e:
-                    logger.error(f"Error updating surface history: {e}")
+        if concurrent:
+            workers = workers or self.db.max_connections
+            updated_count, error_count = run_partitioned(
+                lambda chunk: self.update_players(chunk, surface_ids), player_ids, workers
+            )
+        else:
+            updated_count, error_count = self.update_players(player_ids, surface_ids)
 
-        logger.info(f"Updated {updated_count} player-surface combinations")
+        logger.info(f"Updated {updated_count} player-surface combinations ({error_count} errors)")
         return updated_count
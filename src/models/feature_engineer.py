@@ -1,15 +1,22 @@
+import json
+import hashlib
 import pandas as pd
 import numpy as np
 from config.database import get_db
+from config.settings import USE_PLAYER_SNAPSHOTS, ANALYTICS_ENGINE
+from src.data.duckdb_mirror import get_duckdb_mirror
 from src.utils.database_utils import get_head_to_head
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+FEATURE_SOURCE_TABLES = ['matches', 'tournaments', 'surfaces', 'player_stats', 'surface_history', 'player_daily_snapshots']
+
 class FeatureEngineer:
-    def __init__(self, feature_configuration_id=None):
+    def __init__(self, feature_configuration_id=None, analytics_engine=ANALYTICS_ENGINE):
         self.db = get_db()
         self.feature_configuration_id = feature_configuration_id
+        self.analytics_engine = analytics_engine
         self.feature_weights = self._load_feature_weights()
 
     def _load_feature_weights(self):
@@ -38,7 +45,61 @@ class FeatureEngineer:
             'player_1_last_5_win_rate', 'player_2_last_5_win_rate'
         ]
 
-    def extract_features_from_db(self, limit=None):
+    def extract_features_from_db(self, limit=None, use_snapshots=USE_PLAYER_SNAPSHOTS):
+        if use_snapshots:
+            # Each player's latest snapshot from before the match day; the
+            # same-day one already includes the result.
+            stats_columns = """
+                s1.sports_mood_score as player_1_sports_mood,
+                ps1.personal_mood_score as player_1_personal_mood,
+                s2.sports_mood_score as player_2_sports_mood,
+                ps2.personal_mood_score as player_2_personal_mood,
+                CASE sf.name
+                    WHEN 'Hard' THEN s1.hard_win_rate
+                    WHEN 'Clay' THEN s1.clay_win_rate
+                    WHEN 'Grass' THEN s1.grass_win_rate
+                    WHEN 'Carpet' THEN s1.carpet_win_rate
+                END as player_1_surface_win_rate,
+                CASE sf.name
+                    WHEN 'Hard' THEN s2.hard_win_rate
+                    WHEN 'Clay' THEN s2.clay_win_rate
+                    WHEN 'Grass' THEN s2.grass_win_rate
+                    WHEN 'Carpet' THEN s2.carpet_win_rate
+                END as player_2_surface_win_rate
+            """
+            stats_joins = """
+            LEFT JOIN surfaces sf ON m.surface_id = sf.id
+            LEFT JOIN player_stats ps1 ON m.player_1_id = ps1.player_id
+            LEFT JOIN player_stats ps2 ON m.player_2_id = ps2.player_id
+            LEFT JOIN LATERAL (
+                SELECT * FROM player_daily_snapshots
+                WHERE player_id = m.player_1_id AND snapshot_date < m.date
+                ORDER BY snapshot_date DESC
+                LIMIT 1
+            ) s1 ON true
+            LEFT JOIN LATERAL (
+                SELECT * FROM player_daily_snapshots
+                WHERE player_id = m.player_2_id AND snapshot_date < m.date
+                ORDER BY snapshot_date DESC
+                LIMIT 1
+            ) s2 ON true
+            """
+        else:
+            stats_columns = """
+                ps1.sports_mood_score as player_1_sports_mood,
+                ps1.personal_mood_score as player_1_personal_mood,
+                ps2.sports_mood_score as player_2_sports_mood,
+                ps2.personal_mood_score as player_2_personal_mood,
+                sh1.win_rate as player_1_surface_win_rate,
+                sh2.win_rate as player_2_surface_win_rate
+            """
+            stats_joins = """
+            LEFT JOIN player_stats ps1 ON m.player_1_id = ps1.player_id
+            LEFT JOIN player_stats ps2 ON m.player_2_id = ps2.player_id
+            LEFT JOIN surface_history sh1 ON m.player_1_id = sh1.player_id AND m.surface_id = sh1.surface_id
+            LEFT JOIN surface_history sh2 ON m.player_2_id = sh2.player_id AND m.surface_id = sh2.surface_id
+            """
+
         query = """
             SELECT
                 m.id as match_id,
@@ -57,57 +118,43 @@ class FeatureEngineer:
                 m.round_id,
                 m.tournament_id,
                 t.series as tournament_series,
-                ps1.sports_mood_score as player_1_sports_mood,
-                ps1.personal_mood_score as player_1_personal_mood,
-                ps2.sports_mood_score as player_2_sports_mood,
-                ps2.personal_mood_score as player_2_personal_mood,
-                sh1.win_rate as player_1_surface_win_rate,
-                sh2.win_rate as player_2_surface_win_rate
+                {stats_columns}
             FROM matches m
             JOIN tournaments t ON m.tournament_id = t.id
-            LEFT JOIN player_stats ps1 ON m.player_1_id = ps1.player_id
-            LEFT JOIN player_stats ps2 ON m.player_2_id = ps2.player_id
-            LEFT JOIN surface_history sh1 ON m.player_1_id = sh1.player_id AND m.surface_id = sh1.surface_id
-            LEFT JOIN surface_history sh2 ON m.player_2_id = sh2.player_id AND m.surface_id = sh2.surface_id
+            {stats_joins}
             WHERE m.winner_id IS NOT NULL
             AND m.rank_1 IS NOT NULL
             AND m.rank_2 IS NOT NULL
-            ORDER BY m.date DESC
+            ORDER BY m.date DESC, m.id DESC
             {limit_clause}
         """
 
         limit_clause = f"LIMIT {limit}" if limit else ""
-        query = query.format(limit_clause=limit_clause)
-
-        matches = self.db.execute_query(query, fetch=True)
-        logger.info(f"Extracted {len(matches)} matches from database")
+        query = query.format(stats_columns=stats_columns, stats_joins=stats_joins, limit_clause=limit_clause)
 
-        df = pd.DataFrame(matches)
-
-        decimal_cols = ['player_1_sports_mood', 'player_2_sports_mood',
-                       'player_1_personal_mood', 'player_2_personal_mood',
-                       'player_1_surface_win_rate', 'player_2_surface_win_rate']
-
-        for col in decimal_cols:
-            if col in df.columns:
-                df[col] = df[col].apply(lambda x: float(x) if x is not None else None)
+        if self.analytics_engine == 'duckdb':
+            mirror = get_duckdb_mirror()
+            mirror.sync(FEATURE_SOURCE_TABLES)
+            df = mirror.query_frame(query)
+        else:
+            df = self.db.read_frame(query)
+        logger.info(f"Extracted {len(df)} matches from database")
 
         return df
 
     def calculate_last_n_win_rate(self, player_id, n=5):
         query = """
             SELECT COUNT(*) as total,
-                   SUM(CASE WHEN winner_id = %s THEN 1 ELSE 0 END) as wins
+                   SUM(CASE WHEN won THEN 1 ELSE 0 END) as wins
             FROM (
-                SELECT winner_id FROM matches
-                WHERE (player_1_id = %s OR player_2_id = %s)
-                AND winner_id IS NOT NULL
+                SELECT won FROM player_match_timeline
+                WHERE player_id = %s
                 ORDER BY date DESC
                 LIMIT %s
             ) recent_matches
         """
 
-        result = self.db.execute_query(query, (player_id, player_id, player_id, n), fetch=True)
+        result = self.db.execute_query(query, (player_id, n), fetch=True)
 
         if result and result[0]['total'] > 0:
             return result[0]['wins'] / result[0]['total']
@@ -182,3 +229,11 @@ class FeatureEngineer:
 
     def get_feature_columns(self):
         return self._get_feature_names()
+
+    def get_feature_version(self):
+        definition = {
+            'columns': self._get_feature_names(),
+            'weights': self.feature_weights,
+            'use_player_snapshots': USE_PLAYER_SNAPSHOTS
+        }
+        return hashlib.sha1(json.dumps(definition, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
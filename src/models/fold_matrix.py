@@ -0,0 +1,84 @@
+import hashlib
+import threading
+import numpy as np
+import xgboost as xgb
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_BIN = 256
+
+def as_training_matrix(X):
+    # One contiguous float32 copy of the features. CV workers are threads, so
+    # they all read this array instead of pickling or re-converting the frame.
+    values = X.to_numpy(dtype=np.float32) if hasattr(X, 'to_numpy') else np.asarray(X, dtype=np.float32)
+    return np.ascontiguousarray(values)
+
+def fold_key(indices):
+    return hashlib.sha1(np.ascontiguousarray(indices).tobytes()).hexdigest()
+
+class QuantileFoldCache:
+    # Builds the quantized histogram matrix of each fold once and shares it
+    # between every trial that fits that fold. Extra targets (sets, games)
+    # get their own label matrices on the same quantile cuts.
+    def __init__(self, X, y, targets=None):
+        self.X = as_training_matrix(X)
+        self.labels = {None: np.asarray(y, dtype=np.float32)}
+        for target, values in (targets or {}).items():
+            self.labels[target] = np.asarray(values, dtype=np.float32)
+        self._matrices = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _fold_matrices(self, train_idx, test_idx, max_bin, threads, target=None):
+        key = (fold_key(train_idx), fold_key(test_idx), max_bin, target)
+        ref = None
+        if target is not None:
+            ref = self._fold_matrices(train_idx, test_idx, max_bin, threads)[0]
+
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+
+        with lock:
+            if key not in self._matrices:
+                labels = self.labels[target]
+                dtrain = xgb.QuantileDMatrix(self.X[train_idx], label=labels[train_idx],
+                                             max_bin=max_bin, ref=ref, nthread=threads)
+                dtest = xgb.DMatrix(self.X[test_idx], label=labels[test_idx], nthread=threads)
+                self._matrices[key] = (dtrain, dtest)
+            return self._matrices[key]
+
+    def fit_predict(self, estimator, train_idx, test_idx, threads, target=None, stop_idx=None):
+        params = estimator.get_xgb_params()
+        params['tree_method'] = 'hist'
+        params['max_bin'] = params.get('max_bin') or DEFAULT_MAX_BIN
+
+        early_stopping_rounds = estimator.get_params().get('early_stopping_rounds')
+        if stop_idx is not None and not early_stopping_rounds:
+            # Nothing to stop, so the stopping rows are trained on.
+            train_idx, stop_idx = np.sort(np.concatenate([train_idx, stop_idx])), None
+
+        dtrain, dtest = self._fold_matrices(train_idx, test_idx, params['max_bin'], threads, target)
+        if not early_stopping_rounds:
+            booster = xgb.train(params, dtrain, num_boost_round=estimator.get_num_boosting_rounds())
+            return self._predictions(booster, dtest, params)
+
+        if stop_idx is None:
+            # Like xgb.cv, the held-out fold both stops boosting and scores the
+            # trial, so n_estimators is only an upper bound. Fine for ranking
+            # candidates, optimistic for reported metrics.
+            dstop = dtest
+        else:
+            labels = self.labels[target]
+            dstop = xgb.DMatrix(self.X[stop_idx], label=labels[stop_idx], nthread=threads)
+
+        booster = xgb.train(params, dtrain, num_boost_round=estimator.get_num_boosting_rounds(),
+                            evals=[(dstop, 'validation')], early_stopping_rounds=early_stopping_rounds,
+                            verbose_eval=False)
+        return self._predictions(booster, dtest, params, (0, booster.best_iteration + 1))
+
+    def _predictions(self, booster, dtest, params, iteration_range=(0, 0)):
+        predictions = booster.predict(dtest, iteration_range=iteration_range)
+        if str(params.get('objective', '')).startswith('binary:'):
+            return (predictions > 0.5).astype(int)
+        return predictions
@@ -1,41 +1,286 @@
-from sklearn.model_selection import RandomizedSearchCV
-import xgboost as xgb
+import time
+import numpy as np
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import ParameterSampler, StratifiedKFold, train_test_split
+from config.settings import HALVING_FACTOR, TUNING_WARM_START_CONFIGS
+from src.models.fold_matrix import as_training_matrix
+from src.models.walk_forward import run_folds, run_fold_tasks
+from src.models.tuning_store import params_key, search_key
+from src.utils.cpu_budget import CPUBudget
+from src.utils.fingerprint import frame_fingerprint
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+SEARCH_STRATEGIES = ['random', 'halving', 'tpe']
+
+def _take(data, indices):
+    return data.iloc[indices] if hasattr(data, 'iloc') else data[indices]
+
+def _accuracy(y_true, y_pred):
+    return float(accuracy_score(y_true, y_pred))
+
+def _in_space(params, search_space):
+    return set(params) == set(search_space) and all(params[name] in search_space[name] for name in params)
+
 class HyperparameterTuner:
-    def __init__(self, n_iter=10, cv=3, random_state=42):
+    def __init__(self, n_iter=10, cv=3, random_state=42, strategy='random', factor=HALVING_FACTOR,
+                 store=None, warm_start=TUNING_WARM_START_CONFIGS, budget=None):
+        if strategy not in SEARCH_STRATEGIES:
+            raise ValueError(f"Unknown search strategy: {strategy}")
+
         self.n_iter = n_iter
         self.cv = cv
         self.random_state = random_state
+        self.strategy = strategy
+        self.factor = factor
+        self.store = store
+        self.warm_start = warm_start
+        self.budget = budget or CPUBudget()
 
-    def tune(self, model_instance, X_train, y_train):
-        logger.info(f"Starting hyperparameter tuning for {model_instance.model_name}")
+    def tune(self, model_instance, X_train, y_train, feature_version=None, training_run_id=None, groups=None,
+             fold_cache=None):
+        logger.info(f"Starting {self.strategy} hyperparameter search for {model_instance.model_name} "
+                    f"({self.n_iter} candidates, CV: {self.cv})")
 
         search_space = model_instance.get_hyperparameter_search_space()
         base_params = model_instance.get_default_hyperparameters()
 
-        if model_instance.model_name == "XGBoost":
-            temp_model = xgb.XGBClassifier(**base_params)
+        self._model = model_instance
+        self._estimator = model_instance.create_estimator(base_params)
+        self._X = as_training_matrix(X_train)
+        self._y = np.asarray(y_train)
+        self._shared_fold_cache = fold_cache
+        self._fold_cache = None
+        self._fold_cache_samples = None
+        self._groups = None if groups is None else np.asarray(groups)
+        self._trials = {}
+        self._trial_number = 0
+        self._search_id = None
+        warm_start_params = []
+
+        if self.store is not None:
+            key = search_key(model_instance.model_name, self.strategy, search_space,
+                             self.n_iter, self.cv, self.random_state)
+            self._search_id, resumed = self.store.start_search(
+                model_instance.model_name, self.strategy, feature_version or 'unknown',
+                frame_fingerprint(X_train, y_train), key, training_run_id
+            )
+            for trial in self.store.load_trials(self._search_id):
+                self._trials[(trial['params_key'], trial['n_samples'])] = trial
+                self._trial_number = max(self._trial_number, trial['trial_number'] + 1)
+            if resumed:
+                logger.info(f"Loaded {len(self._trials)} finished trials")
+
+            if feature_version and self.warm_start:
+                prior = self.store.best_prior_params(model_instance.model_name, feature_version,
+                                                     self.warm_start, self._search_id)
+                warm_start_params = [params for params in prior if _in_space(params, search_space)]
+                if warm_start_params:
+                    logger.info(f"Warm-starting from {len(warm_start_params)} prior configurations")
+
+        if self.strategy == 'tpe':
+            best_params, best_score = self._tpe_search(search_space, warm_start_params)
+        elif self.strategy == 'halving':
+            best_params, best_score = self._halving_search(self._candidates(search_space, warm_start_params))
         else:
-            model_instance.train(X_train, y_train, base_params)
-            temp_model_class = type(model_instance.model)
-            temp_model = temp_model_class(**base_params)
-
-        search = RandomizedSearchCV(
-            estimator=temp_model,
-            param_distributions=search_space,
-            n_iter=self.n_iter,
-            cv=self.cv,
-            random_state=self.random_state,
-            n_jobs=-1,
-            verbose=1
+            best_params, best_score = self._random_search(self._candidates(search_space, warm_start_params))
+
+        if self.store is not None:
+            self.store.finish_search(self._search_id, best_params, best_score)
+
+        logger.info(f"Best parameters: {best_params}")
+        logger.info(f"Best score: {best_score:.4f}")
+
+        return {**base_params, **best_params}, best_score
+
+    def _candidates(self, search_space, warm_start_params):
+        candidates = list(warm_start_params)
+        seen = {params_key(params) for params in candidates}
+
+        for params in ParameterSampler(search_space, n_iter=self.n_iter, random_state=self.random_state):
+            if len(candidates) >= self.n_iter:
+                break
+            if params_key(params) not in seen:
+                seen.add(params_key(params))
+                candidates.append(params)
+
+        return candidates
+
+    def _subsample(self, n_samples):
+        if n_samples >= len(self._y):
+            return self._X, self._y, self._groups
+
+        # A fixed stratified subset, so a resumed search scores the same rows.
+        indices, _ = train_test_split(
+            np.arange(len(self._y)), train_size=n_samples,
+            stratify=self._y, random_state=self.random_state
+        )
+        indices = np.sort(indices)
+        groups = None if self._groups is None else self._groups[indices]
+        return _take(self._X, indices), _take(self._y, indices), groups
+
+    def _folds(self, X, y, groups):
+        if isinstance(self.cv, int):
+            splitter = StratifiedKFold(n_splits=self.cv, shuffle=True, random_state=self.random_state)
+        else:
+            splitter = self.cv
+        return list(splitter.split(X, y, groups))
+
+    def _cached_folds(self, X, y, n_samples):
+        # Quantized fold matrices are reused by every trial on the same
+        # sample; a halving round on a larger sample replaces them.
+        if self._fold_cache_samples != n_samples:
+            shared = self._shared_fold_cache if n_samples >= len(self._y) else None
+            self._fold_cache = self._model.create_fold_cache(X, y, shared)
+            self._fold_cache_samples = n_samples
+        return self._fold_cache
+
+    def _record(self, params, n_samples, fold_scores, fit_seconds, status='complete'):
+        result = {
+            'trial_number': self._trial_number,
+            'params': params,
+            'n_samples': n_samples,
+            'fold_scores': fold_scores,
+            'mean_score': float(np.mean(fold_scores)),
+            'fit_seconds': fit_seconds,
+            'status': status
+        }
+        self._trials[(params_key(params), n_samples)] = result
+        self._trial_number += 1
+
+        if self.store is not None:
+            self.store.record_trial(self._search_id, result['trial_number'], params, n_samples,
+                                    fold_scores, fit_seconds, status)
+        return result
+
+    def _evaluate_many(self, candidates, n_samples):
+        pending = []
+        for params in candidates:
+            if (params_key(params), n_samples) not in self._trials and params not in pending:
+                pending.append(params)
+
+        if pending:
+            X, y, groups = self._subsample(n_samples)
+            folds = self._folds(X, y, groups)
+            fold_cache = self._cached_folds(X, y, n_samples)
+
+            # Candidates x folds share the CPU budget. Batches hold as many
+            # candidates as there are outer workers for all their folds, and
+            # each batch is stored before the next one starts.
+            workers, threads = self.budget.split(len(pending) * len(folds))
+            batch_size = max(1, workers // len(folds))
+            logger.info(f"Evaluating {len(pending)} candidates on {n_samples} samples "
+                        f"({workers} workers x {threads} threads)")
+
+            for offset in range(0, len(pending), batch_size):
+                batch = pending[offset:offset + batch_size]
+                tasks = [(params, train_idx, test_idx) for params in batch for train_idx, test_idx in folds]
+                outcomes = run_fold_tasks(self._estimator, X, y, tasks, _accuracy, self.budget, fold_cache)
+                for index, params in enumerate(batch):
+                    fold_outcomes = outcomes[index * len(folds):(index + 1) * len(folds)]
+                    self._record(params, n_samples, [score for score, _ in fold_outcomes],
+                                 sum(seconds for _, seconds in fold_outcomes))
+
+        return [self._trials[(params_key(params), n_samples)] for params in candidates]
+
+    def _evaluate_trial(self, params, n_samples, trial):
+        cached = self._trials.get((params_key(params), n_samples))
+        if cached is not None:
+            return cached
+
+        X, y, groups = self._subsample(n_samples)
+        folds = self._folds(X, y, groups)
+        fold_cache = self._cached_folds(X, y, n_samples)
+
+        # TPE runs folds in order so it can stop a trial after a fold when
+        # it trails the median of earlier trials. Each fold gets the whole
+        # CPU budget.
+        fold_scores = []
+        status = 'complete'
+        start = time.perf_counter()
+        for step, fold in enumerate(folds):
+            fold_scores.extend(run_folds(self._estimator, params, X, y, [fold], _accuracy, self.budget, fold_cache))
+            trial.report(float(np.mean(fold_scores)), step)
+            if trial.should_prune():
+                status = 'pruned'
+                break
+
+        return self._record(params, n_samples, fold_scores, time.perf_counter() - start, status)
+
+    def _random_search(self, candidates):
+        n_samples = len(self._y)
+        results = self._evaluate_many(candidates, n_samples)
+        best = max(results, key=lambda result: result['mean_score'])
+        return best['params'], best['mean_score']
+
+    def _halving_search(self, candidates):
+        # Every candidate starts on a small sample of the training data; only
+        # the best 1/factor move on to the next round with factor times more.
+        n_total = len(self._y)
+        rounds = 1
+        while self.factor ** rounds <= len(candidates):
+            rounds += 1
+        n_folds = self.cv if isinstance(self.cv, int) else self.cv.get_n_splits()
+        min_samples = max(n_total // self.factor ** (rounds - 1), n_folds * 20)
+
+        for round_index in range(rounds):
+            last_round = round_index == rounds - 1
+            n_samples = n_total if last_round else min(n_total, min_samples * self.factor ** round_index)
+            results = self._evaluate_many(candidates, n_samples)
+            logger.info(f"Halving round {round_index + 1}/{rounds}: {len(candidates)} candidates on {n_samples} samples")
+
+            if last_round:
+                break
+            ranked = sorted(results, key=lambda result: result['mean_score'], reverse=True)
+            candidates = [result['params'] for result in ranked[:max(1, len(candidates) // self.factor)]]
+
+        best = max(results, key=lambda result: result['mean_score'])
+        return best['params'], best['mean_score']
+
+    def _tpe_search(self, search_space, warm_start_params):
+        try:
+            import optuna
+        except ImportError:
+            raise ImportError("optuna is required for the 'tpe' search strategy (pip install optuna)")
+
+        optuna.logging.set_verbosity(optuna.logging.WARNING)
+        n_samples = len(self._y)
+        distributions = {name: optuna.distributions.CategoricalDistribution(values)
+                         for name, values in search_space.items()}
+
+        study = optuna.create_study(
+            direction='maximize',
+            sampler=optuna.samplers.TPESampler(seed=self.random_state),
+            pruner=optuna.pruners.MedianPruner(n_startup_trials=5)
         )
 
-        search.fit(X_train, y_train)
+        # Replay stored trials so the sampler picks up where it stopped.
+        finished = [trial for trial in self._trials.values()
+                    if trial['n_samples'] == n_samples and _in_space(trial['params'], search_space)]
+        for trial in finished:
+            pruned = trial['status'] == 'pruned'
+            study.add_trial(optuna.trial.create_trial(
+                params=trial['params'],
+                distributions=distributions,
+                value=None if pruned else trial['mean_score'],
+                intermediate_values={len(trial['fold_scores']) - 1: trial['mean_score']},
+                state=optuna.trial.TrialState.PRUNED if pruned else optuna.trial.TrialState.COMPLETE
+            ))
+
+        for params in warm_start_params:
+            study.enqueue_trial(params)
+
+        def objective(trial):
+            params = {name: trial.suggest_categorical(name, values) for name, values in search_space.items()}
+            result = self._evaluate_trial(params, n_samples, trial)
+            if result['status'] == 'pruned':
+                raise optuna.TrialPruned()
+            return result['mean_score']
+
+        study.optimize(objective, n_trials=max(0, self.n_iter - len(finished)))
 
-        logger.info(f"Best parameters: {search.best_params_}")
-        logger.info(f"Best score: {search.best_score_:.4f}")
+        pruned = sum(1 for trial in study.trials if trial.state == optuna.trial.TrialState.PRUNED)
+        logger.info(f"TPE search finished {len(study.trials)} trials ({pruned} pruned)")
 
-        return search.best_params_, search.best_score_
+        return study.best_params, study.best_value
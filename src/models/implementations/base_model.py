@@ -1,10 +1,15 @@
 from abc import ABC, abstractmethod
 
 class BaseModel(ABC):
+    # Implementations with a model_type are registered by ModelFactory.
+    model_type = None
+    supports_incremental = False
+
     def __init__(self, model_name):
         self.model_name = model_name
         self.model = None
         self.best_params = None
+        self.best_iteration = None
 
     @abstractmethod
     def get_default_hyperparameters(self):
@@ -15,7 +20,11 @@ class BaseModel(ABC):
         pass
 
     @abstractmethod
-    def train(self, X_train, y_train, hyperparameters=None):
+    def create_estimator(self, hyperparameters=None):
+        pass
+
+    @abstractmethod
+    def train(self, X_train, y_train, hyperparameters=None, X_val=None, y_val=None):
         pass
 
     @abstractmethod
@@ -34,5 +43,11 @@ class BaseModel(ABC):
     def load_model(self, file_path):
         pass
 
+    def continue_training(self, X_train, y_train, sample_weight=None, n_rounds=None, n_jobs=None):
+        raise NotImplementedError(f"{self.model_name} does not support incremental training")
+
+    def create_fold_cache(self, X, y, cache=None):
+        return None
+
     def get_feature_importance(self):
         return None
@@ -1,11 +1,14 @@
 import lightgbm as lgb
 import pickle
+from config.settings import TRAINING_CPU_BUDGET, EARLY_STOPPING_ROUNDS
 from src.models.implementations.base_model import BaseModel
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 class LightGBMModel(BaseModel):
+    model_type = "LightGBM"
+
     def __init__(self):
         super().__init__("LightGBM")
 
@@ -17,7 +20,8 @@ class LightGBMModel(BaseModel):
             'objective': 'binary',
             'metric': 'binary_logloss',
             'random_state': 42,
-            'verbose': -1
+            'verbose': -1,
+            'n_jobs': TRAINING_CPU_BUDGET
         }
 
     def get_hyperparameter_search_space(self):
@@ -30,12 +34,24 @@ class LightGBMModel(BaseModel):
             'subsample': [0.8, 0.9, 1.0]
         }
 
-    def train(self, X_train, y_train, hyperparameters=None):
+    def create_estimator(self, hyperparameters=None):
+        if hyperparameters is None:
+            hyperparameters = self.get_default_hyperparameters()
+        return lgb.LGBMClassifier(**hyperparameters)
+
+    def train(self, X_train, y_train, hyperparameters=None, X_val=None, y_val=None):
         if hyperparameters is None:
             hyperparameters = self.get_default_hyperparameters()
 
-        self.model = lgb.LGBMClassifier(**hyperparameters)
-        self.model.fit(X_train, y_train)
+        self.model = self.create_estimator(hyperparameters)
+        if X_val is None:
+            self.model.fit(X_train, y_train)
+            self.best_iteration = None
+        else:
+            self.model.fit(X_train, y_train, eval_set=[(X_val, y_val)],
+                           callbacks=[lgb.early_stopping(EARLY_STOPPING_ROUNDS, verbose=False)])
+            self.best_iteration = self.model.best_iteration_
+            logger.info(f"LightGBM early stopping at iteration {self.best_iteration}")
         self.best_params = hyperparameters
 
         logger.info(f"LightGBM model trained with params: {hyperparameters}")
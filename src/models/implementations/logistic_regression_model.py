@@ -0,0 +1,78 @@
+import pickle
+import numpy as np
+import pandas as pd
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from src.models.implementations.base_model import BaseModel
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class LogisticRegressionModel(BaseModel):
+    # Fast linear baseline; the boosters should beat it to be worth their cost.
+    model_type = "LogisticRegression"
+
+    def __init__(self):
+        super().__init__("LogisticRegression")
+
+    def get_default_hyperparameters(self):
+        return {
+            'logisticregression__C': 1.0,
+            'logisticregression__max_iter': 1000,
+            'logisticregression__random_state': 42
+        }
+
+    def get_hyperparameter_search_space(self):
+        return {
+            'logisticregression__C': [0.001, 0.01, 0.1, 1.0, 10.0],
+            'logisticregression__class_weight': [None, 'balanced']
+        }
+
+    def create_estimator(self, hyperparameters=None):
+        if hyperparameters is None:
+            hyperparameters = self.get_default_hyperparameters()
+        pipeline = make_pipeline(SimpleImputer(strategy='median'), StandardScaler(), LogisticRegression())
+        return pipeline.set_params(**hyperparameters)
+
+    def train(self, X_train, y_train, hyperparameters=None, X_val=None, y_val=None):
+        if hyperparameters is None:
+            hyperparameters = self.get_default_hyperparameters()
+
+        # No boosting rounds to stop, so the early-stopping slice is trained on.
+        if X_val is not None:
+            X_train = pd.concat([X_train, X_val])
+            y_train = pd.concat([y_train, y_val])
+
+        self.model = self.create_estimator(hyperparameters)
+        self.model.fit(X_train, y_train)
+        self.best_params = hyperparameters
+
+        logger.info(f"LogisticRegression model trained with params: {hyperparameters}")
+        return self.model
+
+    def predict(self, X):
+        return self.model.predict(X)
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(X)
+
+    def save_model(self, file_path):
+        with open(file_path, 'wb') as f:
+            pickle.dump(self.model, f)
+        logger.info(f"LogisticRegression model saved to {file_path}")
+
+    def load_model(self, file_path):
+        with open(file_path, 'rb') as f:
+            self.model = pickle.load(f)
+        logger.info(f"LogisticRegression model loaded from {file_path}")
+
+    def get_feature_importance(self):
+        if self.model:
+            coefficients = np.abs(self.model[-1].coef_[0])
+            return dict(zip(
+                [f'f{i}' for i in range(len(coefficients))],
+                coefficients.tolist()
+            ))
+        return None
@@ -1,11 +1,16 @@
 import xgboost as xgb
 import pickle
+from config.settings import TRAINING_CPU_BUDGET, EARLY_STOPPING_ROUNDS, INCREMENTAL_ROUNDS
 from src.models.implementations.base_model import BaseModel
+from src.models.fold_matrix import QuantileFoldCache
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 class XGBoostModel(BaseModel):
+    model_type = "XGBoost"
+    supports_incremental = True
+
     def __init__(self):
         super().__init__("XGBoost")
 
@@ -13,33 +18,73 @@ class XGBoostModel(BaseModel):
         return {
             'max_depth': 6,
             'learning_rate': 0.1,
-            'n_estimators': 100,
+            'n_estimators': 1000,
+            'early_stopping_rounds': EARLY_STOPPING_ROUNDS,
+            'tree_method': 'hist',
+            'max_bin': 256,
             'objective': 'binary:logistic',
             'eval_metric': 'logloss',
-            'random_state': 42
+            'random_state': 42,
+            'n_jobs': TRAINING_CPU_BUDGET
         }
 
     def get_hyperparameter_search_space(self):
+        # n_estimators is an upper bound; early stopping picks the rounds.
         return {
             'max_depth': [3, 5, 7, 9],
             'learning_rate': [0.01, 0.05, 0.1, 0.2],
-            'n_estimators': [50, 100, 200, 300],
+            'max_bin': [64, 128, 256],
             'min_child_weight': [1, 3, 5],
             'subsample': [0.8, 0.9, 1.0],
             'colsample_bytree': [0.8, 0.9, 1.0]
         }
 
-    def train(self, X_train, y_train, hyperparameters=None):
+    def create_estimator(self, hyperparameters=None):
+        if hyperparameters is None:
+            hyperparameters = self.get_default_hyperparameters()
+        return xgb.XGBClassifier(**hyperparameters)
+
+    def create_fold_cache(self, X, y, cache=None):
+        # cache is a job-wide QuantileFoldCache over the same X and y.
+        return cache or QuantileFoldCache(X, y)
+
+    def train(self, X_train, y_train, hyperparameters=None, X_val=None, y_val=None):
         if hyperparameters is None:
             hyperparameters = self.get_default_hyperparameters()
 
-        self.model = xgb.XGBClassifier(**hyperparameters)
-        self.model.fit(X_train, y_train)
+        if X_val is None:
+            self.model = self.create_estimator({**hyperparameters, 'early_stopping_rounds': None})
+            self.model.fit(X_train, y_train)
+            self.best_iteration = None
+        else:
+            self.model = self.create_estimator(hyperparameters)
+            self.model.fit(X_train, y_train, eval_set=[(X_val, y_val)], verbose=False)
+            self.best_iteration = getattr(self.model, 'best_iteration', None)
+            logger.info(f"XGBoost early stopping at iteration {self.best_iteration}")
         self.best_params = hyperparameters
 
         logger.info(f"XGBoost model trained with params: {hyperparameters}")
         return self.model
 
+    def continue_training(self, X_train, y_train, sample_weight=None, n_rounds=INCREMENTAL_ROUNDS, n_jobs=None):
+        # Adds n_rounds trees to the loaded booster, cut at its early-stopping
+        # round so the trees past the best iteration are not kept.
+        booster = self.model.get_booster()
+        best_iteration = getattr(self.model, 'best_iteration', None)
+        if best_iteration is not None:
+            booster = booster[:best_iteration + 1]
+
+        params = {**self.model.get_params(), 'n_estimators': n_rounds, 'early_stopping_rounds': None}
+        if n_jobs:
+            params['n_jobs'] = n_jobs
+
+        self.model = xgb.XGBClassifier(**params)
+        self.model.fit(X_train, y_train, sample_weight=sample_weight, xgb_model=booster)
+        self.best_iteration = None
+
+        logger.info(f"XGBoost booster continued for {n_rounds} rounds on {len(y_train)} matches")
+        return self.model
+
     def predict(self, X):
         return self.model.predict(X)
 
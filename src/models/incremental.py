@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+def population_stability_index(reference, current, bins=10):
+    reference = np.asarray(reference, dtype=float)
+    current = np.asarray(current, dtype=float)
+    reference = reference[~np.isnan(reference)]
+    current = current[~np.isnan(current)]
+    if not len(reference) or not len(current):
+        return 0.0
+
+    # Quantile bins of the reference; discrete features collapse to fewer bins.
+    edges = np.unique(np.quantile(reference, np.linspace(0, 1, bins + 1)))
+    if len(edges) < 2:
+        return 0.0
+    edges[0], edges[-1] = -np.inf, np.inf
+
+    reference_share = np.clip(np.histogram(reference, edges)[0] / len(reference), 1e-4, None)
+    current_share = np.clip(np.histogram(current, edges)[0] / len(current), 1e-4, None)
+    return float(np.sum((current_share - reference_share) * np.log(current_share / reference_share)))
+
+def feature_drift(reference, current, bins=10):
+    return {column: population_stability_index(reference[column], current[column], bins)
+            for column in current.columns}
+
+def recency_weights(dates, half_life_days):
+    # The newest match weighs 1 and the weight halves every half_life_days.
+    dates = pd.to_datetime(pd.Series(np.asarray(dates)))
+    age_days = (dates.max() - dates).dt.days.to_numpy()
+    return 0.5 ** (age_days / half_life_days)
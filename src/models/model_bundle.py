@@ -0,0 +1,95 @@
+import pickle
+import numpy as np
+import xgboost as xgb
+from config.settings import EARLY_STOPPING_ROUNDS, TRAINING_CPU_BUDGET
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+BUNDLE_VERSION = 1
+
+# Regression targets trained next to the winner classifier, by the
+# prepare_data column they come from.
+BUNDLE_TARGETS = {
+    'sets': 'target_sets',
+    'games': 'target_games'
+}
+
+TARGET_BOUNDS = {
+    'sets': (2, 5),
+    'games': (12, 65)
+}
+
+TARGET_REGRESSOR_PARAMS = {
+    'max_depth': 4,
+    'learning_rate': 0.05,
+    'n_estimators': 1000,
+    'early_stopping_rounds': EARLY_STOPPING_ROUNDS,
+    'tree_method': 'hist',
+    'max_bin': 256,
+    'objective': 'reg:squarederror',
+    'random_state': 42,
+    'n_jobs': TRAINING_CPU_BUDGET
+}
+
+def create_target_regressor(n_jobs=None):
+    params = dict(TARGET_REGRESSOR_PARAMS)
+    if n_jobs:
+        params['n_jobs'] = n_jobs
+    return xgb.XGBRegressor(**params)
+
+def train_target_regressors(X_fit, targets_fit, X_stop=None, targets_stop=None, n_jobs=None):
+    regressors = {}
+    for target in BUNDLE_TARGETS:
+        regressor = create_target_regressor(n_jobs)
+        if X_stop is None:
+            regressor.set_params(early_stopping_rounds=None)
+            regressor.fit(X_fit, targets_fit[target])
+        else:
+            regressor.fit(X_fit, targets_fit[target], eval_set=[(X_stop, targets_stop[target])], verbose=False)
+        regressors[target] = regressor
+        logger.info(f"Trained {target} regressor ({regressor.get_booster().num_boosted_rounds()} rounds)")
+    return regressors
+
+class ModelBundle:
+    # The winner model and the sets/games regressors of one training job,
+    # stored and loaded together so predictions score all three at once.
+    def __init__(self, model, regressors=None, feature_columns=None, version=BUNDLE_VERSION):
+        self.model = model
+        self.regressors = regressors or {}
+        self.feature_columns = feature_columns
+        self.version = version
+
+    def select_features(self, X):
+        # The columns the bundle was trained on, in training order; bundles
+        # without a stored column list take X as it is.
+        if self.feature_columns is None:
+            return X
+        missing = [column for column in self.feature_columns if column not in X.columns]
+        if missing:
+            raise ValueError(f"Features missing for the model bundle: {', '.join(missing)}")
+        return X[self.feature_columns]
+
+    def predict(self, X):
+        X = self.select_features(X)
+        probabilities = self.model.predict_proba(X)
+        predictions = {
+            'winner': (probabilities[:, 1] >= 0.5).astype(int),
+            'winner_probability': probabilities[:, 1]
+        }
+        for target, regressor in self.regressors.items():
+            low, high = TARGET_BOUNDS[target]
+            predictions[target] = np.clip(np.rint(regressor.predict(X)), low, high).astype(int)
+        return predictions
+
+    def save(self, file_path):
+        with open(file_path, 'wb') as f:
+            pickle.dump(self, f)
+        logger.info(f"Model bundle v{self.version} saved to {file_path}")
+
+    @staticmethod
+    def load(file_path):
+        with open(file_path, 'rb') as f:
+            bundle = pickle.load(f)
+        logger.info(f"Model bundle v{bundle.version} loaded from {file_path} ({', '.join(bundle.regressors) or 'winner only'})")
+        return bundle
@@ -1,17 +1,46 @@
-from src.models.implementations.xgboost_model import XGBoostModel
+import inspect
+import importlib
+import pkgutil
+from src.models import implementations
+from src.models.implementations.base_model import BaseModel
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+def _subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
+
 class ModelFactory:
-    @staticmethod
-    def create_model(model_type):
-        if model_type == "XGBoost":
-            return XGBoostModel()
-        else:
+    _registry = None
+
+    @classmethod
+    def _discover(cls):
+        # Every BaseModel with a model_type in src/models/implementations is
+        # registered. A module whose library is not installed is skipped.
+        if cls._registry is None:
+            for module in pkgutil.iter_modules(implementations.__path__):
+                try:
+                    importlib.import_module(f"{implementations.__name__}.{module.name}")
+                except ImportError as e:
+                    logger.warning(f"Skipping model module {module.name}: {e}")
+
+            cls._registry = {
+                model_class.model_type: model_class
+                for model_class in _subclasses(BaseModel)
+                if model_class.model_type and not inspect.isabstract(model_class)
+            }
+        return cls._registry
+
+    @classmethod
+    def create_model(cls, model_type):
+        model_class = cls._discover().get(model_type)
+        if model_class is None:
             logger.error(f"Unknown model type: {model_type}")
             raise ValueError(f"Unknown model type: {model_type}")
+        return model_class()
 
-    @staticmethod
-    def get_available_models():
-        return ["XGBoost"]
+    @classmethod
+    def get_available_models(cls):
+        return sorted(cls._discover())
@@ -1,13 +1,42 @@
 import json
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, mean_absolute_error
 from pathlib import Path
-from config.settings import MODELS_DIR, DEFAULT_TRAIN_SPLIT, DEFAULT_VAL_SPLIT
+from config.settings import (
+    MODELS_DIR,
+    DEFAULT_TRAIN_SPLIT,
+    DEFAULT_VAL_SPLIT,
+    DEFAULT_SEARCH_STRATEGY,
+    DEFAULT_SEARCH_ITERATIONS,
+    DEFAULT_CV_FOLDS,
+    EARLY_STOPPING_FRACTION,
+    INCREMENTAL_MIN_NEW_MATCHES,
+    INCREMENTAL_HOLDOUT_FRACTION,
+    INCREMENTAL_HALF_LIFE_DAYS,
+    INCREMENTAL_DRIFT_REFERENCE_DAYS,
+    INCREMENTAL_MAX_DRIFT,
+    INCREMENTAL_MAX_ACCURACY_DROP,
+    DEFAULT_VALIDATION_STRATEGY,
+    WALK_FORWARD_PERIOD,
+    WALK_FORWARD_WINDOW,
+    WALK_FORWARD_FOLDS
+)
 from config.database import get_db
 from src.models.model_factory import ModelFactory
 from src.models.feature_engineer import FeatureEngineer
 from src.models.hyperparameter_tuner import HyperparameterTuner
+from src.models.incremental import feature_drift, recency_weights
+from src.models.fold_matrix import QuantileFoldCache
+from src.models.model_bundle import ModelBundle, train_target_regressors, create_target_regressor
+from src.models.tuning_store import TuningStore
+from src.models.walk_forward import WalkForwardSplitter, run_folds
+from src.utils.cpu_budget import CPUBudget
+from src.utils.fingerprint import dataset_fingerprint, config_fingerprint
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -18,16 +47,31 @@ class ModelTrainer:
         self.training_configuration_id = training_configuration_id
         self.feature_configuration_id = feature_configuration_id
         self.training_config = self._load_training_config()
+        self.feature_version = None
+        self.dataset_fingerprint = None
+        self.configuration_fingerprint = None
+        self.cpu_budget = CPUBudget()
         MODELS_DIR.mkdir(parents=True, exist_ok=True)
 
+    def _default_training_config(self):
+        return {
+            'train_split_ratio': DEFAULT_TRAIN_SPLIT,
+            'validation_split_ratio': DEFAULT_VAL_SPLIT,
+            'random_seed': 42,
+            'use_error_feedback': False,
+            'search_strategy': DEFAULT_SEARCH_STRATEGY,
+            'search_iterations': DEFAULT_SEARCH_ITERATIONS,
+            'cross_validation_folds': DEFAULT_CV_FOLDS,
+            'validation_strategy': DEFAULT_VALIDATION_STRATEGY,
+            'walk_forward_period': WALK_FORWARD_PERIOD,
+            'walk_forward_window': WALK_FORWARD_WINDOW,
+            'walk_forward_folds': WALK_FORWARD_FOLDS,
+            'walk_forward_train_periods': None
+        }
+
     def _load_training_config(self):
         if not self.training_configuration_id:
-            return {
-                'train_split_ratio': DEFAULT_TRAIN_SPLIT,
-                'validation_split_ratio': DEFAULT_VAL_SPLIT,
-                'random_seed': 42,
-                'use_error_feedback': False
-            }
+            return self._default_training_config()
 
         query = """
             SELECT * FROM training_configurations WHERE id = %s
@@ -37,12 +81,7 @@ class ModelTrainer:
         if result:
             return dict(result[0])
         else:
-            return {
-                'train_split_ratio': DEFAULT_TRAIN_SPLIT,
-                'validation_split_ratio': DEFAULT_VAL_SPLIT,
-                'random_seed': 42,
-                'use_error_feedback': False
-            }
+            return self._default_training_config()
 
     def prepare_data(self, limit=None):
         logger.info("Preparing data for training")
@@ -54,38 +93,145 @@ class ModelTrainer:
         df_features = feature_engineer.apply_weights(df_features)
 
         feature_cols = feature_engineer.get_feature_columns()
+        self.feature_version = feature_engineer.get_feature_version()
 
         X = df_features[feature_cols]
         y_winner = df_features['target_winner']
         y_sets = df_features['target_sets']
         y_games = df_features['target_games']
+        sample_info = df_features[['match_id', 'date']]
+        self.dataset_fingerprint = dataset_fingerprint(
+            sample_info['match_id'], self.feature_version, X, y_winner, y_sets, y_games
+        )
 
         logger.info(f"Data prepared. Features: {X.shape}, Samples: {len(X)}")
 
-        return X, y_winner, y_sets, y_games, feature_cols
+        return X, y_winner, y_sets, y_games, feature_cols, sample_info
 
-    def split_data(self, X, y):
-        train_size = self.training_config['train_split_ratio']
-        random_seed = self.training_config['random_seed']
+    def _walk_forward(self):
+        return (self.training_config.get('validation_strategy') or DEFAULT_VALIDATION_STRATEGY) == 'walk_forward'
+
+    def _validation_splitter(self):
+        if not self._walk_forward():
+            return self.training_config.get('cross_validation_folds') or DEFAULT_CV_FOLDS
 
-        X_train, X_val, y_train, y_val = train_test_split(
-            X, y, train_size=train_size, random_state=random_seed, stratify=y
+        return WalkForwardSplitter(
+            n_splits=self.training_config.get('walk_forward_folds') or WALK_FORWARD_FOLDS,
+            period=self.training_config.get('walk_forward_period') or WALK_FORWARD_PERIOD,
+            window=self.training_config.get('walk_forward_window') or WALK_FORWARD_WINDOW,
+            train_periods=self.training_config.get('walk_forward_train_periods')
         )
 
-        logger.info(f"Data split: Train={len(X_train)}, Val={len(X_val)}")
-        return X_train, X_val, y_train, y_val
+    def split_data(self, X, y, dates=None):
+        train_size = float(self.training_config['train_split_ratio'])
+        random_seed = self.training_config['random_seed']
+
+        if dates is None or not self._walk_forward():
+            X_train, X_val, y_train, y_val = train_test_split(
+                X, y, train_size=train_size, random_state=random_seed, stratify=y
+            )
+            logger.info(f"Data split: Train={len(X_train)}, Val={len(X_val)}")
+            return X_train, X_val, y_train, y_val, None
+
+        # Validate on the most recent matches and train only on earlier ones,
+        # the way the model is used in production.
+        dates = np.asarray(dates, dtype='datetime64[ns]')
+        cutoff = np.sort(dates)[int(len(dates) * train_size)]
+        train_idx = np.flatnonzero(dates < cutoff)
+        val_idx = np.flatnonzero(dates >= cutoff)
+
+        logger.info(f"Time-ordered split at {str(cutoff)[:10]}: Train={len(train_idx)}, Val={len(val_idx)}")
+        return X.iloc[train_idx], X.iloc[val_idx], y.iloc[train_idx], y.iloc[val_idx], dates[train_idx]
+
+    def walk_forward_metrics(self, model, X_train, y_train, dates_train, budget=None, fold_cache=None):
+        splitter = self._validation_splitter()
+        folds = splitter.folds(dates_train)
 
-    def train_model(self, model_type, X_train, y_train, tune_hyperparameters=True):
+        def score(y_test, y_pred):
+            return {
+                'accuracy': float(accuracy_score(y_test, y_pred)),
+                'f1_score': float(f1_score(y_test, y_pred, zero_division=0))
+            }
+
+        scores = run_folds(
+            model.create_estimator(model.best_params), {}, X_train, y_train,
+            self._reporting_folds(folds, dates_train), score, budget or self.cpu_budget,
+            model.create_fold_cache(X_train, y_train, fold_cache)
+        )
+
+        fold_metrics = []
+        for fold, fold_score in zip(folds, scores):
+            fold_metrics.append({
+                'test_period': fold['test_period'],
+                'train_start': fold['train_start'],
+                'train_end': fold['train_end'],
+                'train_samples': int(len(fold['train_idx'])),
+                'test_samples': int(len(fold['test_idx'])),
+                **fold_score
+            })
+            logger.info(f"Walk-forward fold {fold['test_period']}: accuracy {fold_score['accuracy']:.4f} "
+                        f"({len(fold['test_idx'])} matches)")
+
+        return fold_metrics
+
+    def _reporting_folds(self, folds, dates_train):
+        # Reported fold metrics stop boosting on the latest matches of each
+        # fold's training window, so the test period is only scored.
+        dates_train = np.asarray(dates_train)
+        reporting = []
+        for fold in folds:
+            train_idx = fold['train_idx']
+            n_stop = int(len(train_idx) * EARLY_STOPPING_FRACTION)
+            if n_stop == 0:
+                reporting.append((train_idx, fold['test_idx']))
+                continue
+            order = train_idx[np.argsort(dates_train[train_idx], kind='stable')]
+            reporting.append((np.sort(order[:-n_stop]), fold['test_idx'], np.sort(order[-n_stop:])))
+        return reporting
+
+    def _early_stopping_split(self, X_train, y_train, dates_train):
+        # The most recent matches (a random stratified share without dates)
+        # stop boosting early; the held-out validation set stays untouched.
+        n_stop = int(len(X_train) * EARLY_STOPPING_FRACTION)
+        if n_stop == 0:
+            return X_train, y_train, None, None
+
+        if dates_train is not None:
+            order = np.argsort(np.asarray(dates_train), kind='stable')
+            fit_idx, stop_idx = order[:-n_stop], order[-n_stop:]
+        else:
+            fit_idx, stop_idx = train_test_split(
+                np.arange(len(X_train)), test_size=n_stop, stratify=y_train,
+                random_state=self.training_config['random_seed']
+            )
+        return X_train.iloc[fit_idx], y_train.iloc[fit_idx], X_train.iloc[stop_idx], y_train.iloc[stop_idx]
+
+    def train_model(self, model_type, X_train, y_train, tune_hyperparameters=True, training_run_id=None,
+                    dates_train=None, budget=None, fold_cache=None):
         logger.info(f"Training {model_type} model")
+        budget = budget or self.cpu_budget
 
         model = ModelFactory.create_model(model_type)
+        X_fit, y_fit, X_stop, y_stop = self._early_stopping_split(X_train, y_train, dates_train)
 
         if tune_hyperparameters:
-            tuner = HyperparameterTuner(n_iter=500, cv=3)
-            best_params, best_score = tuner.tune(model, X_train, y_train)
-            model.train(X_train, y_train, best_params)
+            tuner = HyperparameterTuner(
+                n_iter=self.training_config.get('search_iterations') or DEFAULT_SEARCH_ITERATIONS,
+                cv=self._validation_splitter() if dates_train is not None else
+                   self.training_config.get('cross_validation_folds') or DEFAULT_CV_FOLDS,
+                random_state=self.training_config['random_seed'],
+                strategy=self.training_config.get('search_strategy') or DEFAULT_SEARCH_STRATEGY,
+                store=TuningStore(),
+                budget=budget
+            )
+            best_params, best_score = tuner.tune(model, X_train, y_train, self.feature_version,
+                                                 training_run_id, groups=dates_train, fold_cache=fold_cache)
         else:
-            model.train(X_train, y_train)
+            best_params = model.get_default_hyperparameters()
+
+        # The final fit gets the family's whole share of the budget.
+        best_params = {**best_params, **budget.thread_params(model.create_estimator(best_params), budget.total)}
+        model.train(X_fit, y_fit, best_params, X_stop, y_stop)
 
         return model
 
@@ -108,20 +254,24 @@ class ModelTrainer:
         logger.info(f"Model evaluation - Accuracy: {accuracy:.4f}, F1: {f1:.4f}")
         return metrics
 
-    def save_model_to_db(self, model, model_type, metrics, hyperparameters, feature_importance):
+    def save_model_to_db(self, model, model_type, metrics, hyperparameters, feature_importance,
+                         training_data_end=None, base_model_id=None, regressors=None, feature_columns=None):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         model_filename = f"{model_type.lower()}_{timestamp}.pkl"
         model_path = MODELS_DIR / model_filename
+        bundle_path = MODELS_DIR / f"{model_type.lower()}_{timestamp}_bundle.pkl"
 
         model.save_model(str(model_path))
+        ModelBundle(model, regressors, feature_columns).save(str(bundle_path))
 
         query = """
             INSERT INTO models
             (model_name, model_type, model_version, training_configuration_id,
              feature_configuration_id, hyperparameters, training_date,
              validation_accuracy, validation_metrics, model_file_path,
-             feature_importance, is_active, use_error_feedback)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+             feature_importance, is_active, use_error_feedback, training_data_end, base_model_id,
+             bundle_file_path, dataset_fingerprint, configuration_fingerprint)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             RETURNING id
         """
 
@@ -140,7 +290,12 @@ class ModelTrainer:
                 str(model_path),
                 json.dumps(feature_importance) if feature_importance else None,
                 False,
-                self.training_config.get('use_error_feedback', False)
+                self.training_config.get('use_error_feedback', False),
+                training_data_end,
+                base_model_id,
+                str(bundle_path),
+                self.dataset_fingerprint,
+                self.configuration_fingerprint
             ),
             fetch=True
         )
@@ -149,42 +304,200 @@ class ModelTrainer:
         logger.info(f"Model saved to database with ID: {model_id}")
         return model_id
 
-    def train_all_models(self, tune_hyperparameters=True, limit=None):
+    def _start_training_run(self, train_samples, validation_samples, validation_strategy):
+        query = """
+            INSERT INTO training_runs
+            (training_configuration_id, feature_configuration_id, start_time, status,
+             train_samples, validation_samples, validation_strategy)
+            VALUES (%s, %s, %s, 'running', %s, %s, %s)
+            RETURNING id
+        """
+        result = self.db.execute_query(
+            query,
+            (self.training_configuration_id, self.feature_configuration_id, datetime.now(),
+             train_samples, validation_samples, validation_strategy),
+            fetch=True
+        )
+        return result[0]['id']
+
+    def _finish_training_run(self, run_id, status, model_id=None, metrics=None, hyperparameters=None,
+                             feature_importance=None, error_log=None, fold_metrics=None):
+        query = """
+            UPDATE training_runs
+            SET model_id = %s, end_time = %s, status = %s, validation_metrics = %s,
+                best_hyperparameters = %s, feature_importance = %s, error_log = %s, fold_metrics = %s
+            WHERE id = %s
+        """
+        self.db.execute_query(
+            query,
+            (
+                model_id,
+                datetime.now(),
+                status,
+                json.dumps(metrics) if metrics else None,
+                json.dumps(hyperparameters) if hyperparameters else None,
+                json.dumps(feature_importance) if feature_importance else None,
+                error_log,
+                json.dumps(fold_metrics) if fold_metrics else None,
+                run_id
+            )
+        )
+
+    def _train_family(self, model_type, X_train, X_val, y_train, y_val, dates_train, tune_hyperparameters,
+                      validation_strategy, budget, training_data_end=None, fold_cache=None, regressors=None,
+                      target_metrics=None):
+        run_id = self._start_training_run(len(X_train), len(X_val), validation_strategy)
+        start = time.perf_counter()
+        try:
+            model = self.train_model(model_type, X_train, y_train, tune_hyperparameters, run_id, dates_train, budget,
+                                     fold_cache)
+            training_seconds = time.perf_counter() - start
+            metrics = self.evaluate_model(model, X_val, y_val)
+            feature_importance = model.get_feature_importance()
+            if model.best_iteration is not None:
+                metrics['best_iteration'] = int(model.best_iteration)
+
+            fold_metrics = None
+            if dates_train is not None:
+                fold_metrics = self.walk_forward_metrics(model, X_train, y_train, dates_train, budget, fold_cache)
+                metrics['walk_forward_accuracy'] = float(np.mean([fold['accuracy'] for fold in fold_metrics]))
+
+            metrics.update(target_metrics or {})
+            metrics['training_seconds'] = round(training_seconds, 2)
+            metrics['total_seconds'] = round(time.perf_counter() - start, 2)
+
+            model_id = self.save_model_to_db(
+                model,
+                model_type,
+                metrics,
+                model.best_params,
+                feature_importance,
+                training_data_end,
+                regressors=regressors,
+                feature_columns=list(X_train.columns)
+            )
+            self._finish_training_run(run_id, 'completed', model_id, metrics, model.best_params,
+                                      feature_importance, fold_metrics=fold_metrics)
+
+            logger.info(f"Completed training for {model_type} in {metrics['total_seconds']:.1f}s")
+
+            return {
+                'model_id': model_id,
+                'model_type': model_type,
+                'accuracy': metrics['accuracy'],
+                'metrics': metrics
+            }
+
+        except Exception as e:
+            logger.error(f"Error training {model_type}: {e}")
+            self._finish_training_run(run_id, 'failed', error_log=str(e))
+            return None
+
+    def _configuration_fingerprint(self, tune_hyperparameters, mode='full'):
+        # mode keeps continued models from standing in for a full run on the
+        # same data.
+        config = {key: value for key, value in self.training_config.items() if key not in ('created_at', 'updated_at')}
+        return config_fingerprint(config, self.feature_configuration_id, tune_hyperparameters,
+                                  ModelFactory.get_available_models(), mode)
+
+    def _find_trained_models(self):
+        # Only models whose training run completed; a job that died after
+        # saving a model does not count.
+        query = """
+            SELECT DISTINCT ON (m.model_type) m.id, m.model_type, m.validation_accuracy, m.validation_metrics,
+                   m.is_active
+            FROM models m
+            WHERE m.dataset_fingerprint = %s AND m.configuration_fingerprint = %s
+            AND EXISTS (
+                SELECT 1 FROM training_runs r WHERE r.model_id = m.id AND r.status = 'completed'
+            )
+            ORDER BY m.model_type, m.training_date DESC
+        """
+        return self.db.execute_query(query, (self.dataset_fingerprint, self.configuration_fingerprint), fetch=True)
+
+    def train_all_models(self, tune_hyperparameters=True, limit=None, force=False):
         logger.info("Starting training for all models")
 
-        X, y_winner, y_sets, y_games, feature_cols = self.prepare_data(limit=limit)
+        X, y_winner, y_sets, y_games, feature_cols, sample_info = self.prepare_data(limit=limit)
+        self.configuration_fingerprint = self._configuration_fingerprint(tune_hyperparameters)
+
+        # Same data and configuration as an existing model of every family:
+        # nothing to learn.
+        existing = [] if force else self._find_trained_models()
+        missing = set(ModelFactory.get_available_models()) - {row['model_type'] for row in existing}
+        if existing and missing:
+            logger.info(f"Training data unchanged but no model yet for {sorted(missing)}; retraining")
+        elif existing:
+            logger.info(f"Training data unchanged (fingerprint {self.dataset_fingerprint}); "
+                        f"skipping retraining, existing models: {[row['id'] for row in existing]}")
+            best = max(existing, key=lambda row: float(row['validation_accuracy']))
+            if not best['is_active']:
+                self._set_active_model(best['id'])
+            return [{
+                'model_id': row['id'],
+                'model_type': row['model_type'],
+                'accuracy': float(row['validation_accuracy']),
+                'metrics': row['validation_metrics'],
+                'skipped': True
+            } for row in existing]
+
+        targets = pd.DataFrame({'sets': y_sets, 'games': y_games})
+        return self._train_all(X, y_winner, targets, sample_info, tune_hyperparameters)
+
+    def train_target_regressors(self, X_train, y_train, targets_train, X_val, targets_val, dates_train,
+                                fold_cache):
+        # Sets and games regressors, trained once per job on the winner's
+        # training rows and early-stopping split.
+        start = time.perf_counter()
+        X_fit, _, X_stop, _ = self._early_stopping_split(X_train, y_train, dates_train)
+        regressors = train_target_regressors(
+            X_fit, targets_train.loc[X_fit.index],
+            X_stop, None if X_stop is None else targets_train.loc[X_stop.index],
+            n_jobs=self.cpu_budget.total
+        )
 
-        X_train, X_val, y_train, y_val = self.split_data(X, y_winner)
+        metrics = {}
+        for target, regressor in regressors.items():
+            metrics[f'{target}_mae'] = float(mean_absolute_error(targets_val[target], regressor.predict(X_val)))
+
+        if dates_train is not None:
+            folds = self._reporting_folds(self._validation_splitter().folds(dates_train), dates_train)
+            for target in regressors:
+                scores = run_folds(create_target_regressor(), {}, X_train, targets_train[target].to_numpy(), folds,
+                                   mean_absolute_error, self.cpu_budget, fold_cache, target)
+                metrics[f'walk_forward_{target}_mae'] = float(np.mean(scores))
+
+        metrics['target_seconds'] = round(time.perf_counter() - start, 2)
+        logger.info("Target regressors: " + ", ".join(f"{name} {value:.3f}" for name, value in metrics.items()))
+        return regressors, metrics
+
+    def _train_all(self, X, y_winner, targets, sample_info, tune_hyperparameters):
+        X_train, X_val, y_train, y_val, dates_train = self.split_data(X, y_winner, sample_info['date'])
+        validation_strategy = 'walk_forward' if dates_train is not None else 'random'
+        training_data_end = pd.Timestamp(sample_info['date'].loc[X_train.index].max()).date()
+        targets_train, targets_val = targets.loc[X_train.index], targets.loc[X_val.index]
+
+        # One quantized matrix per fold for the whole job: XGBoost tuning,
+        # fold metrics and the sets/games regressors all reuse it.
+        fold_cache = QuantileFoldCache(X_train, y_train, {target: targets_train[target] for target in targets})
+        regressors, target_metrics = self.train_target_regressors(
+            X_train, y_train, targets_train, X_val, targets_val, dates_train, fold_cache
+        )
 
+        # Families train side by side, each on an equal share of the CPU
+        # budget, so a new model adds little to the wall time of the run.
         model_types = ModelFactory.get_available_models()
-        results = []
-
-        for model_type in model_types:
-            try:
-                model = self.train_model(model_type, X_train, y_train, tune_hyperparameters)
-                metrics = self.evaluate_model(model, X_val, y_val)
-                feature_importance = model.get_feature_importance()
-
-                model_id = self.save_model_to_db(
-                    model,
-                    model_type,
-                    metrics,
-                    model.best_params,
-                    feature_importance
-                )
-
-                results.append({
-                    'model_id': model_id,
-                    'model_type': model_type,
-                    'accuracy': metrics['accuracy'],
-                    'metrics': metrics
-                })
-
-                logger.info(f"Completed training for {model_type}")
-
-            except Exception as e:
-                logger.error(f"Error training {model_type}: {e}")
-                continue
+        workers, threads = self.cpu_budget.split(len(model_types))
+        logger.info(f"Training {len(model_types)} model families ({workers} at a time, {threads} threads each)")
+
+        with self.cpu_budget.limit_native_threads(threads), ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._train_family, model_type, X_train, X_val, y_train, y_val, dates_train,
+                                tune_hyperparameters, validation_strategy, CPUBudget(threads), training_data_end,
+                                fold_cache, regressors, target_metrics)
+                for model_type in model_types
+            ]
+            results = [result for result in (future.result() for future in futures) if result]
 
         if results:
             best_model = max(results, key=lambda x: x['accuracy'])
@@ -193,6 +506,118 @@ class ModelTrainer:
 
         return results
 
+    def _load_active_model(self):
+        result = self.db.execute_query(
+            "SELECT * FROM models WHERE is_active = true ORDER BY training_date DESC LIMIT 1", fetch=True
+        )
+        return result[0] if result else None
+
+    def train_incremental(self, tune_hyperparameters=False, limit=None):
+        # Continues boosting the active model on matches played after its
+        # training data, and falls back to a full retrain when the new matches
+        # drifted or the continued model loses accuracy.
+        logger.info("Starting incremental training")
+
+        X, y_winner, y_sets, y_games, feature_cols, sample_info = self.prepare_data(limit=limit)
+        self.configuration_fingerprint = self._configuration_fingerprint(tune_hyperparameters, 'incremental')
+
+        def full_retrain(reason):
+            logger.warning(f"Falling back to a full retrain: {reason}")
+            self.configuration_fingerprint = self._configuration_fingerprint(tune_hyperparameters)
+            targets = pd.DataFrame({'sets': y_sets, 'games': y_games})
+            return self._train_all(X, y_winner, targets, sample_info, tune_hyperparameters)
+
+        active = self._load_active_model()
+        if active is None:
+            return full_retrain("no active model")
+
+        model = ModelFactory.create_model(active['model_type'])
+        if not model.supports_incremental:
+            return full_retrain(f"{active['model_type']} does not support incremental training")
+        model.load_model(active['model_file_path'])
+        model.best_params = active['hyperparameters']
+
+        dates = pd.to_datetime(sample_info['date']).to_numpy()
+        data_end = np.datetime64(active['training_data_end'] or active['training_date'].date())
+        reference_mask = (dates <= data_end) & (dates > data_end - np.timedelta64(INCREMENTAL_DRIFT_REFERENCE_DAYS, 'D'))
+        new_idx = np.flatnonzero(dates > data_end)
+        new_idx = new_idx[np.argsort(dates[new_idx], kind='stable')]
+
+        if len(new_idx) < INCREMENTAL_MIN_NEW_MATCHES:
+            logger.info(f"Only {len(new_idx)} new matches since {str(data_end)[:10]}; keeping model {active['id']}")
+            return []
+
+        drift = feature_drift(X.iloc[np.flatnonzero(reference_mask)], X.iloc[new_idx])
+        drift_feature = max(drift, key=drift.get)
+        if drift[drift_feature] > INCREMENTAL_MAX_DRIFT:
+            return full_retrain(f"feature drift on {drift_feature} (PSI {drift[drift_feature]:.3f})")
+
+        # The newest matches are the walk-forward holdout; the continued model
+        # only sees the ones before them.
+        n_holdout = max(1, int(len(new_idx) * INCREMENTAL_HOLDOUT_FRACTION))
+        fit_idx, holdout_idx = new_idx[:-n_holdout], new_idx[-n_holdout:]
+        X_holdout, y_holdout = X.iloc[holdout_idx], y_winner.iloc[holdout_idx]
+        baseline_accuracy = float(accuracy_score(y_holdout, model.predict(X_holdout)))
+
+        run_id = self._start_training_run(len(fit_idx), len(holdout_idx), 'incremental')
+        start = time.perf_counter()
+        try:
+            model.continue_training(
+                X.iloc[fit_idx], y_winner.iloc[fit_idx],
+                sample_weight=recency_weights(dates[fit_idx], INCREMENTAL_HALF_LIFE_DAYS),
+                n_jobs=self.cpu_budget.total
+            )
+            metrics = self.evaluate_model(model, X_holdout, y_holdout)
+            metrics.update({
+                'incremental': True,
+                'base_model_id': active['id'],
+                'new_matches': int(len(fit_idx)),
+                'baseline_accuracy': baseline_accuracy,
+                'max_feature_drift': round(drift[drift_feature], 4),
+                'training_seconds': round(time.perf_counter() - start, 2)
+            })
+            metrics['total_seconds'] = metrics['training_seconds']
+        except Exception as e:
+            logger.error(f"Error in incremental training of model {active['id']}: {e}")
+            self._finish_training_run(run_id, 'failed', error_log=str(e))
+            return full_retrain(str(e))
+
+        accuracy_drop = baseline_accuracy - metrics['accuracy']
+        if accuracy_drop > INCREMENTAL_MAX_ACCURACY_DROP:
+            reason = f"accuracy dropped by {accuracy_drop:.4f} on the holdout"
+            self._finish_training_run(run_id, 'rejected', metrics=metrics, error_log=reason)
+            return full_retrain(reason)
+
+        # The sets/games regressors of the active bundle carry over unchanged.
+        regressors = None
+        if active.get('bundle_file_path'):
+            regressors = ModelBundle.load(active['bundle_file_path']).regressors
+
+        model_id = self.save_model_to_db(
+            model,
+            active['model_type'],
+            metrics,
+            model.best_params,
+            model.get_feature_importance(),
+            pd.Timestamp(dates[fit_idx].max()).date(),
+            active['id'],
+            regressors=regressors,
+            feature_columns=list(X.columns)
+        )
+        self._finish_training_run(run_id, 'completed', model_id, metrics, model.best_params,
+                                  model.get_feature_importance())
+        self._set_active_model(model_id)
+
+        logger.info(f"Model {model_id} continued from {active['id']}: holdout accuracy {metrics['accuracy']:.4f} "
+                    f"(was {baseline_accuracy:.4f})")
+
+        return [{
+            'model_id': model_id,
+            'model_type': active['model_type'],
+            'accuracy': metrics['accuracy'],
+            'metrics': metrics
+        }]
+
     def _set_active_model(self, model_id):
         self.db.execute_query("UPDATE models SET is_active = false")
 
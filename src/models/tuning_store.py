@@ -0,0 +1,105 @@
+import json
+import hashlib
+from datetime import datetime
+from config.database import get_db
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def params_key(params):
+    return json.dumps(params, sort_keys=True, default=str)
+
+def search_key(model_type, strategy, search_space, n_iter, cv, random_state):
+    definition = [model_type, strategy, search_space, n_iter, cv, random_state]
+    return hashlib.sha1(json.dumps(definition, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+class TuningStore:
+    def __init__(self):
+        self.db = get_db()
+
+    def start_search(self, model_type, strategy, feature_version, dataset_version, key, training_run_id=None):
+        query = """
+            SELECT id FROM tuning_searches
+            WHERE search_key = %s AND dataset_version = %s AND status = 'running'
+            ORDER BY started_at DESC
+            LIMIT 1
+        """
+        existing = self.db.execute_query(query, (key, dataset_version), fetch=True)
+        if existing:
+            search_id = existing[0]['id']
+            logger.info(f"Resuming interrupted tuning search {search_id}")
+            return search_id, True
+
+        # A running search over other data can never be resumed.
+        self.db.execute_query(
+            "UPDATE tuning_searches SET status = 'abandoned' WHERE model_type = %s AND status = 'running'",
+            (model_type,)
+        )
+
+        query = """
+            INSERT INTO tuning_searches
+            (training_run_id, model_type, strategy, feature_version, dataset_version, search_key, status)
+            VALUES (%s, %s, %s, %s, %s, %s, 'running')
+            RETURNING id
+        """
+        result = self.db.execute_query(
+            query,
+            (training_run_id, model_type, strategy, feature_version, dataset_version, key),
+            fetch=True
+        )
+        return result[0]['id'], False
+
+    def load_trials(self, search_id):
+        query = """
+            SELECT trial_number, params, params_key, n_samples, fold_scores, mean_score, fit_seconds, status
+            FROM tuning_trials
+            WHERE search_id = %s
+            ORDER BY trial_number
+        """
+        return self.db.execute_query(query, (search_id,), fetch=True)
+
+    def record_trial(self, search_id, trial_number, params, n_samples, fold_scores, fit_seconds, status):
+        query = """
+            INSERT INTO tuning_trials
+            (search_id, trial_number, params, params_key, n_samples, fold_scores, mean_score, fit_seconds, status)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (search_id, params_key, n_samples) DO UPDATE SET
+                fold_scores = EXCLUDED.fold_scores,
+                mean_score = EXCLUDED.mean_score,
+                fit_seconds = EXCLUDED.fit_seconds,
+                status = EXCLUDED.status
+        """
+        mean_score = sum(fold_scores) / len(fold_scores) if fold_scores else None
+        self.db.execute_query(
+            query,
+            (
+                search_id, trial_number, json.dumps(params, default=str), params_key(params), n_samples,
+                json.dumps(fold_scores), mean_score, fit_seconds, status
+            )
+        )
+
+    def best_prior_params(self, model_type, feature_version, limit, exclude_search_id=None):
+        # Best full-data trials of earlier searches for the same model and features.
+        query = """
+            SELECT t.params, MAX(t.mean_score) AS mean_score
+            FROM tuning_trials t
+            JOIN tuning_searches s ON t.search_id = s.id
+            WHERE s.model_type = %s
+            AND s.feature_version = %s
+            AND s.id <> %s
+            AND t.status = 'complete'
+            AND t.n_samples = (SELECT MAX(n_samples) FROM tuning_trials WHERE search_id = s.id)
+            GROUP BY t.params
+            ORDER BY mean_score DESC
+            LIMIT %s
+        """
+        rows = self.db.execute_query(query, (model_type, feature_version, exclude_search_id or 0, limit), fetch=True)
+        return [row['params'] for row in rows]
+
+    def finish_search(self, search_id, best_params, best_score):
+        query = """
+            UPDATE tuning_searches
+            SET status = 'complete', best_params = %s, best_score = %s, finished_at = %s
+            WHERE id = %s
+        """
+        self.db.execute_query(query, (json.dumps(best_params, default=str), best_score, datetime.now(), search_id))
@@ -0,0 +1,107 @@
+import time
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from src.utils.cpu_budget import CPUBudget
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+WALK_FORWARD_PERIODS = ['month', 'season']
+WALK_FORWARD_WINDOWS = ['expanding', 'sliding']
+
+def _take(data, indices):
+    return data.iloc[indices] if hasattr(data, 'iloc') else data[indices]
+
+def period_labels(dates, period):
+    dates = pd.to_datetime(pd.Series(np.asarray(dates)))
+    if period == 'season':
+        return dates.dt.year.to_numpy()
+    return (dates.dt.year * 12 + dates.dt.month - 1).to_numpy()
+
+def format_period(label, period):
+    if period == 'season':
+        return str(label)
+    return f"{label // 12}-{label % 12 + 1:02d}"
+
+class WalkForwardSplitter:
+    # Folds test on each of the last n_splits periods (months or seasons) and
+    # train only on earlier ones. groups carries the sample dates.
+    def __init__(self, n_splits=6, period='month', window='expanding', train_periods=None, gap_periods=0):
+        if period not in WALK_FORWARD_PERIODS:
+            raise ValueError(f"Unknown walk-forward period: {period}")
+        if window not in WALK_FORWARD_WINDOWS:
+            raise ValueError(f"Unknown walk-forward window: {window}")
+        if window == 'sliding' and not train_periods:
+            raise ValueError("A sliding walk-forward window needs train_periods")
+
+        self.n_splits = n_splits
+        self.period = period
+        self.window = window
+        self.train_periods = train_periods
+        self.gap_periods = gap_periods
+
+    def __repr__(self):
+        return (f"WalkForwardSplitter(n_splits={self.n_splits}, period='{self.period}', window='{self.window}', "
+                f"train_periods={self.train_periods}, gap_periods={self.gap_periods})")
+
+    def get_n_splits(self, X=None, y=None, groups=None):
+        return self.n_splits
+
+    def folds(self, groups):
+        labels = period_labels(groups, self.period)
+        periods = np.unique(labels)
+        min_train = self.train_periods or 1
+        if len(periods) < self.n_splits + min_train + self.gap_periods:
+            raise ValueError(f"Only {len(periods)} {self.period}s of data for {self.n_splits} walk-forward folds")
+
+        folds = []
+        for test_period in periods[-self.n_splits:]:
+            train_end = test_period - self.gap_periods
+            train_mask = labels < train_end
+            if self.window == 'sliding':
+                train_mask &= labels >= train_end - self.train_periods
+            train_idx = np.flatnonzero(train_mask)
+            test_idx = np.flatnonzero(labels == test_period)
+            if len(train_idx) and len(test_idx):
+                folds.append({
+                    'train_idx': train_idx,
+                    'test_idx': test_idx,
+                    'test_period': format_period(test_period, self.period),
+                    'train_start': format_period(labels[train_idx].min(), self.period),
+                    'train_end': format_period(labels[train_idx].max(), self.period)
+                })
+        return folds
+
+    def split(self, X=None, y=None, groups=None):
+        if groups is None:
+            raise ValueError("WalkForwardSplitter needs the sample dates as groups")
+        for fold in self.folds(groups):
+            yield fold['train_idx'], fold['test_idx']
+
+def run_fold_tasks(estimator, X, y, tasks, scorer, budget=None, fold_cache=None, target=None):
+    # tasks are (params, train_idx, test_idx), optionally followed by the
+    # stop_idx rows that stop boosting instead of the test fold. Each fit gets
+    # an equal share of the CPU budget through the estimator's thread
+    # parameter. scorer is called with (y_true, y_pred). target picks a label
+    # set of the fold cache, and y must then hold the same labels.
+    budget = budget or CPUBudget()
+
+    def fit_and_score(threads, params, train_idx, test_idx, stop_idx=None):
+        model = clone(estimator).set_params(**{**params, **budget.thread_params(estimator, threads)})
+        start = time.perf_counter()
+        if fold_cache is not None:
+            y_pred = fold_cache.fit_predict(model, train_idx, test_idx, threads, target, stop_idx)
+        else:
+            if stop_idx is not None:
+                train_idx = np.sort(np.concatenate([train_idx, stop_idx]))
+            model.fit(_take(X, train_idx), _take(y, train_idx))
+            y_pred = model.predict(_take(X, test_idx))
+        fit_seconds = time.perf_counter() - start
+        return scorer(_take(y, test_idx), y_pred), fit_seconds
+
+    return budget.run(fit_and_score, tasks)
+
+def run_folds(estimator, params, X, y, folds, scorer, budget=None, fold_cache=None, target=None):
+    tasks = [(params, *fold) for fold in folds]
+    return [score for score, _ in run_fold_tasks(estimator, X, y, tasks, scorer, budget, fold_cache, target)]
@@ -2,7 +2,8 @@ import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 from config.database import get_db
-from src.utils.database_utils import get_or_create_player, get_or_create_tournament
+from src.data.stat_refresh_worker import StatRefreshWorker
+from src.utils.database_utils import get_or_create_player, get_or_create_tournament, ensure_year_partition
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -10,6 +11,7 @@ logger = get_logger(__name__)
 class MatchFetcher:
     def __init__(self):
         self.db = get_db()
+        self.refresh_worker = StatRefreshWorker()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
@@ -58,6 +60,7 @@ class MatchFetcher:
 
     def save_scheduled_matches(self, matches_data):
         saved_count = 0
+        refresh_requests = []
 
         for match in matches_data:
             try:
@@ -87,6 +90,8 @@ class MatchFetcher:
                     logger.debug(f"Match already exists: {match['player_1']} vs {match['player_2']}")
                     continue
 
+                ensure_year_partition('matches', match['date'].year)
+
                 insert_query = """
                     INSERT INTO matches
                     (tournament_id, date, round_id, court_type_id, surface_id,
@@ -104,33 +109,31 @@ class MatchFetcher:
 
                 if result:
                     saved_count += 1
+                    refresh_requests.append((player_1_id, surface_id))
+                    refresh_requests.append((player_2_id, surface_id))
                     logger.info(f"Saved scheduled match: {match['player_1']} vs {match['player_2']}")
 
             except Exception as e:
                 logger.error(f"Error saving match: {e}")
                 continue
 
+        self.refresh_worker.enqueue_players(refresh_requests, reason="scheduled_match")
+
         return saved_count
 
     def _get_surface_id(self, surface_name):
-        query = "SELECT id FROM surfaces WHERE name = %s"
-        result = self.db.execute_query(query, (surface_name,), fetch=True)
+        result = self.db.execute_prepared('surface_id_by_name', (surface_name,))
         return result[0]['id'] if result else 1
 
     def _get_court_type_id(self, court_type_name):
-        query = "SELECT id FROM court_types WHERE name = %s"
-        result = self.db.execute_query(query, (court_type_name,), fetch=True)
+        result = self.db.execute_prepared('court_type_id_by_name', (court_type_name,))
         return result[0]['id'] if result else 2
 
     def _get_round_id(self, round_name):
-        query = "SELECT id FROM rounds WHERE name = %s"
-        result = self.db.execute_query(query, (round_name,), fetch=True)
+        result = self.db.execute_prepared('round_id_by_name', (round_name,))
         return result[0]['id'] if result else 1
 
     def create_sample_match_for_testing(self):
-        from src.data.sports_mood_calculator import SportsMoodCalculator
-        from src.data.surface_history_calculator import SurfaceHistoryCalculator
-
         today = datetime.now().date()
 
         sample_match = {
@@ -149,30 +152,10 @@ class MatchFetcher:
         matches = [sample_match]
         saved = self.save_scheduled_matches(matches)
 
-        if saved > 0:
-            player_1_id = get_or_create_player(sample_match['player_1'])
-            player_2_id = get_or_create_player(sample_match['player_2'])
-
-            logger.info("Calculating stats for sample players...")
-
-            sports_mood_calc = SportsMoodCalculator()
-            sports_mood_calc.update_player_sports_mood(player_1_id)
-            sports_mood_calc.update_player_sports_mood(player_2_id)
-
-            surface_calc = SurfaceHistoryCalculator()
-            surface_id = self._get_surface_id(sample_match['surface'])
-            surface_calc.update_player_surface_history(player_1_id, surface_id)
-            surface_calc.update_player_surface_history(player_2_id, surface_id)
-
-            logger.info("Stats calculated for sample players")
-
         logger.info(f"Created {saved} sample match(es) for testing")
         return saved
 
     def create_todays_real_matches(self):
-        from src.data.sports_mood_calculator import SportsMoodCalculator
-        from src.data.surface_history_calculator import SurfaceHistoryCalculator
-
         today = datetime.now().date()
 
         real_matches = [
@@ -204,24 +187,5 @@ class MatchFetcher:
 
         saved = self.save_scheduled_matches(real_matches)
 
-        if saved > 0:
-            sports_mood_calc = SportsMoodCalculator()
-            surface_calc = SurfaceHistoryCalculator()
-
-            for match in real_matches:
-                player_1_id = get_or_create_player(match['player_1'])
-                player_2_id = get_or_create_player(match['player_2'])
-
-                logger.info(f"Calculating stats for {match['player_1']} and {match['player_2']}...")
-
-                sports_mood_calc.update_player_sports_mood(player_1_id)
-                sports_mood_calc.update_player_sports_mood(player_2_id)
-
-                surface_id = self._get_surface_id(match['surface'])
-                surface_calc.update_player_surface_history(player_1_id, surface_id)
-                surface_calc.update_player_surface_history(player_2_id, surface_id)
-
-            logger.info("Stats calculated for all players")
-
         logger.info(f"Created {saved} real match(es) for today")
         return saved
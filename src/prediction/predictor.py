@@ -1,21 +1,77 @@
 import json
+import asyncio
 import pandas as pd
 from datetime import datetime
 from config.database import get_db
+from config.async_database import get_async_db
 from src.models.model_factory import ModelFactory
 from src.models.feature_engineer import FeatureEngineer
+from src.models.model_bundle import ModelBundle
 from src.prediction.match_fetcher import MatchFetcher
+from src.data.stat_refresh_worker import StatRefreshWorker
+from src.utils.database_utils import ensure_year_partition
 from src.utils.date_utils import get_today
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Used for models saved before sets/games regressors were bundled.
+DEFAULT_PREDICTED_SETS = 3
+DEFAULT_PREDICTED_GAMES = 20
+
+TODAYS_MATCHES_QUERY = """
+SELECT
+    m.id as match_id,
+    m.date,
+    m.tournament_id,
+    m.player_1_id,
+    m.player_2_id,
+    m.surface_id,
+    m.court_type_id,
+    m.round_id,
+    t.series as tournament_series,
+    t.name as tournament_name,
+    p1.name as player_1_name,
+    p2.name as player_2_name,
+    p1.current_rank as rank_1,
+    p2.current_rank as rank_2,
+    p1.current_points as pts_1,
+    p2.current_points as pts_2,
+    ps1.sports_mood_score as player_1_sports_mood,
+    ps1.personal_mood_score as player_1_personal_mood,
+    ps2.sports_mood_score as player_2_sports_mood,
+    ps2.personal_mood_score as player_2_personal_mood,
+    sh1.win_rate as player_1_surface_win_rate,
+    sh2.win_rate as player_2_surface_win_rate
+FROM matches m
+JOIN tournaments t ON m.tournament_id = t.id
+JOIN players p1 ON m.player_1_id = p1.id
+JOIN players p2 ON m.player_2_id = p2.id
+LEFT JOIN player_stats ps1 ON m.player_1_id = ps1.player_id
+LEFT JOIN player_stats ps2 ON m.player_2_id = ps2.player_id
+LEFT JOIN surface_history sh1 ON m.player_1_id = sh1.player_id AND m.surface_id = sh1.surface_id
+LEFT JOIN surface_history sh2 ON m.player_2_id = sh2.player_id AND m.surface_id = sh2.surface_id
+WHERE m.date = %s
+AND m.winner_id IS NULL
+AND t.series = ANY(%s)
+"""
+
+SAVE_PREDICTIONS_QUERY = """
+    INSERT INTO predictions
+    (model_id, match_date, tournament_id, player_1_id, player_2_id,
+     predicted_winner_id, predicted_total_sets, predicted_total_games,
+     winner_probability, confidence_score, prediction_timestamp)
+    VALUES %s
+    RETURNING id
+"""
+
 class Predictor:
     def __init__(self):
         self.db = get_db()
         self.active_model = None
         self.feature_engineer = None
         self.match_fetcher = MatchFetcher()
+        self.refresh_worker = StatRefreshWorker()
 
     def load_active_model(self):
         query = """
@@ -34,12 +90,17 @@ class Predictor:
         model_data = result[0]
         logger.info(f"Loading model: {model_data['model_type']} (ID: {model_data['id']})")
 
-        model = ModelFactory.create_model(model_data['model_type'])
-        model.load_model(model_data['model_file_path'])
+        if model_data.get('bundle_file_path'):
+            bundle = ModelBundle.load(model_data['bundle_file_path'])
+        else:
+            model = ModelFactory.create_model(model_data['model_type'])
+            model.load_model(model_data['model_file_path'])
+            bundle = ModelBundle(model)
 
         self.active_model = {
             'id': model_data['id'],
-            'model': model,
+            'model': bundle.model,
+            'bundle': bundle,
             'model_data': model_data
         }
 
@@ -47,61 +108,40 @@ class Predictor:
 
         return self.active_model
 
-    def get_todays_matches(self, min_series=["ATP500", "Masters 1000", "Grand Slam"]):
-        today = get_today()
-
+    def refresh_todays_player_stats(self, min_series=["ATP500", "Masters 1000", "Grand Slam"]):
         query = """
-            SELECT
-                m.id as match_id,
-                m.date,
-                m.tournament_id,
-                m.player_1_id,
-                m.player_2_id,
-                m.surface_id,
-                m.court_type_id,
-                m.round_id,
-                t.series as tournament_series,
-                t.name as tournament_name,
-                p1.name as player_1_name,
-                p2.name as player_2_name,
-                p1.current_rank as rank_1,
-                p2.current_rank as rank_2,
-                p1.current_points as pts_1,
-                p2.current_points as pts_2,
-                ps1.sports_mood_score as player_1_sports_mood,
-                ps1.personal_mood_score as player_1_personal_mood,
-                ps2.sports_mood_score as player_2_sports_mood,
-                ps2.personal_mood_score as player_2_personal_mood,
-                sh1.win_rate as player_1_surface_win_rate,
-                sh2.win_rate as player_2_surface_win_rate
-            FROM matches m
-            JOIN tournaments t ON m.tournament_id = t.id
-            JOIN players p1 ON m.player_1_id = p1.id
-            JOIN players p2 ON m.player_2_id = p2.id
-            LEFT JOIN player_stats ps1 ON m.player_1_id = ps1.player_id
-            LEFT JOIN player_stats ps2 ON m.player_2_id = ps2.player_id
-            LEFT JOIN surface_history sh1 ON m.player_1_id = sh1.player_id AND m.surface_id = sh1.surface_id
-            LEFT JOIN surface_history sh2 ON m.player_2_id = sh2.player_id AND m.surface_id = sh2.surface_id
-            WHERE m.date = %s
-            AND m.winner_id IS NULL
-            AND t.series = ANY(%s)
+            SELECT DISTINCT player_id FROM (
+                SELECT m.player_1_id as player_id, m.tournament_id
+                FROM matches m
+                WHERE m.date = %s AND m.winner_id IS NULL
+                UNION ALL
+                SELECT m.player_2_id, m.tournament_id
+                FROM matches m
+                WHERE m.date = %s AND m.winner_id IS NULL
+            ) draw
+            JOIN tournaments t ON draw.tournament_id = t.id
+            WHERE t.series = ANY(%s)
         """
 
-        matches = self.db.execute_query(query, (today, min_series), fetch=True)
-        logger.info(f"Found {len(matches)} matches for today ({today})")
+        today = get_today()
+        players = self.db.execute_query(query, (today, today, min_series), fetch=True)
+        player_ids = [p['player_id'] for p in players]
 
-        if not matches:
-            return None
+        if not player_ids:
+            return 0
 
-        df = pd.DataFrame(matches)
+        refreshed, errors = self.refresh_worker.refresh_players(player_ids)
+        logger.info(f"Refreshed pending stats for {refreshed} of {len(player_ids)} players in today's draw ({errors} errors)")
+        return refreshed
 
-        decimal_cols = ['player_1_sports_mood', 'player_2_sports_mood',
-                       'player_1_personal_mood', 'player_2_personal_mood',
-                       'player_1_surface_win_rate', 'player_2_surface_win_rate']
+    def get_todays_matches(self, min_series=["ATP500", "Masters 1000", "Grand Slam"]):
+        today = get_today()
 
-        for col in decimal_cols:
-            if col in df.columns:
-                df[col] = df[col].apply(lambda x: float(x) if x is not None else None)
+        df = self.db.read_frame(TODAYS_MATCHES_QUERY, (today, min_series))
+        logger.info(f"Found {len(df)} matches for today ({today})")
+
+        if df.empty:
+            return None
 
         return df
 
@@ -114,94 +154,152 @@ class Predictor:
 
         return X
 
-    def predict_match(self, match_data):
+    def predict_matches(self, matches_df):
+        # One feature pass and one bundle call score winner, sets and games
+        # for every match.
         if not self.active_model:
             self.load_active_model()
 
-        match_df = pd.DataFrame([match_data])
-        X = self.prepare_match_features(match_df)
-
-        model = self.active_model['model']
-        prediction = model.predict(X)[0]
-        probabilities = model.predict_proba(X)[0]
+        matches_df = matches_df.reset_index(drop=True)
+        X = self.prepare_match_features(matches_df.copy())
+        scores = self.active_model['bundle'].predict(X)
 
-        predicted_winner_id = match_data['player_1_id'] if prediction == 1 else match_data['player_2_id']
-        winner_probability = probabilities[1] if prediction == 1 else probabilities[0]
+        predictions = []
+        for i, match_data in enumerate(matches_df.to_dict('records')):
+            player_1_wins = scores['winner'][i] == 1
+            player_1_probability = float(scores['winner_probability'][i])
+
+            predictions.append({
+                'predicted_winner_id': match_data['player_1_id'] if player_1_wins else match_data['player_2_id'],
+                'predicted_total_sets': int(scores['sets'][i]) if 'sets' in scores else DEFAULT_PREDICTED_SETS,
+                'predicted_total_games': int(scores['games'][i]) if 'games' in scores else DEFAULT_PREDICTED_GAMES,
+                'winner_probability': player_1_probability if player_1_wins else 1 - player_1_probability,
+                'confidence_score': max(player_1_probability, 1 - player_1_probability)
+            })
 
-        predicted_sets = 3
-        predicted_games = 20
+        return predictions
 
-        return {
-            'predicted_winner_id': predicted_winner_id,
-            'predicted_total_sets': predicted_sets,
-            'predicted_total_games': predicted_games,
-            'winner_probability': float(winner_probability),
-            'confidence_score': float(max(probabilities))
-        }
+    def predict_match(self, match_data):
+        return self.predict_matches(pd.DataFrame([match_data]))[0]
+
+    def _prediction_row(self, match_data, prediction):
+        return (
+            self.active_model['id'],
+            match_data['date'],
+            match_data['tournament_id'],
+            match_data['player_1_id'],
+            match_data['player_2_id'],
+            prediction['predicted_winner_id'],
+            prediction['predicted_total_sets'],
+            prediction['predicted_total_games'],
+            prediction['winner_probability'],
+            prediction['confidence_score'],
+            datetime.now()
+        )
 
-    def save_prediction(self, match_data, prediction):
-        query = """
-            INSERT INTO predictions
-            (model_id, match_date, tournament_id, player_1_id, player_2_id,
-             predicted_winner_id, predicted_total_sets, predicted_total_games,
-             winner_probability, confidence_score, prediction_timestamp)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-        """
+    def save_predictions(self, predicted_matches):
+        rows = [self._prediction_row(match_data, prediction) for match_data, prediction in predicted_matches]
+        for year in {row[1].year for row in rows}:
+            ensure_year_partition('predictions', year)
+        result = self.db.execute_values(SAVE_PREDICTIONS_QUERY, rows, fetch=True)
 
-        result = self.db.execute_query(
-            query,
-            (
-                self.active_model['id'],
-                match_data['date'],
-                match_data['tournament_id'],
-                match_data['player_1_id'],
-                match_data['player_2_id'],
-                prediction['predicted_winner_id'],
-                prediction['predicted_total_sets'],
-                prediction['predicted_total_games'],
-                prediction['winner_probability'],
-                prediction['confidence_score'],
-                datetime.now()
-            ),
-            fetch=True
-        )
+        prediction_ids = [row['id'] for row in result]
+        logger.info(f"Saved {len(prediction_ids)} predictions")
+        return prediction_ids
 
-        prediction_id = result[0]['id']
+    def save_prediction(self, match_data, prediction):
+        prediction_id = self.save_predictions([(match_data, prediction)])[0]
         logger.info(f"Prediction saved with ID: {prediction_id}")
         return prediction_id
 
+    def _predict_matches(self, matches_df):
+        try:
+            predictions = self.predict_matches(matches_df)
+            return list(zip(matches_df.to_dict('records'), predictions))
+        except Exception as e:
+            logger.error(f"Batched prediction failed, predicting matches one by one: {e}")
+
+        predicted_matches = []
+        for idx, match in matches_df.iterrows():
+            try:
+                match_data = match.to_dict()
+                predicted_matches.append((match_data, self.predict_match(match_data)))
+            except Exception as e:
+                logger.error(f"Error predicting match {match['match_id']}: {e}")
+                continue
+
+        return predicted_matches
+
+    def _summarize_predictions(self, prediction_ids, predicted_matches):
+        predictions = []
+        for prediction_id, (match, prediction) in zip(prediction_ids, predicted_matches):
+            predictions.append({
+                'prediction_id': prediction_id,
+                'match': f"{match['player_1_name']} vs {match['player_2_name']}",
+                'tournament': match['tournament_name'],
+                'predicted_winner': match['player_1_name'] if prediction['predicted_winner_id'] == match['player_1_id'] else match['player_2_name'],
+                'confidence': prediction['confidence_score']
+            })
+
+            logger.info(f"Predicted: {predictions[-1]['match']} -> {predictions[-1]['predicted_winner']}")
+
+        logger.info(f"Completed {len(predictions)} predictions")
+        return predictions
+
     def predict_all_today(self):
         logger.info("Starting predictions for today's matches")
 
         self.load_active_model()
 
+        self.refresh_todays_player_stats()
         matches_df = self.get_todays_matches()
 
         if matches_df is None or len(matches_df) == 0:
             logger.info("No matches found for today")
             return []
 
-        predictions = []
+        predicted_matches = self._predict_matches(matches_df)
+        prediction_ids = self.save_predictions(predicted_matches)
 
-        for idx, match in matches_df.iterrows():
-            try:
-                prediction = self.predict_match(match.to_dict())
-                prediction_id = self.save_prediction(match.to_dict(), prediction)
+        return self._summarize_predictions(prediction_ids, predicted_matches)
 
-                predictions.append({
-                    'prediction_id': prediction_id,
-                    'match': f"{match['player_1_name']} vs {match['player_2_name']}",
-                    'tournament': match['tournament_name'],
-                    'predicted_winner': match['player_1_name'] if prediction['predicted_winner_id'] == match['player_1_id'] else match['player_2_name'],
-                    'confidence': prediction['confidence_score']
-                })
+    async def get_todays_matches_async(self, min_series=["ATP500", "Masters 1000", "Grand Slam"]):
+        today = get_today()
 
-                logger.info(f"Predicted: {predictions[-1]['match']} -> {predictions[-1]['predicted_winner']}")
+        df = await get_async_db().read_frame(TODAYS_MATCHES_QUERY, (today, min_series))
+        logger.info(f"Found {len(df)} matches for today ({today})")
 
-            except Exception as e:
-                logger.error(f"Error predicting match {match['match_id']}: {e}")
-                continue
+        if df.empty:
+            return None
 
-        logger.info(f"Completed {len(predictions)} predictions")
-        return predictions
+        return df
+
+    async def save_predictions_async(self, predicted_matches):
+        rows = [self._prediction_row(match_data, prediction) for match_data, prediction in predicted_matches]
+        for year in {row[1].year for row in rows}:
+            await asyncio.to_thread(ensure_year_partition, 'predictions', year)
+        result = await get_async_db().execute_values(SAVE_PREDICTIONS_QUERY, rows, fetch=True)
+
+        prediction_ids = [row['id'] for row in result]
+        logger.info(f"Saved {len(prediction_ids)} predictions")
+        return prediction_ids
+
+    async def predict_all_today_async(self):
+        logger.info("Starting predictions for today's matches (async)")
+
+        # Model loading and the stat refresh are blocking; run them side by side.
+        # A model the caller already loaded is kept.
+        blocking = [asyncio.to_thread(self.refresh_todays_player_stats)]
+        if not self.active_model:
+            blocking.append(asyncio.to_thread(self.load_active_model))
+        await asyncio.gather(*blocking)
+        matches_df = await self.get_todays_matches_async()
+
+        if matches_df is None or len(matches_df) == 0:
+            logger.info("No matches found for today")
+            return []
+
+        predicted_matches = await asyncio.to_thread(self._predict_matches, matches_df)
+        prediction_ids = await self.save_predictions_async(predicted_matches)
+
+        return self._summarize_predictions(prediction_ids, predicted_matches)
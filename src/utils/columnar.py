@@ -0,0 +1,78 @@
+import datetime
+import pandas as pd
+from pandas.api.types import is_integer_dtype, is_bool_dtype, is_object_dtype
+
+BOOL_OIDS = {16}
+INTEGER_OIDS = {20, 21, 23, 26}
+FLOAT_OIDS = {700, 701, 1700}
+DATETIME_OIDS = {1082, 1114, 1184}
+
+def frame_from_csv(buffer, columns):
+    names = [name for name, _ in columns]
+    dtypes = {}
+    for name, type_code in columns:
+        if type_code in FLOAT_OIDS:
+            dtypes[name] = 'float64'
+        elif type_code in INTEGER_OIDS:
+            dtypes[name] = 'Int64'
+        else:
+            dtypes[name] = 'object'
+
+    if not buffer.getvalue():
+        return pd.DataFrame({
+            name: pd.Series(dtype='float64' if type_code in FLOAT_OIDS | INTEGER_OIDS else 'object')
+            for name, type_code in columns
+        })
+
+    frame = pd.read_csv(
+        buffer,
+        names=names,
+        header=None,
+        dtype=dtypes,
+        keep_default_na=False,
+        na_values=['']
+    )
+
+    for name, type_code in columns:
+        column = frame[name]
+        if type_code in INTEGER_OIDS:
+            # Plain int64 when the column has no NULLs, float64 with NaN otherwise,
+            # matching what the models expect from pandas' own inference.
+            frame[name] = column.astype('int64') if not column.isna().any() else column.astype('float64')
+        elif type_code in BOOL_OIDS:
+            column = column.map({'t': True, 'f': False})
+            frame[name] = column.astype(bool) if not column.isna().any() else column
+        elif type_code in DATETIME_OIDS:
+            frame[name] = pd.to_datetime(column, utc=type_code == 1184)
+
+    return frame
+
+def normalize_frame(frame):
+    # Bring frames from other engines to the dtypes frame_from_csv produces.
+    for name in frame.columns:
+        column = frame[name]
+        if is_integer_dtype(column.dtype) or is_bool_dtype(column.dtype):
+            if column.isna().any():
+                frame[name] = column.astype('float64') if is_integer_dtype(column.dtype) else column.astype(object)
+            else:
+                frame[name] = column.astype('int64') if is_integer_dtype(column.dtype) else column.astype(bool)
+        elif is_object_dtype(column.dtype):
+            sample = column.dropna()
+            if len(sample) and isinstance(sample.iloc[0], datetime.date):
+                frame[name] = pd.to_datetime(column)
+        elif str(column.dtype).startswith('datetime64') and str(column.dtype) != 'datetime64[ns]' and 'UTC' not in str(column.dtype):
+            frame[name] = column.astype('datetime64[ns]')
+    return frame
+
+def convert_frame(frame, output):
+    if output == 'pandas':
+        return frame
+    if output == 'numpy':
+        return {name: frame[name].to_numpy() for name in frame.columns}
+    if output == 'arrow':
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("pyarrow is required for output='arrow' (pip install pyarrow)")
+        return pa.Table.from_pandas(frame, preserve_index=False)
+    raise ValueError(f"Unknown columnar output: {output}")
@@ -0,0 +1,55 @@
+from contextlib import contextmanager
+from joblib import Parallel, delayed
+from config.settings import TRAINING_CPU_BUDGET, TRAINING_OUTER_WORKERS
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+THREAD_PARAMS = ['n_jobs', 'nthread', 'thread_count']
+
+class CPUBudget:
+    # Splits a fixed number of cores between outer workers (folds, search
+    # candidates, feature chunks) and the threads each of them may use, so
+    # outer x inner never exceeds the budget.
+    def __init__(self, total=None, outer_workers=None):
+        self.total = max(1, total or TRAINING_CPU_BUDGET)
+        self.outer_workers = outer_workers if outer_workers is not None else TRAINING_OUTER_WORKERS
+
+    def __repr__(self):
+        return f"CPUBudget(total={self.total}, outer_workers={self.outer_workers or 'auto'})"
+
+    def split(self, n_tasks):
+        workers = self.outer_workers or n_tasks
+        workers = max(1, min(workers, n_tasks, self.total))
+        return workers, max(1, self.total // workers)
+
+    def thread_params(self, estimator, threads):
+        params = estimator.get_params()
+        return {name: threads for name in THREAD_PARAMS if name in params}
+
+    @contextmanager
+    def limit_native_threads(self, threads):
+        # Caps the BLAS/OpenMP pools that NumPy, SciPy and scikit-learn start
+        # on their own; threadpoolctl ships with scikit-learn. The limit is
+        # process-wide, so set it once around the outermost parallel section,
+        # never from threads that run side by side.
+        try:
+            from threadpoolctl import threadpool_limits
+        except ImportError:
+            yield
+            return
+        with threadpool_limits(limits=threads):
+            yield
+
+    def run(self, func, tasks):
+        # func(threads, *task) for every task, in threads (the boosters and
+        # NumPy release the GIL).
+        tasks = list(tasks)
+        if not tasks:
+            return []
+        workers, threads = self.split(len(tasks))
+        if workers == 1:
+            return [func(threads, *task) for task in tasks]
+        return Parallel(n_jobs=workers, prefer='threads')(
+            delayed(func)(threads, *task) for task in tasks
+        )
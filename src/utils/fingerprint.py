@@ -0,0 +1,21 @@
+import json
+import hashlib
+import pandas as pd
+
+def frame_fingerprint(*frames):
+    digest = hashlib.sha1()
+    for frame in frames:
+        columns = list(frame.columns) if isinstance(frame, pd.DataFrame) else [frame.name]
+        digest.update(f"{frame.shape}|{columns}".encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(frame, index=False).values.tobytes())
+    return digest.hexdigest()[:16]
+
+def dataset_fingerprint(match_ids, feature_version, *frames):
+    # Readable prefix (match id range, row count, feature version) plus a
+    # content hash of the feature matrix and targets.
+    match_ids = pd.Series(match_ids)
+    id_range = f"{match_ids.min()}-{match_ids.max()}" if len(match_ids) else "empty"
+    return f"{id_range}:{len(match_ids)}:{feature_version}:{frame_fingerprint(*frames)}"
+
+def config_fingerprint(*parts):
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
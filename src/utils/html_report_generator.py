@@ -1,11 +1,92 @@
+import asyncio
 from datetime import datetime
 from pathlib import Path
 from config.database import get_db
+from config.async_database import get_async_db
 from config.settings import BASE_DIR
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+REPORT_PREDICTIONS_QUERY = """
+    SELECT
+        p.id as prediction_id,
+        t.name as tournament,
+        t.series as tournament_series,
+        p1.name as player_1,
+        p1.current_rank as player_1_rank,
+        p1.country as player_1_country,
+        p2.name as player_2,
+        p2.current_rank as player_2_rank,
+        p2.country as player_2_country,
+        pw.name as predicted_winner,
+        p.predicted_total_sets,
+        p.predicted_total_games,
+        p.winner_probability,
+        p.confidence_score,
+        p.prediction_timestamp,
+        m.round_id,
+        r.name as round_name,
+        s.name as surface,
+        ct.name as court_type,
+        p.actual_winner_id,
+        aw.name as actual_winner,
+        ps1.sports_mood_score as player_1_mood,
+        ps2.sports_mood_score as player_2_mood,
+        sh1.win_rate as player_1_surface_wr,
+        sh2.win_rate as player_2_surface_wr
+    FROM predictions p
+    JOIN players p1 ON p.player_1_id = p1.id
+    JOIN players p2 ON p.player_2_id = p2.id
+    JOIN players pw ON p.predicted_winner_id = pw.id
+    LEFT JOIN players aw ON p.actual_winner_id = aw.id
+    JOIN tournaments t ON p.tournament_id = t.id
+    LEFT JOIN matches m ON p.match_id = m.id
+    LEFT JOIN rounds r ON m.round_id = r.id
+    LEFT JOIN surfaces s ON m.surface_id = s.id
+    LEFT JOIN court_types ct ON m.court_type_id = ct.id
+    LEFT JOIN player_stats ps1 ON p1.id = ps1.player_id
+    LEFT JOIN player_stats ps2 ON p2.id = ps2.player_id
+    LEFT JOIN surface_history sh1 ON p1.id = sh1.player_id AND m.surface_id = sh1.surface_id
+    LEFT JOIN surface_history sh2 ON p2.id = sh2.player_id AND m.surface_id = sh2.surface_id
+    WHERE p.match_date = %s
+    ORDER BY t.series DESC, p.prediction_timestamp ASC
+"""
+
+ACTIVE_MODEL_INFO_QUERY = """
+    SELECT
+        id,
+        model_type,
+        model_version,
+        validation_accuracy,
+        validation_metrics,
+        training_date
+    FROM models
+    WHERE is_active = true
+    LIMIT 1
+"""
+
+RECENT_ERROR_METRICS_QUERY = """
+    SELECT
+        period,
+        total_predictions,
+        correct_winners,
+        accuracy,
+        avg_sets_error,
+        avg_games_error,
+        accuracy_top_50
+    FROM error_metrics
+    WHERE model_id = (SELECT id FROM models WHERE is_active = true LIMIT 1)
+    ORDER BY
+        CASE period
+            WHEN 'last_day' THEN 1
+            WHEN 'last_week' THEN 2
+            WHEN 'last_15_days' THEN 3
+            WHEN 'last_month' THEN 4
+        END
+    LIMIT 4
+"""
+
 class HTMLReportGenerator:
     def __init__(self):
         self.db = get_db()
@@ -22,6 +103,24 @@ class HTMLReportGenerator:
         model_info = self._get_active_model_info()
         error_metrics = self._get_recent_error_metrics()
 
+        return self._write_report(predictions, model_info, error_metrics, report_date)
+
+    async def generate_daily_report_async(self, report_date=None):
+        if report_date is None:
+            report_date = datetime.now().date()
+
+        logger.info(f"Generating HTML report for {report_date}")
+
+        adb = get_async_db()
+        predictions, model_info, error_metrics = await asyncio.gather(
+            adb.execute_query(REPORT_PREDICTIONS_QUERY, (report_date,), fetch=True),
+            adb.execute_query(ACTIVE_MODEL_INFO_QUERY, fetch=True),
+            adb.execute_query(RECENT_ERROR_METRICS_QUERY, fetch=True)
+        )
+
+        return self._write_report(predictions, model_info[0] if model_info else None, error_metrics, report_date)
+
+    def _write_report(self, predictions, model_info, error_metrics, report_date):
         html_content = self._build_html(predictions, model_info, error_metrics, report_date)
 
         report_filename = f"predictions_{report_date.strftime('%Y%m%d')}.html"
@@ -34,94 +133,15 @@ class HTMLReportGenerator:
         return report_path
 
     def _get_predictions_for_date(self, report_date):
-        query = """
-            SELECT
-                p.id as prediction_id,
-                t.name as tournament,
-                t.series as tournament_series,
-                p1.name as player_1,
-                p1.current_rank as player_1_rank,
-                p1.country as player_1_country,
-                p2.name as player_2,
-                p2.current_rank as player_2_rank,
-                p2.country as player_2_country,
-                pw.name as predicted_winner,
-                p.predicted_total_sets,
-                p.predicted_total_games,
-                p.winner_probability,
-                p.confidence_score,
-                p.prediction_timestamp,
-                m.round_id,
-                r.name as round_name,
-                s.name as surface,
-                ct.name as court_type,
-                p.actual_winner_id,
-                aw.name as actual_winner,
-                ps1.sports_mood_score as player_1_mood,
-                ps2.sports_mood_score as player_2_mood,
-                sh1.win_rate as player_1_surface_wr,
-                sh2.win_rate as player_2_surface_wr
-            FROM predictions p
-            JOIN players p1 ON p.player_1_id = p1.id
-            JOIN players p2 ON p.player_2_id = p2.id
-            JOIN players pw ON p.predicted_winner_id = pw.id
-            LEFT JOIN players aw ON p.actual_winner_id = aw.id
-            JOIN tournaments t ON p.tournament_id = t.id
-            LEFT JOIN matches m ON p.match_id = m.id
-            LEFT JOIN rounds r ON m.round_id = r.id
-            LEFT JOIN surfaces s ON m.surface_id = s.id
-            LEFT JOIN court_types ct ON m.court_type_id = ct.id
-            LEFT JOIN player_stats ps1 ON p1.id = ps1.player_id
-            LEFT JOIN player_stats ps2 ON p2.id = ps2.player_id
-            LEFT JOIN surface_history sh1 ON p1.id = sh1.player_id AND m.surface_id = sh1.surface_id
-            LEFT JOIN surface_history sh2 ON p2.id = sh2.player_id AND m.surface_id = sh2.surface_id
-            WHERE p.match_date = %s
-            ORDER BY t.series DESC, p.prediction_timestamp ASC
-        """
-
-        predictions = self.db.execute_query(query, (report_date,), fetch=True)
+        predictions = self.db.execute_query(REPORT_PREDICTIONS_QUERY, (report_date,), fetch=True)
         return [dict(p) for p in predictions] if predictions else []
 
     def _get_active_model_info(self):
-        query = """
-            SELECT
-                id,
-                model_type,
-                model_version,
-                validation_accuracy,
-                validation_metrics,
-                training_date
-            FROM models
-            WHERE is_active = true
-            LIMIT 1
-        """
-
-        result = self.db.execute_query(query, fetch=True)
+        result = self.db.execute_query(ACTIVE_MODEL_INFO_QUERY, fetch=True)
         return dict(result[0]) if result else None
 
     def _get_recent_error_metrics(self):
-        query = """
-            SELECT
-                period,
-                total_predictions,
-                correct_winners,
-                accuracy,
-                avg_sets_error,
-                avg_games_error,
-                accuracy_top_50
-            FROM error_metrics
-            WHERE model_id = (SELECT id FROM models WHERE is_active = true LIMIT 1)
-            ORDER BY
-                CASE period
-                    WHEN 'last_day' THEN 1
-                    WHEN 'last_week' THEN 2
-                    WHEN 'last_15_days' THEN 3
-                    WHEN 'last_month' THEN 4
-                END
-            LIMIT 4
-        """
-
-        result = self.db.execute_query(query, fetch=True)
+        result = self.db.execute_query(RECENT_ERROR_METRICS_QUERY, fetch=True)
         return [dict(r) for r in result] if result else []
 
     def _build_html(self, predictions, model_info, error_metrics, report_date):
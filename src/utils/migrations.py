@@ -0,0 +1,80 @@
+import re
+import hashlib
+from config.database import get_db
+from config.settings import MIGRATIONS_DIR
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MIGRATION_FILE_PATTERN = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+class MigrationRunner:
+    def __init__(self, migrations_dir=MIGRATIONS_DIR):
+        self.db = get_db()
+        self.migrations_dir = migrations_dir
+
+    def ensure_migrations_table(self):
+        query = """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                checksum VARCHAR(64) NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        self.db.execute_query(query)
+
+    def discover(self):
+        migrations = []
+        for path in sorted(self.migrations_dir.glob("*.sql")):
+            match = MIGRATION_FILE_PATTERN.match(path.name)
+            if not match:
+                logger.warning(f"Skipping migration file with unexpected name: {path.name}")
+                continue
+
+            sql = path.read_text()
+            migrations.append({
+                'version': int(match.group(1)),
+                'name': match.group(2),
+                'sql': sql,
+                'checksum': hashlib.sha256(sql.encode('utf-8')).hexdigest()
+            })
+        return migrations
+
+    def applied_migrations(self):
+        rows = self.db.execute_query("SELECT version, name, checksum FROM schema_migrations", fetch=True)
+        return {row['version']: row for row in rows}
+
+    def pending(self):
+        self.ensure_migrations_table()
+        applied = self.applied_migrations()
+
+        pending = []
+        for migration in self.discover():
+            existing = applied.get(migration['version'])
+            if existing is None:
+                pending.append(migration)
+            elif existing['checksum'] != migration['checksum']:
+                logger.warning(
+                    f"Migration {migration['version']:04d}_{migration['name']} changed after it was applied"
+                )
+        return pending
+
+    def apply(self, migration):
+        with self.db.transaction():
+            self.db.execute_query(migration['sql'], call_class=None)
+            self.db.execute_query(
+                "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                (migration['version'], migration['name'], migration['checksum'])
+            )
+        logger.info(f"Applied migration {migration['version']:04d}_{migration['name']}")
+
+    def migrate(self):
+        applied = []
+        for migration in self.pending():
+            self.apply(migration)
+            applied.append(migration)
+
+        if not applied:
+            logger.info("Database schema is up to date")
+        return applied
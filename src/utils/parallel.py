@@ -0,0 +1,37 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from src.utils.cpu_budget import CPUBudget
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def partition(items, n_parts):
+    n_parts = max(1, min(n_parts, len(items)))
+    return [items[i::n_parts] for i in range(n_parts)]
+
+def run_partitioned(func, items, workers):
+    items = list(items)
+    if not items:
+        return 0, 0
+
+    chunks = partition(items, workers)
+    total_ok = 0
+    total_errors = 0
+
+    # The chunks mostly wait on the database, but the pandas/NumPy work they
+    # do between queries must not start a full BLAS pool per chunk.
+    budget = CPUBudget(outer_workers=len(chunks))
+    _, threads = budget.split(len(chunks))
+
+    with budget.limit_native_threads(threads), ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+        futures = {executor.submit(func, chunk): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            try:
+                ok, errors = future.result()
+            except Exception as e:
+                chunk = futures[future]
+                logger.error(f"Worker failed on a chunk of {len(chunk)} items: {e}")
+                ok, errors = 0, len(chunk)
+            total_ok += ok
+            total_errors += errors
+
+    return total_ok, total_errors
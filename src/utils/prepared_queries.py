@@ -0,0 +1,99 @@
+PREPARED_QUERIES = {
+    'player_id_by_name': (
+        ['text'],
+        "SELECT id FROM players WHERE name = $1"
+    ),
+    'tournament_id_by_name': (
+        ['text'],
+        "SELECT id FROM tournaments WHERE name = $1"
+    ),
+    'surface_id_by_name': (
+        ['text'],
+        "SELECT id FROM surfaces WHERE name = $1"
+    ),
+    'court_type_id_by_name': (
+        ['text'],
+        "SELECT id FROM court_types WHERE name = $1"
+    ),
+    'round_id_by_name': (
+        ['text'],
+        "SELECT id FROM rounds WHERE name = $1"
+    ),
+    'match_exists': (
+        ['integer', 'date', 'integer', 'integer'],
+        """
+        SELECT id FROM matches
+        WHERE tournament_id = $1 AND date = $2
+        AND ((player_1_id = $3 AND player_2_id = $4)
+             OR (player_1_id = $4 AND player_2_id = $3))
+        """
+    ),
+    'head_to_head': (
+        ['integer', 'integer'],
+        """
+        SELECT
+            COUNT(*) as total_matches,
+            SUM(CASE WHEN won THEN 1 ELSE 0 END) as player_1_wins,
+            SUM(CASE WHEN won THEN 0 ELSE 1 END) as player_2_wins
+        FROM player_match_timeline
+        WHERE player_id = $1 AND opponent_id = $2
+        """
+    ),
+    'player_last_n_matches': (
+        ['integer', 'integer'],
+        """
+        SELECT
+            m.*,
+            p1.name as player_1_name,
+            p2.name as player_2_name,
+            w.name as winner_name
+        FROM player_match_timeline pmt
+        JOIN matches m ON pmt.match_id = m.id
+        JOIN players p1 ON m.player_1_id = p1.id
+        JOIN players p2 ON m.player_2_id = p2.id
+        LEFT JOIN players w ON m.winner_id = w.id
+        WHERE pmt.player_id = $1
+        ORDER BY pmt.date DESC
+        LIMIT $2
+        """
+    ),
+    'player_last_n_matches_on_surface': (
+        ['integer', 'integer', 'integer'],
+        """
+        SELECT
+            m.*,
+            p1.name as player_1_name,
+            p2.name as player_2_name,
+            w.name as winner_name
+        FROM player_match_timeline pmt
+        JOIN matches m ON pmt.match_id = m.id
+        JOIN players p1 ON m.player_1_id = p1.id
+        JOIN players p2 ON m.player_2_id = p2.id
+        LEFT JOIN players w ON m.winner_id = w.id
+        WHERE pmt.player_id = $1
+        AND pmt.surface_id = $2
+        ORDER BY pmt.date DESC
+        LIMIT $3
+        """
+    ),
+    'player_surface_totals': (
+        ['integer', 'integer'],
+        """
+        SELECT
+            COUNT(*) as total,
+            SUM(CASE WHEN won THEN 1 ELSE 0 END) as total_wins
+        FROM player_match_timeline
+        WHERE player_id = $1
+        AND surface_id = $2
+        """
+    ),
+    'player_snapshot': (
+        ['integer', 'date'],
+        """
+        SELECT * FROM player_daily_snapshots
+        WHERE player_id = $1 AND snapshot_date <= $2
+        ORDER BY snapshot_date DESC
+        LIMIT 1
+        """
+    )
+}
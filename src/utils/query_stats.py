@@ -0,0 +1,130 @@
+import re
+import sys
+import threading
+from pathlib import Path
+
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf')]
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\(\w+\)s|\$\d+")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+_BASE_DIR = Path(__file__).resolve().parent.parent.parent
+_SKIPPED_FILES = {
+    str(_BASE_DIR / "config" / "database.py"),
+    str(_BASE_DIR / "config" / "async_database.py"),
+    str(Path(__file__).resolve())
+}
+
+def fingerprint_sql(query):
+    if isinstance(query, bytes):
+        query = query.decode('utf-8', errors='replace')
+    fingerprint = _STRING_LITERAL.sub("?", query)
+    fingerprint = _PLACEHOLDER.sub("?", fingerprint)
+    fingerprint = _NUMBER_LITERAL.sub("?", fingerprint)
+    fingerprint = _VALUE_LIST.sub("(?+)", fingerprint)
+    return _WHITESPACE.sub(" ", fingerprint).strip()
+
+def find_call_site():
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename not in _SKIPPED_FILES and "contextlib" not in filename and "asyncio" not in filename:
+            try:
+                location = Path(filename).resolve().relative_to(_BASE_DIR)
+            except ValueError:
+                location = Path(filename).name
+            return f"{location}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+def _bucket_index(elapsed_ms):
+    for i, upper in enumerate(LATENCY_BUCKETS_MS):
+        if elapsed_ms <= upper:
+            return i
+    return len(LATENCY_BUCKETS_MS) - 1
+
+class QueryStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.entries = {}
+        self.commits = 0
+        self.rollbacks = 0
+        self.retries = 0
+
+    def record(self, fingerprint, call_site, elapsed_ms, rows):
+        key = (fingerprint, call_site)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = {
+                    'fingerprint': fingerprint,
+                    'call_site': call_site,
+                    'calls': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'rows': 0,
+                    'histogram': [0] * len(LATENCY_BUCKETS_MS)
+                }
+                self.entries[key] = entry
+
+            entry['calls'] += 1
+            entry['total_ms'] += elapsed_ms
+            entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+            entry['rows'] += max(rows or 0, 0)
+            entry['histogram'][_bucket_index(elapsed_ms)] += 1
+
+    def record_commit(self):
+        with self._lock:
+            self.commits += 1
+
+    def record_rollback(self):
+        with self._lock:
+            self.rollbacks += 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def percentile_ms(self, entry, percentile):
+        target = entry['calls'] * percentile
+        seen = 0
+        for upper, count in zip(LATENCY_BUCKETS_MS, entry['histogram']):
+            seen += count
+            if seen >= target:
+                return entry['max_ms'] if upper == float('inf') else min(upper, entry['max_ms'])
+        return entry['max_ms']
+
+    def summary_rows(self, top=None):
+        with self._lock:
+            entries = sorted(self.entries.values(), key=lambda e: e['total_ms'], reverse=True)
+            entries = [dict(e, histogram=list(e['histogram'])) for e in entries]
+        return entries[:top] if top else entries
+
+    def format_summary(self, top=25):
+        rows = self.summary_rows(top)
+        total_calls = sum(e['calls'] for e in self.entries.values())
+        total_ms = sum(e['total_ms'] for e in self.entries.values())
+
+        lines = [
+            f"Query summary: {total_calls} statements, {total_ms / 1000:.2f}s in database, "
+            f"{self.commits} commits, {self.rollbacks} rollbacks, {self.retries} retries",
+            f"{'calls':>8} {'total_ms':>12} {'avg_ms':>9} {'p50_ms':>9} {'p95_ms':>9} {'max_ms':>9} {'rows':>10}  call site / statement"
+        ]
+        for e in rows:
+            lines.append(
+                f"{e['calls']:>8} {e['total_ms']:>12.1f} {e['total_ms'] / e['calls']:>9.2f} "
+                f"{self.percentile_ms(e, 0.5):>9.1f} {self.percentile_ms(e, 0.95):>9.1f} "
+                f"{e['max_ms']:>9.1f} {e['rows']:>10}  {e['call_site']}"
+            )
+            lines.append(f"{'':>72}{e['fingerprint'][:160]}")
+        return "\n".join(lines)
+
+    def reset(self):
+        with self._lock:
+            self.entries = {}
+            self.commits = 0
+            self.rollbacks = 0
+            self.retries = 0
@@ -0,0 +1,28 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.models.hyperparameter_tuner import HyperparameterTuner
+from src.models.implementations.logistic_regression_model import LogisticRegressionModel
+from src.models.walk_forward import WalkForwardSplitter
+
+def make_matches(n_months=18, per_month=40, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = np.repeat(pd.date_range('2022-01-01', periods=n_months, freq='MS'), per_month)
+    X = pd.DataFrame(rng.normal(size=(len(dates), 4)), columns=['f0', 'f1', 'f2', 'f3'])
+    y = pd.Series((X['f0'] + rng.normal(scale=0.5, size=len(dates)) > 0).astype(int))
+    return X, y, pd.Series(dates)
+
+class HalvingWalkForwardTest(unittest.TestCase):
+    def test_halving_with_walk_forward_splitter(self):
+        X, y, dates = make_matches()
+        tuner = HyperparameterTuner(n_iter=9, cv=WalkForwardSplitter(n_splits=3, period='month'),
+                                    strategy='halving', store=None)
+
+        params, score = tuner.tune(LogisticRegressionModel(), X, y, groups=dates)
+
+        self.assertIn('logisticregression__C', params)
+        self.assertGreaterEqual(score, 0.0)
+        self.assertLessEqual(score, 1.0)
+
+if __name__ == '__main__':
+    unittest.main()